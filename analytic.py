@@ -0,0 +1,151 @@
+"""Closed-form tier returns and breakeven surfaces.
+
+Tier payouts depend only on the final GGR multiplier and the ``TierConfig``
+rates and capital shares:
+
+- Stable: received = invested × multiplier × rate, per $1 = multiplier × rate
+- Growth: cash = invested × multiplier × rate, plus 100% of the tokens back,
+  per $1 = multiplier × rate + 1
+
+so every function here accepts a scalar or an array of multipliers and
+evaluates all tiers in one NumPy broadcast, without simulating anything.
+Arrays come back with the tier axis last: shape ``multipliers.shape + (tiers,)``,
+where a ``TierConfig`` has basic, advanced, premium and any ``extra_tiers``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from revshare_pool import TierConfig
+
+
+TIERS = ("basic", "advanced", "premium")
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def tier_rates(cfg: "TierConfig") -> np.ndarray:
+    """Payout rate of every tier (basic, advanced, premium, extra tiers) as an array."""
+    return np.array(cfg.rates, dtype=float)
+
+
+def weighted_rate(cfg: "TierConfig") -> float:
+    """Pool payout rate: capital-weighted sum of the tier rates."""
+    return sum(share * rate for share, rate in zip(cfg.capital_shares, cfg.rates))
+
+
+def tier_weights(cfg: "TierConfig") -> np.ndarray:
+    """Share of the pool's payout going to each tier (capital share × rate, normalized)."""
+    parts = [share * rate for share, rate in zip(cfg.capital_shares, cfg.rates)]
+    total = sum(parts)
+    if total <= 0:
+        return np.full(len(parts), 1.0 / len(parts))
+    return np.array([part / total for part in parts])
+
+
+def tier_invested(pool_size: float, pool_ratio: float, cfg: "TierConfig") -> np.ndarray:
+    """Capital invested per tier of one pool."""
+    return pool_size * pool_ratio * np.asarray(cfg.capital_shares, dtype=float)
+
+
+def tier_returns(multipliers: ArrayLike, pool_size: float, stable_ratio: float, growth_ratio: float,
+                 stable_cfg: "TierConfig", growth_cfg: "TierConfig") -> Dict[str, np.ndarray]:
+    """Per-tier dollars and per-dollar returns of both pools at the given GGR multipliers."""
+    m = np.asarray(multipliers, dtype=float)[..., None]
+    stable_invested = tier_invested(pool_size, stable_ratio, stable_cfg)
+    growth_invested = tier_invested(pool_size, growth_ratio, growth_cfg)
+    stable_per_dollar = m * tier_rates(stable_cfg)
+    growth_per_dollar_cash = m * tier_rates(growth_cfg)
+    # invested × multiplier × rate, in the same order as the per-tier formulas
+    growth_cash = growth_invested * m * tier_rates(growth_cfg)
+    return {
+        "stable_invested": np.broadcast_to(stable_invested, stable_per_dollar.shape),
+        "stable_received": stable_invested * m * tier_rates(stable_cfg),
+        "stable_per_dollar": stable_per_dollar,
+        "growth_invested": np.broadcast_to(growth_invested, growth_cash.shape),
+        "growth_cash": growth_cash,
+        "growth_tokens": np.broadcast_to(growth_invested, growth_cash.shape),
+        "growth_total": growth_cash + growth_invested,
+        "growth_per_dollar_cash": growth_per_dollar_cash,
+        "growth_per_dollar_total": growth_per_dollar_cash + 1.0,
+    }
+
+
+def multiplier_for_return(per_dollar: ArrayLike, cfg: "TierConfig") -> np.ndarray:
+    """GGR multiplier at which each tier pays ``per_dollar`` in cash per $1 invested."""
+    return np.asarray(per_dollar, dtype=float)[..., None] / tier_rates(cfg)
+
+
+def breakeven_multipliers(cfg: "TierConfig") -> np.ndarray:
+    """GGR multiplier at which each tier's cash payout returns the capital (1 / rate)."""
+    return multiplier_for_return(1.0, cfg)
+
+
+def payout_sensitivity(pool_size: float, stable_ratio: float, growth_ratio: float,
+                       stable_cfg: "TierConfig", growth_cfg: "TierConfig") -> Dict[str, np.ndarray]:
+    """Cash paid per tier for each +1.0x of GGR multiplier (payouts are linear in the multiplier)."""
+    return {
+        "stable": tier_invested(pool_size, stable_ratio, stable_cfg) * tier_rates(stable_cfg),
+        "growth": tier_invested(pool_size, growth_ratio, growth_cfg) * tier_rates(growth_cfg),
+    }
+
+
+def per_znx_payouts(stable_payout: ArrayLike, growth_payout: ArrayLike, pool_size: float, stable_ratio: float,
+                    growth_ratio: float, stable_cfg: "TierConfig", growth_cfg: "TierConfig",
+                    znx_price: float) -> np.ndarray:
+    """Cash paid per 1 ZNX in every tier for arrays of pool payouts (e.g. paths × months).
+
+    A pool's payout is split between its tiers by ``tier_weights`` and divided
+    by the tier's capital. Shape ``payout.shape + (2, tiers)`` with pools in
+    (stable, growth) order; when the pools have different tier counts the
+    shorter one is padded with NaN.
+    """
+    n_tiers = max(len(stable_cfg.rates), len(growth_cfg.rates))
+    pools = []
+    for payout, ratio, cfg in ((stable_payout, stable_ratio, stable_cfg), (growth_payout, growth_ratio, growth_cfg)):
+        payout = np.asarray(payout, dtype=float)[..., None]
+        invested = tier_invested(pool_size, ratio, cfg)
+        k = len(invested)
+        per_znx = np.full(payout.shape[:-1] + (n_tiers,), np.nan)
+        if pool_size * ratio > 0:
+            per_znx[..., :k] = (payout * tier_weights(cfg)) / invested * znx_price
+        else:
+            per_znx[..., :k] = 0.0
+        pools.append(per_znx)
+    return np.stack(pools, axis=-2)
+
+
+def return_surface(multipliers: ArrayLike, pool_size: float, stable_ratio: float, growth_ratio: float,
+                   stable_cfg: "TierConfig", growth_cfg: "TierConfig") -> pd.DataFrame:
+    """Tidy multiplier × pool × tier table of invested, received and per-dollar returns."""
+    m = np.atleast_1d(np.asarray(multipliers, dtype=float))
+    r = tier_returns(m, pool_size, stable_ratio, growth_ratio, stable_cfg, growth_cfg)
+    n = m.shape[0]
+    stable = pd.DataFrame({
+        "ggr_multiplier": np.repeat(m, len(stable_cfg.rates)),
+        "pool": "stable",
+        "tier": np.tile(stable_cfg.names, n),
+        "invested": r["stable_invested"].ravel(),
+        "cash_received": r["stable_received"].ravel(),
+        "total_received": r["stable_received"].ravel(),
+        "per_dollar_cash": r["stable_per_dollar"].ravel(),
+        "per_dollar_total": r["stable_per_dollar"].ravel(),
+    })
+    growth = pd.DataFrame({
+        "ggr_multiplier": np.repeat(m, len(growth_cfg.rates)),
+        "pool": "growth",
+        "tier": np.tile(growth_cfg.names, n),
+        "invested": r["growth_invested"].ravel(),
+        "cash_received": r["growth_cash"].ravel(),
+        "total_received": r["growth_total"].ravel(),
+        "per_dollar_cash": r["growth_per_dollar_cash"].ravel(),
+        "per_dollar_total": r["growth_per_dollar_total"].ravel(),
+    })
+    surface = pd.concat([stable, growth], ignore_index=True)
+    surface["is_breakeven"] = surface["per_dollar_total"] >= 1.0
+    return surface
@@ -0,0 +1,193 @@
+"""Run-time benchmarks for the generator and the dashboard data paths.
+
+Every case is timed ``--repeat`` times after one warm-up run, with fresh
+inputs built outside the timed region; the median and minimum are reported.
+Cases cover pool sizes × horizons × both retention models:
+
+    python benchmark.py                      # run and print
+    python benchmark.py --save               # store as the baseline
+    python benchmark.py --compare            # fail (exit 1) on regressions
+
+Baselines are machine-specific. ``benchmark_baseline.json`` is the
+reference run committed with the code (its environment is recorded in the
+file); on other hardware save your own with ``--baseline PATH --save`` and
+compare against that. A case regresses when its minimum (the least noisy
+statistic) exceeds the baseline minimum by more than ``--threshold``
+(relative) and by more than ``NOISE_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import dashboard_data
+from result_store import CSV_SUFFIXES, ResultStore
+from revshare_pool import RevSharePoolGenerator
+
+BASELINE_PATH = "benchmark_baseline.json"
+# Slowdowns smaller than this are timer noise, whatever the ratio (sub-millisecond cases)
+NOISE_SECONDS = 0.5e-3
+
+POOL_SIZES = (35000, 250000)
+HORIZONS = (365, 730)
+RETENTION = {"enhanced": True, "basic": False}
+
+# A case: name -> (setup returning the argument, timed function of that argument)
+Case = Tuple[Callable[[], object], Callable[[object], object]]
+
+
+def _generator(pool_size: float, horizon: int, enhanced: bool, engine: str = "numpy") -> RevSharePoolGenerator:
+    return RevSharePoolGenerator(pool_size=pool_size, horizon_days=horizon, use_enhanced_retention=enhanced,
+                                 engine=engine, seed=42)
+
+
+def _generated(pool_size: float, horizon: int, enhanced: bool) -> Tuple[RevSharePoolGenerator, pd.DataFrame]:
+    gen = _generator(pool_size, horizon, enhanced)
+    return gen, gen.generate_daily_data()
+
+
+def build_cases(workdir: str, quick: bool = False) -> Dict[str, Case]:
+    cases: Dict[str, Case] = {}
+    pool_sizes = POOL_SIZES[:1] if quick else POOL_SIZES
+    horizons = HORIZONS[:1] if quick else HORIZONS
+    for pool_size in pool_sizes:
+        for horizon in horizons:
+            for label, enhanced in RETENTION.items():
+                tag = f"pool={pool_size},days={horizon},{label}"
+                args = (pool_size, horizon, enhanced)
+                cases[f"generate_daily_data[{tag}]"] = (
+                    lambda args=args: _generator(*args), lambda gen: gen.generate_daily_data())
+                for method in RevSharePoolGenerator.CALIBRATION_METHODS:
+                    cases[f"calibrate_{method}[{tag}]"] = (
+                        lambda args=args: _generator(*args),
+                        lambda gen, method=method: gen.calibrate_to_target_ggr(tolerance=0.02, method=method))
+                cases[f"get_monthly_summary[{tag}]"] = (
+                    lambda args=args: _generated(*args), lambda data: data[0].get_monthly_summary(data[1]))
+                cases[f"get_monthly_tier_payouts_per_znx[{tag}]"] = (
+                    lambda args=args: _generated(*args),
+                    lambda data: data[0].get_monthly_tier_payouts_per_znx(data[1]))
+                cases[f"validate_results[{tag}]"] = (
+                    lambda args=args: _generated(*args), lambda data: data[0].validate_results(data[1]))
+
+        # Reference engine, one horizon only: it is quadratic in days × cohorts
+        args = (pool_size, HORIZONS[0], True, "python")
+        cases[f"generate_daily_data[pool={pool_size},days={HORIZONS[0]},enhanced,python]"] = (
+            lambda args=args: _generator(*args), lambda gen: gen.generate_daily_data())
+
+        # Dashboard data path: fingerprint and load a stored result, then derive its metrics
+        gen, daily_df = _generated(pool_size, HORIZONS[0], True)
+        monthly_df = gen.get_monthly_summary(daily_df)
+        store = ResultStore(os.path.join(workdir, f"store_{pool_size}"))
+        store.write(daily_df, monthly_df, gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df))
+        prefix = os.path.join(workdir, f"csv_{pool_size}")
+        store.export_csv(prefix)
+        tag = f"pool={pool_size},days={HORIZONS[0]}"
+        # Per rerun a saved result is keyed by file stats; the content hash is what that replaced
+        cases[f"stat_fingerprint[{tag}]"] = (lambda store=store: store, lambda store: store.stat_fingerprint())
+        cases[f"fingerprint[{tag}]"] = (lambda store=store: store, lambda store: store.fingerprint())
+        cases[f"load_data[{tag}]"] = (lambda store=store: store, lambda store: store.read_all())
+        cases[f"load_data_csv[{tag}]"] = (
+            lambda prefix=prefix: prefix,
+            lambda prefix: [pd.read_csv(prefix + suffix) for suffix in CSV_SUFFIXES.values()])
+        # Same memory-mapped frames the dashboard derives from
+        cases[f"derive_dashboard_data[{tag}]"] = (
+            lambda store=store: store.read_all(), lambda tables: dashboard_data.derive_dashboard_data(*tables))
+    return cases
+
+
+def time_case(case: Case, repeat: int) -> Dict[str, float]:
+    setup, func = case
+    func(setup())  # warm-up: imports, caches, first-call allocations
+    timings = []
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings), "repeat": repeat}
+
+
+def run(cases: Dict[str, Case], repeat: int, pattern: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, case in cases.items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_case(case, repeat)
+        print(f"{name:<72} {results[name]['median'] * 1000:10.2f} ms (min {results[name]['min'] * 1000:.2f})")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, object], threshold: float) -> List[str]:
+    """Names of cases whose minimum is more than ``threshold`` (and ``NOISE_SECONDS``) slower than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["min"] / base["min"]
+        slower = ratio > 1.0 + threshold and result["min"] - base["min"] > NOISE_SECONDS
+        marker = "REGRESSION" if slower else ""
+        print(f"{name:<72} {ratio:6.2f}x baseline {marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generator and dashboard data paths")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", help="only cases whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="smallest pool and horizon only")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown (default 0.25)")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="revshare_bench_")
+    try:
+        results = run(build_cases(workdir, quick=args.quick), args.repeat, args.filter)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment") != environment():
+            print("Note: baseline was recorded in a different environment")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "created": time.time(), "results": results}, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Persistent index of converged calibrations for warm starts.
+
+Every converged ``calibrate_to_target_ggr`` run is stored as (parameter
+features, seed -> calibration point x, see ``_set_calibration_point``) in
+SQLite. A new calibration starts from x predicted by the nearest stored
+parameter sets instead of x = 0 (all scales 1.0), and the CRN search takes
+its first step with the locally fitted GGR response instead of the nominal one.
+
+Only calibrations from the same family (engine, ENGINE_VERSION, retention
+model, schedules, horizon and acquisition window) are neighbours; within a family the distance is
+Euclidean over features that move the GGR multiplier (log target, log CPA
+level and spread, volatility, start month), preferring calibrations with the
+same seed (same random path, so x is nearly exact). The k nearest neighbours
+are fitted as x = a + b·log(target): a + b·log(target) is the start and 1/b
+the response of log GGR to x. With too few neighbours the nearest one is
+shifted by the nominal response. SQLite with WAL and a busy
+timeout makes the index safe to share between dashboard sessions and sweep
+worker processes; connections are opened per call, so the object pickles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from revshare_pool import CalibrationReport, RevSharePoolGenerator
+
+
+# d log(final GGR) / dx of the engine around x = 0 (deposits x1, retention x0.6, 1/CPA x0.5)
+NOMINAL_RESPONSE = 2.1
+
+# Stored seed of unseeded generators: NULLs in a primary key never collide, so a NULL seed would add
+# a row per calibration instead of replacing it (numpy seeds are non-negative, so -1 is free)
+NO_SEED = -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calibrations (
+    family TEXT NOT NULL,
+    features TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    log_target REAL NOT NULL,
+    x REAL NOT NULL,
+    method TEXT NOT NULL,
+    error REAL NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (family, features, seed)
+)
+"""
+
+
+def calibration_family(gen: "RevSharePoolGenerator") -> str:
+    """Hash of the settings that change the model itself; only equal families are neighbours."""
+    payload = {
+        "engine": gen.engine,
+        "engine_version": gen.ENGINE_VERSION,
+        "enhanced_retention": gen.use_enhanced_retention,
+        "horizon": [gen.horizon_days, gen.acquisition_days, gen.cohort_bucket_days],
+        "retention_schedule": sorted([list(k), list(v)] for k, v in gen.retention_schedule.items()),
+        "deposit_by_days": sorted([list(k), v] for k, v in gen.deposit_by_days.items()),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def calibration_features(gen: "RevSharePoolGenerator") -> Tuple[float, ...]:
+    """Parameter-space coordinates of a calibration problem."""
+    low, high = (float(v) for v in gen.cpa_range)
+    month = gen.start_date.month
+    return (
+        round(math.log(gen.target_ggr_multiplier), 6),
+        round(2.0 * math.log((low + high) / 2), 6),
+        round(math.log(high / low), 6),
+        round(gen.ggr_volatility, 6),
+        round(0.25 * math.sin(2 * math.pi * month / 12), 6),
+        round(0.25 * math.cos(2 * math.pi * month / 12), 6),
+    )
+
+
+class CalibrationIndex:
+    def __init__(self, path: str = os.path.join(".cache", "calibration.sqlite"), k: int = 8) -> None:
+        self.path = path
+        self.k = k
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        if self._nullable_seed(conn):
+            self._migrate(conn)
+        return conn
+
+    @staticmethod
+    def _nullable_seed(conn: sqlite3.Connection) -> bool:
+        return any(column[1] == "seed" and not column[3] for column in conn.execute("PRAGMA table_info(calibrations)"))
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Rebuild an index written with a nullable seed; the newest row per key survives."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._nullable_seed(conn):  # another process may have migrated meanwhile
+                conn.execute("ALTER TABLE calibrations RENAME TO calibrations_old")
+                conn.execute(SCHEMA)
+                conn.execute(
+                    "INSERT OR REPLACE INTO calibrations SELECT family, features, COALESCE(seed, ?), log_target, x, "
+                    "method, error, created FROM calibrations_old ORDER BY created", (NO_SEED,))
+                conn.execute("DROP TABLE calibrations_old")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def nearest(self, gen: "RevSharePoolGenerator") -> Optional[Tuple[float, float]]:
+        """Predicted ``(x, response)`` for ``gen`` from stored calibrations of the same family."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT features, seed, log_target, x FROM calibrations WHERE family = ?", (calibration_family(gen),)
+            ).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return None
+        features = np.array([json.loads(row[0]) for row in rows])
+        seeds = [row[1] for row in rows]
+        log_targets = np.array([row[2] for row in rows])
+        xs = np.array([row[3] for row in rows])
+        log_target = math.log(gen.target_ggr_multiplier)
+
+        distances = np.linalg.norm(features - np.array(calibration_features(gen)), axis=1)
+        same_seed = np.array([gen.seed is not None and seed == gen.seed for seed in seeds])  # NO_SEED never matches
+        candidates = np.flatnonzero(same_seed) if same_seed.any() else np.arange(len(rows))
+        near = candidates[np.argsort(distances[candidates])[:self.k]]
+        if len(near) >= 3 and np.ptp(log_targets[near]) > 0.05:
+            b, a = np.polyfit(log_targets[near], xs[near], 1)
+            if b > 0:
+                # Across seeds x is too noisy for a reliable slope: keep the nominal response
+                response = 1.0 / b if same_seed.any() else NOMINAL_RESPONSE
+                return float(a + b * log_target), float(min(4.0, max(0.5, response)))
+        best = near[0]
+        return float(xs[best] + (log_target - log_targets[best]) / NOMINAL_RESPONSE), NOMINAL_RESPONSE
+
+    def record(self, gen: "RevSharePoolGenerator", report: "CalibrationReport") -> None:
+        """Store a converged calibration (unconverged ones would mislead later warm starts)."""
+        if not report.converged:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO calibrations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (calibration_family(gen), json.dumps(calibration_features(gen)),
+                     NO_SEED if gen.seed is None else gen.seed,
+                     math.log(gen.target_ggr_multiplier), math.log(report.deposit_scale),
+                     report.method, report.error, time.time()),
+                )
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM calibrations").fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,437 @@
+"""Vectorized NumPy cohort engine for RevSharePoolGenerator.
+
+Instead of walking day × cohort in Python, the whole (day × cohort) age
+matrix is built at once and retention, activity boosts, reactivation and
+deposits are drawn as arrays from a ``numpy.random.Generator``. Every array
+carries a leading path axis, so the same code simulates one path or a batch.
+
+The formulas mirror ``RevSharePoolGenerator._get_enhanced_retention_rate``,
+``_calculate_activity_boost``, ``_calculate_reactivation_chance``,
+``_get_avg_deposit``, ``_calculate_seasonality`` and ``_calculate_daily_ggr``:
+draws follow the same distributions, not the same random stream.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from daily_records import DailyRecords
+
+if TYPE_CHECKING:
+    from revshare_pool import RevSharePoolGenerator
+
+
+@lru_cache(maxsize=32)
+def calendar_arrays(start_date: datetime, days: int) -> Dict[str, np.ndarray]:
+    """Return date, year, month, day-of-month and weekday arrays for the horizon."""
+    dates = pd.date_range(start_date, periods=days, freq="D")
+    return {
+        "date": dates.values,
+        "year": dates.year.values.astype(np.int64),
+        "month": dates.month.values.astype(np.int64),
+        "dom": dates.day.values.astype(np.int64),
+        "weekday": dates.weekday.values.astype(np.int64),
+    }
+
+
+def seasonality(month: np.ndarray, dom: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+    """Vectorized ``_calculate_seasonality``."""
+    mult = np.ones(month.shape, dtype=float)
+    mult *= np.where((month == 12) & (dom >= 20), 1.18, 1.0)
+    mult *= np.where((month == 1) & (dom <= 10), 1.15, 1.0)
+    mult *= np.where((month == 2) & (dom == 14), 1.08, 1.0)
+    mult *= np.where((month == 6) | (month == 7), 1.12, 1.0)
+    mult *= np.where((month == 7) | (month == 8), 1.06, 1.0)
+    mult *= np.where(month == 9, 0.92, 1.0)
+    mult *= np.where(month == 2, 0.94, 1.0)
+    mult *= np.where(weekday >= 5, 1.08, 1.0)
+    mult *= np.where((dom >= 25) & (dom <= 28), 1.12, 1.0)
+    return mult
+
+
+def activity_calendar(month: np.ndarray, dom: np.ndarray, weekday: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Deterministic part of ``_calculate_activity_boost``.
+
+    Returns (event_factor, calendar_factor): event_factor is the holiday boost
+    before the age-dependent holiday multiplier (1.0 when there is no event),
+    calendar_factor combines the weekend and end-of-month boosts.
+    """
+    event = np.select(
+        [
+            (month == 12) & (dom >= 20),
+            (month == 1) & (dom <= 10),
+            (month == 2) & (dom == 14),
+            (month == 6) | (month == 7),
+            (month == 11) & (dom >= 20) & (dom <= 30),
+        ],
+        [1.25, 1.20, 1.15, 1.18, 1.22],
+        default=1.0,
+    )
+    calendar_factor = np.where(weekday >= 5, 1.12, 1.0) * np.where(dom >= 25, 1.08, 1.0)
+    return event, calendar_factor
+
+
+def reactivation_season(month: np.ndarray) -> np.ndarray:
+    """Seasonal multiplier of ``_calculate_reactivation_chance``."""
+    return np.select(
+        [(month == 12) | (month == 1), (month >= 6) & (month <= 8), month == 11],
+        [2.0, 1.5, 1.8],
+        default=1.0,
+    )
+
+
+def reactivation_base(ages: np.ndarray) -> np.ndarray:
+    """Age-band base chance of ``_calculate_reactivation_chance`` (0 for age <= 30)."""
+    return np.select(
+        [ages <= 30, ages <= 90, ages <= 180, ages <= 270],
+        [0.0, 0.03, 0.02, 0.015],
+        default=0.01,
+    )
+
+
+def _per_path(value, ndim: int):
+    """A scalar as is; one value per path (e.g. per pool of a portfolio) shaped to broadcast over ``ndim`` axes."""
+    if np.ndim(value) == 0:
+        return value
+    return np.reshape(value, (-1,) + (1,) * (ndim - 1))
+
+
+def schedule_arrays(gen: "RevSharePoolGenerator", max_age: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Dense per-age (base retention, variance, deposit) arrays, index = age_days."""
+    ages = np.arange(max_age + 1)
+    retention = gen._retention_table.lookup(ages)
+    return retention[:, 0], retention[:, 1], gen._deposit_table.lookup(ages)
+
+
+def simulate_ftd_schedule(gen: "RevSharePoolGenerator", rng: np.random.Generator, n_paths: int,
+                          ftd_days: int = 30) -> Dict[str, np.ndarray]:
+    """Vectorized ``_generate_ftd_schedule``: (paths × ftd_days) spend, CPA and FTDs."""
+    spends = rng.dirichlet([2.0] * ftd_days, size=n_paths) * gen.pool_size
+    cpas = rng.uniform(gen.cpa_range[0] * gen._cpa_scale, gen.cpa_range[1] * gen._cpa_scale,
+                       size=(n_paths, ftd_days))
+    ftds = np.maximum(0, np.round(spends / cpas)).astype(np.int64)
+    return {"traffic_spend": spends, "cpa": cpas, "new_ftds": ftds}
+
+
+def _event_factor(u: np.ndarray, probability, low: float, high: float) -> np.ndarray:
+    """Turn uniform draws ``u`` (in place) into a multiplier: [low, high) where ``u < probability``, else 1.0.
+
+    Conditional on ``u < p``, ``u / p`` is uniform on [0, 1), so a single draw
+    decides both whether the event happens and how large it is. Probabilities
+    above 1 (e.g. age / 1000 on multi-year horizons) count as 1, like
+    ``random() < p`` in the Python engine.
+    """
+    probability = np.minimum(np.asarray(probability, dtype=np.float32), np.float32(1.0))
+    hit = u < probability
+    safe = np.where(probability > 0, probability, np.float32(1.0))
+    u *= np.where(probability > 0, np.float32(high - low) / safe, np.float32(0.0))
+    u += np.float32(low - 1.0)
+    u *= hit
+    u += np.float32(1.0)
+    return u
+
+
+def cohort_buckets(ftds: np.ndarray, days: int, bucket: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge daily cohorts into buckets of ``bucket`` acquisition days.
+
+    Returns (size, ages, valid): ``size`` is (paths × days × buckets) players
+    acquired so far in each bucket, ``ages`` (days × buckets) is measured from
+    the middle of the bucket (>= 1) and ``valid`` marks days on or after the
+    bucket's first acquisition day. With ``bucket == 1`` this is exactly one
+    cohort per day and ``size`` is (paths × 1 × cohorts).
+
+    A bucket is retained and rounded as one cohort, so with only a few FTDs
+    per day it keeps players that per-day rounding would truncate to zero;
+    use ``bucket == 1`` for the exact per-day model.
+    """
+    n_paths, n_cohorts = ftds.shape
+    day = np.arange(days)[:, None]
+    if bucket == 1:
+        # age[d, c] = day - ftd_day + 1; cohorts acquired after the day are masked out
+        ages = day - np.arange(n_cohorts)[None, :] + 1
+        valid = ages >= 1
+        return ftds[:, None, :].astype(np.float32), np.where(valid, ages, 1), valid
+    n_buckets = -(-n_cohorts // bucket)
+    padded = np.zeros((n_paths, n_buckets * bucket), dtype=np.float32)
+    padded[:, :n_cohorts] = ftds
+    acquired = np.cumsum(padded.reshape(n_paths, n_buckets, bucket), axis=2)
+    first_day = np.arange(n_buckets)[None, :] * bucket
+    offset = day - first_day
+    valid = offset >= 0
+    size = acquired[:, np.arange(n_buckets)[None, :], np.clip(offset, 0, bucket - 1)] * valid
+    ages = np.maximum(1, np.rint(offset + 1 - (bucket - 1) / 2)).astype(np.int64)
+    return size, ages, valid
+
+
+def simulate_cohorts(gen: "RevSharePoolGenerator", rng: np.random.Generator, ftds: np.ndarray,
+                     cal: Dict[str, np.ndarray], bucket: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate active players and deposits for every (path, day).
+
+    ``ftds`` has shape (paths × cohorts); cohort ``c`` is acquired on day ``c + 1``.
+    Returns (active_players, total_deposits), each (paths × days).
+    ``bucket > 1`` merges that many acquisition days into one cohort (see
+    ``cohort_buckets``), so work grows with days × cohorts / bucket.
+
+    The (paths × days × cohorts) arrays are float32 and updated in place, and
+    ``round(size * min(1, combined + reactivation))`` is evaluated as
+    ``round(min(size, vip * vip_retention + regular * boosted + size * reactivation))``
+    so no per-cell division or branch is needed.
+    """
+    n_paths = ftds.shape[0]
+    days = cal["month"].shape[0]
+    f32 = np.float32
+
+    size, ages, valid = cohort_buckets(ftds, days, bucket)
+    base, var, deposit = schedule_arrays(gen, int(ages.max()))
+    shape = (n_paths, days, ages.shape[1])
+
+    # Базовый retention (_get_retention_rate): base * scale + U(-var, var), clipped to [0, 1]
+    retention = rng.random(shape, dtype=f32)
+    retention *= (2.0 * var[ages]).astype(f32)
+    retention += (base[ages] * _per_path(gen._retention_scale, 3) - var[ages]).astype(f32)
+    np.clip(retention, f32(0.0), f32(1.0), out=retention)
+
+    if gen.use_enhanced_retention:
+        # VIP игроки - 5-10% от когорты, retention в 2-3 раза выше базового после 30 дней
+        vip_players = rng.random(shape, dtype=f32)
+        vip_players *= f32(0.05)
+        vip_players += f32(0.05)
+        vip_players *= size
+        np.floor(vip_players, out=vip_players)
+        vip_total = rng.random(shape, dtype=f32)
+        vip_total += f32(1.0)
+        vip_total *= (ages > 30).astype(f32)
+        vip_total += f32(1.0)
+        vip_total *= retention
+        np.minimum(vip_total, f32(1.0), out=vip_total)
+        vip_total *= vip_players
+
+        # Всплески активности: праздники, выходные, конец месяца,
+        # случайные акции (5%) и персональные предложения для старых игроков (age / 1000)
+        event, calendar_factor = activity_calendar(cal["month"], cal["dom"], cal["weekday"])
+        holiday_multiplier = 1.0 + (ages / 365.0) * 0.5
+        calendar_boost = np.where(event[:, None] > 1.0, event[:, None] * holiday_multiplier, 1.0)
+        calendar_boost = (calendar_boost * calendar_factor[:, None]).astype(f32)
+        boosted = _event_factor(rng.random(shape, dtype=f32), 0.05, 1.10, 1.30)
+        personal_chance = np.where(ages > 60, ages / 1000.0, 0.0)
+        boosted *= _event_factor(rng.random(shape, dtype=f32), personal_chance, 1.15, 1.40)
+        boosted *= calendar_boost
+        boosted *= retention
+        np.minimum(boosted, f32(1.0), out=boosted)
+
+        # Комбинированный retention: VIP + обычные игроки
+        regular_players = np.subtract(size, vip_players, out=vip_players)
+        boosted *= regular_players
+        boosted += vip_total
+
+        # Реактивация неактивных игроков, email/push кампании (10%)
+        reactivation = _event_factor(rng.random(shape, dtype=f32), 0.10, 1.5, 2.5)
+        reactivation *= (reactivation_base(ages) * reactivation_season(cal["month"])[:, None]).astype(f32)
+        reactivation *= size
+        boosted += reactivation
+        players = np.minimum(boosted, size, out=boosted)
+    else:
+        players = np.multiply(retention, size, out=retention)
+
+    np.round(players, out=players)
+    players *= valid.astype(f32)
+
+    season = seasonality(cal["month"], cal["dom"], cal["weekday"])
+    avg_dep = rng.random(shape, dtype=f32)
+    avg_dep *= f32(0.30)
+    avg_dep += f32(0.85)
+    avg_dep *= (deposit[ages] * _per_path(gen._deposit_scale, 3) * season[:, None]).astype(f32)
+    avg_dep *= players
+    active_players = players.sum(axis=2, dtype=np.float64)
+    total_deposits = avg_dep.sum(axis=2, dtype=np.float64)
+    return active_players, total_deposits
+
+
+def simulate_daily_ggr(gen: "RevSharePoolGenerator", rng: np.random.Generator,
+                       total_deposits: np.ndarray) -> np.ndarray:
+    """Vectorized ``_calculate_daily_ggr`` over (paths × days).
+
+    Negative clusters are a renewal process: a cluster may only start on a
+    deposit day outside a running cluster and then covers the next 2-4
+    deposit days. Clusters are placed in rounds (one per path per round), so
+    the loop runs once per cluster instead of once per day. Every path starts
+    outside a cluster.
+    """
+    n_paths, days = total_deposits.shape
+    shape = (n_paths, days)
+    house_edge = rng.uniform(0.03, 0.06, shape)
+    daily_variance = rng.normal(1.0, _per_path(gen.ggr_volatility, 2), shape)
+    ggr = total_deposits * house_edge * daily_variance
+
+    has_deposits = total_deposits > 0
+    # Start new negative cluster (2% chance on a day outside a cluster)
+    candidate = has_deposits & (rng.random(shape) < 0.02)
+    cluster_length = rng.integers(2, 5, shape)
+    rank = np.cumsum(has_deposits, axis=1)
+    in_cluster = np.zeros(shape, dtype=bool)
+    cluster_start = np.zeros(shape, dtype=bool)
+    min_rank = np.zeros(n_paths, dtype=np.int64)
+    rows = np.arange(n_paths)
+    while True:
+        allowed = candidate & (rank > min_rank[:, None])
+        found = allowed.any(axis=1)
+        if not found.any():
+            break
+        p = rows[found]
+        s = allowed[found].argmax(axis=1)
+        cluster_start[p, s] = True
+        start_rank = rank[p, s]
+        end_rank = start_rank + cluster_length[p, s]
+        in_cluster[p] |= (has_deposits[p] & (rank[p] > start_rank[:, None])
+                          & (rank[p] <= end_rank[:, None]))
+        min_rank[p] = end_rank
+
+    negative_cluster = in_cluster | cluster_start
+    regular_negative = ~negative_cluster & (rng.random(shape) < 0.15)
+    ggr = np.where(negative_cluster, -np.abs(ggr * rng.uniform(1.2, 2.5, shape)), ggr)
+    ggr = np.where(regular_negative, -np.abs(ggr * rng.uniform(1.1, 2.0, shape)), ggr)
+
+    # Экстремальная волатильность - джекпоты или крупные проигрыши
+    extreme = rng.random(shape) < 0.03
+    jackpot = rng.random(shape) < 0.2
+    ggr = np.where(extreme & jackpot, -np.abs(ggr * rng.uniform(2.0, 5.0, shape)), ggr)
+    ggr = np.where(extreme & ~jackpot, np.abs(ggr * rng.uniform(2.0, 4.0, shape)), ggr)
+    return np.where(has_deposits, ggr, 0.0)
+
+
+def simulate_upfront_referral(gen: "RevSharePoolGenerator", rng: np.random.Generator, ftds: np.ndarray,
+                              cal: Dict[str, np.ndarray]) -> np.ndarray:
+    """Upfront referral bonuses paid on each acquisition day, (paths × cohorts)."""
+    n_paths, n_cohorts = ftds.shape
+    season = seasonality(cal["month"][:n_cohorts], cal["dom"][:n_cohorts], cal["weekday"][:n_cohorts])
+    avg_new_deposit = (gen._deposit_table[1] * _per_path(gen._deposit_scale, 2)
+                       * rng.uniform(0.85, 1.15, (n_paths, n_cohorts)) * season)
+    total_referral_deposits = ftds * _per_path(gen.referral_ratio, 2) * avg_new_deposit
+    upfront = total_referral_deposits * _per_path(
+        gen.stable_ratio * (gen.upfront_bonus_stable / 100)
+        + gen.growth_ratio * (gen.upfront_bonus_growth / 100), 2
+    )
+    return np.where(ftds > 0, upfront, 0.0)
+
+
+def simulate_paths(gen: "RevSharePoolGenerator", rng: np.random.Generator, n_paths: int = 1,
+                   days: Optional[int] = None, ftd_days: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Simulate ``n_paths`` independent horizons; every array is (paths × days).
+
+    ``days`` and ``ftd_days`` default to the generator's horizon and acquisition window.
+    """
+    days = days or gen.horizon_days
+    ftd_days = ftd_days or gen.acquisition_days
+    cal = calendar_arrays(gen.start_date, days)
+    schedule = simulate_ftd_schedule(gen, rng, n_paths, ftd_days)
+    ftds = schedule["new_ftds"]
+    active_players, total_deposits = simulate_cohorts(gen, rng, ftds, cal, gen.cohort_bucket_days)
+    daily_ggr = simulate_daily_ggr(gen, rng, total_deposits)
+
+    pad = ((0, 0), (0, days - ftd_days))
+    traffic_spend = np.pad(schedule["traffic_spend"], pad)
+    upfront = np.pad(simulate_upfront_referral(gen, rng, ftds, cal), pad)
+    return {
+        "new_ftds": np.pad(ftds, pad),
+        "active_players": active_players,
+        "total_deposits": total_deposits,
+        "daily_ggr": daily_ggr,
+        "cumulative_ggr": np.cumsum(daily_ggr, axis=1),
+        "traffic_spend": traffic_spend,
+        "cumulative_traffic": np.cumsum(traffic_spend, axis=1),
+        "daily_upfront_referral": upfront,
+    }
+
+
+def month_starts(cal: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Index of the first day of each calendar month and the month index of every day."""
+    month_key = cal["year"] * 12 + cal["month"]
+    new_month = np.r_[True, month_key[1:] != month_key[:-1]]
+    return np.flatnonzero(new_month), np.cumsum(new_month) - 1
+
+
+def watermark_increments(month_end_ggr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """High-watermark payout base of every month along the last axis: (increment, exceeded).
+
+    The watermark starts at 0 and is the running maximum of month-end
+    cumulative GGR; a month pays only on what it adds above the previous peak.
+    """
+    watermark = np.maximum.accumulate(np.maximum(month_end_ggr, 0.0), axis=-1)
+    previous = np.concatenate([np.zeros_like(watermark[..., :1]), watermark[..., :-1]], axis=-1)
+    exceeded = month_end_ggr > previous
+    return np.where(exceeded, month_end_ggr - previous, 0.0), exceeded
+
+
+def distribute_payouts(gen: "RevSharePoolGenerator", daily_ggr: np.ndarray, daily_upfront_referral: np.ndarray,
+                       cal: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """High-watermark monthly payouts spread over positive-GGR days, for (paths × days) arrays.
+
+    Batch counterpart of ``get_monthly_summary`` + ``_distribute_payouts``.
+    """
+    starts, month_of_day = month_starts(cal)
+    month_end_ggr = np.cumsum(np.add.reduceat(daily_ggr, starts, axis=1), axis=1)
+    increment, _ = watermark_increments(month_end_ggr)
+    monthly_stable = increment * _per_path(gen.stable_weighted_rate, 2) * _per_path(gen.stable_ratio, 2)
+    monthly_growth = increment * _per_path(gen.growth_weighted_rate, 2) * _per_path(gen.growth_ratio, 2)
+
+    positive = daily_ggr > 0
+    positive_days = np.add.reduceat(positive, starts, axis=1)[:, month_of_day]
+    share = np.where(positive, 1.0 / np.maximum(positive_days, 1), 0.0)
+    stable_payout = monthly_stable[:, month_of_day] * share
+    growth_payout = monthly_growth[:, month_of_day] * share
+    daily_total_referral = (
+        stable_payout * _per_path(gen.ongoing_share_stable, 2)
+        + growth_payout * _per_path(gen.ongoing_share_growth, 2)
+        + daily_upfront_referral
+    )
+    return {
+        "stable_payout": stable_payout,
+        "growth_payout": growth_payout,
+        "daily_total_referral": daily_total_referral,
+    }
+
+
+def simulate_final_ggr(gen: "RevSharePoolGenerator", rng: np.random.Generator, n_paths: int = 1,
+                       days: Optional[int] = None, ftd_days: Optional[int] = None) -> np.ndarray:
+    """Final cumulative GGR per path; consumes the same draws as ``simulate_paths`` up to the GGR."""
+    days = days or gen.horizon_days
+    ftd_days = ftd_days or gen.acquisition_days
+    cal = calendar_arrays(gen.start_date, days)
+    ftds = simulate_ftd_schedule(gen, rng, n_paths, ftd_days)["new_ftds"]
+    _, total_deposits = simulate_cohorts(gen, rng, ftds, cal, gen.cohort_bucket_days)
+    return np.cumsum(simulate_daily_ggr(gen, rng, total_deposits), axis=1)[:, -1]
+
+
+def daily_records(gen: "RevSharePoolGenerator", paths: Dict[str, np.ndarray], path: int = 0) -> DailyRecords:
+    """Pre-payout days (same fields as the Python engine) of one path as DailyRecords."""
+    days = paths["daily_ggr"].shape[1]
+    cal = calendar_arrays(gen.start_date, days)
+    active_players = paths["active_players"][path]
+    total_deposits = paths["total_deposits"][path]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_deposit = np.where(active_players > 0, total_deposits / active_players, 0.0)
+    return DailyRecords.from_columns({
+        "day": np.arange(1, days + 1),
+        "month": cal["month"],
+        "year": cal["year"],
+        "weekday": cal["weekday"],
+        "new_ftds": paths["new_ftds"][path],
+        "active_players": active_players,
+        "avg_deposit": avg_deposit,
+        "total_deposits": total_deposits,
+        "daily_ggr": paths["daily_ggr"][path],
+        "cumulative_ggr": paths["cumulative_ggr"][path],
+        "traffic_spend": paths["traffic_spend"][path],
+        "cumulative_traffic": paths["cumulative_traffic"][path],
+        "daily_upfront_referral": paths["daily_upfront_referral"][path],
+    }, gen.start_date, gen.effective_traffic_budget, gen.pool_size)
+
+
+def daily_frame(gen: "RevSharePoolGenerator", paths: Dict[str, np.ndarray], path: int = 0) -> pd.DataFrame:
+    """Build the pre-payout daily frame (same columns as the Python engine) for one path."""
+    return daily_records(gen, paths, path).to_frame()
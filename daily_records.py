@@ -0,0 +1,105 @@
+"""Compact typed storage for simulated days.
+
+A horizon of days is one NumPy structured array with fixed dtypes instead of
+one Python dict per day: int16 calendar fields, int8 weekday code, int32
+player counts and float64 money. The date, effective traffic budget and GGR
+multiplier are derived from the start date, the budget and the pool size, so
+they are not stored per row. ``to_frame`` builds the DataFrame (weekday as a
+categorical) only when a caller asks for it.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+WEEKDAY_CODES = {name: code for code, name in enumerate(WEEKDAY_NAMES)}
+
+DAILY_DTYPE = np.dtype([
+    ("day", np.int16),
+    ("month", np.int16),
+    ("year", np.int16),
+    ("weekday", np.int8),
+    ("new_ftds", np.int32),
+    ("active_players", np.int32),
+    ("avg_deposit", np.float64),
+    ("total_deposits", np.float64),
+    ("daily_ggr", np.float64),
+    ("cumulative_ggr", np.float64),
+    ("traffic_spend", np.float64),
+    ("cumulative_traffic", np.float64),
+    ("daily_upfront_referral", np.float64),
+])
+
+
+class DailyRecords:
+    def __init__(self, data: np.ndarray, start_date: datetime, effective_traffic_budget: float,
+                 pool_size: float) -> None:
+        if data.dtype != DAILY_DTYPE:
+            raise ValueError("data must use DAILY_DTYPE")
+        self.data = data
+        self.start_date = start_date
+        self.effective_traffic_budget = float(effective_traffic_budget)
+        self.pool_size = float(pool_size)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable, count: int, start_date: datetime, effective_traffic_budget: float,
+                  pool_size: float) -> "DailyRecords":
+        """Fill the array from ``DayRecord``-like rows without keeping them."""
+        fields = (
+            (row.day, row.month, row.year, WEEKDAY_CODES[row.day_of_week], row.new_ftds, row.active_players,
+             row.avg_deposit, row.total_deposits, row.daily_ggr, row.cumulative_ggr, row.traffic_spend,
+             row.cumulative_traffic, row.daily_upfront_referral)
+            for row in rows
+        )
+        return cls(np.fromiter(fields, dtype=DAILY_DTYPE, count=count), start_date, effective_traffic_budget,
+                   pool_size)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray], start_date: datetime, effective_traffic_budget: float,
+                     pool_size: float) -> "DailyRecords":
+        data = np.empty(len(columns["day"]), dtype=DAILY_DTYPE)
+        for name in DAILY_DTYPE.names:
+            data[name] = columns[name]
+        return cls(data, start_date, effective_traffic_budget, pool_size)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    @property
+    def dates(self) -> np.ndarray:
+        return (np.datetime64(self.start_date.date(), "D") + self.data["day"].astype(np.int64) - 1).astype(
+            "datetime64[ns]")
+
+    def to_frame(self) -> pd.DataFrame:
+        """Pre-payout daily DataFrame, with the same columns as the per-row engine used to build."""
+        data = self.data
+        return pd.DataFrame({
+            "date": self.dates,
+            "day": data["day"],
+            "month": data["month"],
+            "year": data["year"],
+            "day_of_week": pd.Categorical.from_codes(data["weekday"], categories=WEEKDAY_NAMES),
+            "new_ftds": data["new_ftds"],
+            "active_players": data["active_players"],
+            "avg_deposit": data["avg_deposit"],
+            "total_deposits": data["total_deposits"],
+            "daily_ggr": data["daily_ggr"],
+            "cumulative_ggr": data["cumulative_ggr"],
+            "traffic_spend": data["traffic_spend"],
+            "cumulative_traffic": data["cumulative_traffic"],
+            "effective_traffic_budget": np.full(len(data), self.effective_traffic_budget),
+            "ggr_multiplier": data["cumulative_ggr"] / self.pool_size,
+            "daily_upfront_referral": data["daily_upfront_referral"],
+        })
@@ -1,6 +1,7 @@
 import os
 import json
 import shutil
+import time
 import pandas as pd
 import numpy as np
 import streamlit as st
@@ -9,12 +10,40 @@ from datetime import datetime, date
 import zipfile
 import io
 
+import analytic
+import dashboard_data
+from calibration_index import CalibrationIndex
+from generation_jobs import GenerationRunner
+from result_cache import META_FILE, ResultCache
+from result_catalog import ResultCatalog
+from result_store import CSV_SUFFIXES, TABLES, ResultStore
+from revshare_pool import GROWTH_TIERS, STABLE_TIERS
+
 # File paths
-DAILY_CSV = "pool1_nov2025_daily.csv"
-MONTHLY_CSV = "pool1_nov2025_monthly.csv"
-MONTHLY_TIERS_ZNX_CSV = "pool1_nov2025_monthly_tiers_znx.csv"
+RESULTS_DIR = "results"  # binary ResultStore written by run.py (result ID "run")
+CSV_PREFIX = "pool1_nov2025"  # CSV export names (and old CSV results)
 SAVED_RESULTS_DIR = "saved_results"
 SAVED_PARAMS_FILE = "generation_params.json"
+# Sidebar sort options of saved results: label -> (catalog column, descending)
+SAVED_SORT_OPTIONS = {
+    "Новые": ("created", True),
+    "Старые": ("created", False),
+    "GGR множитель": ("ggr_multiplier", True),
+    "Стоимость капитала": ("cost_of_capital", False),
+    "Размер пула": ("pool_size", True),
+}
+RESULT_CACHE_DIR = os.path.join(".cache", "results")
+RESULT_CACHE_MAX_BYTES = 256 * 2**20
+# In-memory caches shared by all sessions: datasets and their derived data, bounded by count and age
+DATASET_CACHE_ENTRIES = 16
+DATASET_CACHE_TTL = 3600  # seconds
+CALIBRATION_INDEX_PATH = os.path.join(".cache", "calibration.sqlite")
+GENERATION_WORKERS = 2  # background generation threads shared by all sessions
+GENERATION_POLL_SECONDS = 0.5
+
+# Results are addressed by ID and read where they are stored, never copied into a shared directory:
+# "run" (RESULTS_DIR), "cache:<key>" (ResultCache entry), "saved:<folder>" (SAVED_RESULTS_DIR)
+DEFAULT_RESULT_ID = "run"
 
 # Default values (will be overridden by sidebar)
 DEFAULT_POOL_SIZE = 50000
@@ -22,10 +51,50 @@ DEFAULT_STABLE_RATIO = 0.6
 DEFAULT_GROWTH_RATIO = 0.4
 
 # Functions for saving and loading generation results
-def save_generation_result(params, name):
-    """Сохранить результат генерации с параметрами"""
+def result_store(result_id):
+    """Хранилище результата по его ID (без копирования)."""
+    kind, _, name = result_id.partition(":")
+    if kind == "run":
+        return ResultStore(RESULTS_DIR)
+    # name is a single path component: an ID never points outside its directory
+    if name and os.path.basename(name) == name:
+        if kind == "cache":
+            return get_result_cache().store(name)
+        if kind == "saved":
+            return ResultStore(os.path.join(SAVED_RESULTS_DIR, name))
+    raise ValueError(f"unknown result ID: {result_id!r}")
+
+def saved_result_id(result_path):
+    return "saved:" + os.path.basename(os.path.normpath(result_path))
+
+@st.cache_resource
+def get_result_catalog():
+    # One catalog per server process; sync() re-indexes only when the saved folders change
+    return ResultCatalog(SAVED_RESULTS_DIR, csv_prefix=CSV_PREFIX)
+
+def save_generation_result(result_id, params, name, tags=()):
+    """Сохранить результат ``result_id`` с параметрами и записать его в каталог.
+
+    Returns ``(path, created)``; ``created`` is False when the same result
+    (cache_key) was already saved — then only the new tags are added to it.
+    """
     if not os.path.exists(SAVED_RESULTS_DIR):
         os.makedirs(SAVED_RESULTS_DIR)
+    catalog = get_result_catalog()
+    tags = list(tags) + (['favorite'] if params.get('is_favorite') else [])
+    
+    # Тот же результат (cache_key) уже сохранен — не дублировать файлы
+    cache_key = params.get('cache_key')
+    if cache_key:
+        existing = catalog.find(cache_key)
+        if existing is not None:
+            catalog.add_tags(existing['name'], tags)
+            return existing['path'], False
+    
+    store = result_store(result_id)
+    if not store.exists():
+        # Запись кэша вытеснена или результат удален: сохранять нечего
+        raise FileNotFoundError("данные результата больше не доступны, сгенерируйте их заново")
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     result_dir = os.path.join(SAVED_RESULTS_DIR, f"{timestamp}_{name}")
@@ -36,84 +105,104 @@ def save_generation_result(params, name):
     with open(params_file, 'w', encoding='utf-8') as f:
         json.dump(params, f, ensure_ascii=False, indent=2, default=str)
     
-    # Скопировать CSV файлы
-    import shutil
-    if os.path.exists(DAILY_CSV):
-        shutil.copy2(DAILY_CSV, os.path.join(result_dir, DAILY_CSV))
-    if os.path.exists(MONTHLY_CSV):
-        shutil.copy2(MONTHLY_CSV, os.path.join(result_dir, MONTHLY_CSV))
-    if os.path.exists(MONTHLY_TIERS_ZNX_CSV):
-        shutil.copy2(MONTHLY_TIERS_ZNX_CSV, os.path.join(result_dir, MONTHLY_TIERS_ZNX_CSV))
+    # Скопировать файлы результата (сохраненный результат не зависит от кэша)
+    try:
+        for path in store.files():
+            shutil.copy2(path, os.path.join(result_dir, os.path.basename(path)))
+        if not ResultStore(result_dir).exists():
+            raise FileNotFoundError("данные результата удалены во время сохранения")
+    except OSError:
+        # Запись кэша вытеснена во время копирования: не оставлять неполную папку
+        shutil.rmtree(result_dir, ignore_errors=True)
+        raise
     
-    return result_dir
+    # KPI читаются из только что скопированных таблиц
+    catalog.add_store(os.path.basename(result_dir), params, tags=tags)
+    return result_dir, True
 
-def get_saved_results():
-    """Получить список сохраненных результатов"""
-    if not os.path.exists(SAVED_RESULTS_DIR):
-        return []
-    
-    results = []
-    for item in os.listdir(SAVED_RESULTS_DIR):
-        result_path = os.path.join(SAVED_RESULTS_DIR, item)
-        if os.path.isdir(result_path):
-            params_file = os.path.join(result_path, SAVED_PARAMS_FILE)
-            if os.path.exists(params_file):
-                try:
-                    with open(params_file, 'r', encoding='utf-8') as f:
-                        params = json.load(f)
-                    results.append({
-                        'name': item,
-                        'path': result_path,
-                        'params': params,
-                        'timestamp': params.get('timestamp', 'Unknown')
-                    })
-                except:
-                    continue
-    
-    return sorted(results, key=lambda x: x['name'], reverse=True)
+def delete_saved_result(result_path):
+    """Удалить сохраненный результат и его запись в каталоге"""
+    catalog = get_result_catalog()
+    shutil.rmtree(result_path)
+    catalog.remove(os.path.basename(os.path.normpath(result_path)))
+
+def get_saved_results(order_by="created", descending=True, tag=None):
+    """Список сохраненных результатов одним запросом к каталогу (параметры, KPI, теги)"""
+    catalog = get_result_catalog()
+    return catalog.list(tag=tag, order_by=order_by, descending=descending)
 
 def load_saved_result(result_path):
-    """Загрузить сохраненный результат"""
-    import shutil
-    
-    # Загрузить CSV файлы
-    saved_daily = os.path.join(result_path, DAILY_CSV)
-    saved_monthly = os.path.join(result_path, MONTHLY_CSV)
-    saved_tiers = os.path.join(result_path, MONTHLY_TIERS_ZNX_CSV)
-    
-    if os.path.exists(saved_daily):
-        shutil.copy2(saved_daily, DAILY_CSV)
-    if os.path.exists(saved_monthly):
-        shutil.copy2(saved_monthly, MONTHLY_CSV)
-    if os.path.exists(saved_tiers):
-        shutil.copy2(saved_tiers, MONTHLY_TIERS_ZNX_CSV)
+    """ID сохраненного результата; файлы читаются на месте, переключение не копирует данные"""
+    saved = ResultStore(result_path)
+    if not saved.exists():
+        # Старые результаты в CSV: один раз импортировать в хранилище рядом с ними
+        saved = ResultStore.from_csv(result_path, os.path.join(result_path, CSV_PREFIX))
+        if not saved.exists():
+            raise FileNotFoundError("в сохраненном результате нет данных")
+    return saved_result_id(result_path)
+
+def stored_params(result_id):
+    """Параметры генерации, сохраненные вместе с результатом, или None.
+
+    Сохраненный результат хранит их в generation_params.json, запись кэша —
+    в meta.json (полные аргументы генератора и калибровка).
+    """
+    directory = result_store(result_id).directory
+    params_file = os.path.join(directory, SAVED_PARAMS_FILE)
+    if os.path.exists(params_file):
+        with open(params_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    meta_file = os.path.join(directory, META_FILE)
+    if result_id.startswith("cache:") and os.path.exists(meta_file):
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return {**meta.get("params", {}), "calibration": meta.get("calibration"), "cache_key": meta.get("key")}
+    return None
 
 def create_export_zip():
-    """Create a ZIP file with all current data for export"""
+    """Create a ZIP file with all data of this session's current result for export"""
     zip_buffer = io.BytesIO()
     
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        # Add CSV files if they exist
-        for csv_file in [DAILY_CSV, MONTHLY_CSV, MONTHLY_TIERS_ZNX_CSV]:
-            if os.path.exists(csv_file):
-                zip_file.write(csv_file, csv_file)
+        # CSV export of the current result
+        store = result_store(st.session_state.result_id)
+        for table in TABLES:
+            df = store.read(table, memory_map=False)
+            if df is not None:
+                zip_file.writestr(CSV_PREFIX + CSV_SUFFIXES[table], df.to_csv(index=False))
         
-        # Add parameters file if it exists in current directory
-        if os.path.exists("current_params.json"):
-            zip_file.write("current_params.json", "generation_params.json")
+        # Parameters stored with the result (none for run.py output)
+        params = stored_params(st.session_state.result_id)
+        if params is not None:
+            zip_file.writestr(SAVED_PARAMS_FILE, json.dumps(params, ensure_ascii=False, indent=2, default=str))
     
     zip_buffer.seek(0)
     return zip_buffer.getvalue()
 
 st.set_page_config(page_title="RevShare Pool Dashboard", layout="wide")
 
+# Each session shows its own result; other sessions switching results do not affect it
+if "result_id" not in st.session_state:
+    st.session_state.result_id = DEFAULT_RESULT_ID
+
 # Sidebar for data generation
 st.sidebar.title("🔧 Генерация данных")
-st.sidebar.info("ℹ️ Параметры ниже используются только для генерации новых данных. Дашборд отображает реальные данные из CSV файлов.")
+st.sidebar.info("ℹ️ Параметры ниже используются только для генерации новых данных. Дашборд отображает реальные данные из хранилища результатов.")
 
 # Load saved results section
 st.sidebar.markdown("### 📂 Загрузить сохраненный результат")
-saved_results = get_saved_results()
+result_catalog = get_result_catalog()
+catalog_problems = result_catalog.sync()
+for problem_name, problem in catalog_problems:
+    st.sidebar.warning(f"⚠️ Не удалось прочитать '{problem_name}': {problem}")
+
+sort_col, tag_col = st.sidebar.columns(2)
+with sort_col:
+    saved_sort = st.selectbox("↕️ Сортировка", options=list(SAVED_SORT_OPTIONS))
+with tag_col:
+    saved_tag = st.selectbox("🏷️ Тег", options=["Все"] + result_catalog.tags())
+saved_order_by, saved_descending = SAVED_SORT_OPTIONS[saved_sort]
+saved_results = get_saved_results(saved_order_by, saved_descending, None if saved_tag == "Все" else saved_tag)
 
 if saved_results:
     result_names = [f"{result['name']} ({result['timestamp']})" for result in saved_results]
@@ -131,8 +220,9 @@ if saved_results:
         with col1:
             if st.button("📥 Загрузить", help="Загрузить выбранный результат"):
                 try:
-                    load_saved_result(selected_result_data['path'])
-                    st.cache_data.clear()  # Clear cache to reload data
+                    st.session_state.result_id = load_saved_result(selected_result_data['path'])
+                    # The generated result is no longer the current one: nothing of it to show or save
+                    st.session_state.pop("generation_done", None)
                     st.sidebar.success(f"✅ Результат '{selected_result_data['name']}' загружен!")
                     st.rerun()
                 except Exception as e:
@@ -141,38 +231,45 @@ if saved_results:
         with col2:
             if st.button("🗑️ Удалить", help="Удалить выбранный результат"):
                 try:
-                    import shutil
-                    shutil.rmtree(selected_result_data['path'])
+                    delete_saved_result(selected_result_data['path'])
+                    if st.session_state.result_id == saved_result_id(selected_result_data['path']):
+                        st.session_state.result_id = DEFAULT_RESULT_ID
+                    st.session_state.pop("generation_done", None)
                     st.sidebar.success(f"✅ Результат '{selected_result_data['name']}' удален!")
                     st.rerun()
                 except Exception as e:
                     st.sidebar.error(f"❌ Ошибка удаления: {str(e)}")
         
-        # Show result info
-        if os.path.exists(os.path.join(selected_result_data['path'], SAVED_PARAMS_FILE)):
-            with open(os.path.join(selected_result_data['path'], SAVED_PARAMS_FILE), 'r', encoding='utf-8') as f:
-                params = json.load(f)
-            
-            st.sidebar.markdown("**📋 Параметры результата:**")
-            znx_amount = params.get('znx_amount', 0)
-            znx_rate = params.get('znx_rate', 0)
-            pool_size = params.get('pool_size', 0)
-            target_ggr = params.get('target_ggr', 0)
-            
-            st.sidebar.markdown(f"• ZNX: {znx_amount:,.0f}" if isinstance(znx_amount, (int, float)) else "• ZNX: N/A")
-            st.sidebar.markdown(f"• Курс: ${znx_rate:.8f}" if isinstance(znx_rate, (int, float)) else "• Курс: N/A")
-            st.sidebar.markdown(f"• Пул: ${pool_size:,.2f}" if isinstance(pool_size, (int, float)) else "• Пул: N/A")
-            
-            if 'stable_znx_amount' in params and 'growth_znx_amount' in params:
-                stable_znx = params.get('stable_znx_amount', 0)
-                growth_znx = params.get('growth_znx_amount', 0)
-                st.sidebar.markdown(f"• Stable: {stable_znx:,.0f} ZNX" if isinstance(stable_znx, (int, float)) else "• Stable: N/A")
-                st.sidebar.markdown(f"• Growth: {growth_znx:,.0f} ZNX" if isinstance(growth_znx, (int, float)) else "• Growth: N/A")
-            else:
-                stable_ratio = params.get('stable_ratio', 0)
-                st.sidebar.markdown(f"• Stable: {stable_ratio:.1%}" if isinstance(stable_ratio, (int, float)) else "• Stable: N/A")
-            
-            st.sidebar.markdown(f"• Target GGR: {target_ggr:.1f}x" if isinstance(target_ggr, (int, float)) else "• Target GGR: N/A")
+        # Show result info (parameters and KPIs come from the catalog row, no file reads)
+        params = selected_result_data['params']
+        
+        st.sidebar.markdown("**📋 Параметры результата:**")
+        znx_amount = params.get('znx_amount', 0)
+        znx_rate = params.get('znx_rate', 0)
+        pool_size = params.get('pool_size', 0)
+        target_ggr = params.get('target_ggr', 0)
+        
+        st.sidebar.markdown(f"• ZNX: {znx_amount:,.0f}" if isinstance(znx_amount, (int, float)) else "• ZNX: N/A")
+        st.sidebar.markdown(f"• Курс: ${znx_rate:.8f}" if isinstance(znx_rate, (int, float)) else "• Курс: N/A")
+        st.sidebar.markdown(f"• Пул: ${pool_size:,.2f}" if isinstance(pool_size, (int, float)) else "• Пул: N/A")
+        
+        if 'stable_znx_amount' in params and 'growth_znx_amount' in params:
+            stable_znx = params.get('stable_znx_amount', 0)
+            growth_znx = params.get('growth_znx_amount', 0)
+            st.sidebar.markdown(f"• Stable: {stable_znx:,.0f} ZNX" if isinstance(stable_znx, (int, float)) else "• Stable: N/A")
+            st.sidebar.markdown(f"• Growth: {growth_znx:,.0f} ZNX" if isinstance(growth_znx, (int, float)) else "• Growth: N/A")
+        else:
+            stable_ratio = params.get('stable_ratio', 0)
+            st.sidebar.markdown(f"• Stable: {stable_ratio:.1%}" if isinstance(stable_ratio, (int, float)) else "• Stable: N/A")
+        
+        st.sidebar.markdown(f"• Target GGR: {target_ggr:.1f}x" if isinstance(target_ggr, (int, float)) else "• Target GGR: N/A")
+        
+        kpis = selected_result_data['kpis']
+        if kpis:
+            st.sidebar.markdown(f"• GGR множитель: {kpis['ggr_multiplier']:.2f}x")
+            st.sidebar.markdown(f"• Стоимость капитала: {kpis['cost_of_capital']:.1f}%")
+        if selected_result_data['tags']:
+            st.sidebar.markdown("• Теги: " + ", ".join(selected_result_data['tags']))
 else:
     st.sidebar.info("📭 Нет сохраненных результатов")
 
@@ -201,6 +298,7 @@ st.sidebar.markdown("---")
 start_date = st.sidebar.date_input("📅 Дата старта", value=date(2025, 11, 1), help="Используется только для генерации новых данных")
 target_ggr = st.sidebar.slider("🎯 Целевой GGR множитель", min_value=2.0, max_value=5.0, value=3.2, step=0.1, help="Используется только для генерации новых данных")
 ggr_volatility = st.sidebar.slider("📊 Волатильность GGR", min_value=0.05, max_value=0.30, value=0.15, step=0.01, help="Стандартное отклонение для ежедневных колебаний GGR. Используется только для генерации новых данных")
+seed = int(st.sidebar.number_input("🎲 Seed", min_value=0, max_value=2**31 - 1, value=42, step=1, help="Одинаковые параметры и seed дают тот же результат — повторная генерация берется из кэша"))
 
 # Traffic parameters section moved up
 
@@ -228,106 +326,320 @@ total_upfront_referral = upfront_referral_stable + upfront_referral_growth
 effective_cpa_min = cpa_min + total_upfront_referral
 effective_cpa_max = cpa_max + total_upfront_referral
 
+def display_tier_returns(ggr_multiplier):
+    """Отображение доходности по тирам (аналитически, без симуляции)"""
+    st.subheader("💰 Доходность на $1 инвестиции")
+    returns = analytic.tier_returns(ggr_multiplier, 1.0, 1.0, 1.0, STABLE_TIERS, GROWTH_TIERS)
+    stable_rates = analytic.tier_rates(STABLE_TIERS)
+    growth_rates = analytic.tier_rates(GROWTH_TIERS)
+    
+    cols = st.columns(2)
+    
+    with cols[0]:
+        st.markdown("**🔵 Stable Pool** (только cash)")
+        for i, tier in enumerate(STABLE_TIERS.names):
+            per_dollar = returns["stable_per_dollar"][i]
+            profit_pct = (per_dollar - 1) * 100
+            
+            color = "🟢" if per_dollar >= 1.0 else "🔴"
+            st.metric(
+                f"{color} {tier.capitalize()} ({stable_rates[i]*100:.2f}%)",
+                f"${per_dollar:.3f}",
+                f"{profit_pct:+.1f}%"
+            )
+    
+    with cols[1]:
+        st.markdown("**🟢 Growth Pool** (cash + 100% токенов)")
+        for i, tier in enumerate(GROWTH_TIERS.names):
+            st.metric(
+                f"🟢 {tier.capitalize()} ({growth_rates[i]*100:.2f}%)",
+                f"${returns['growth_per_dollar_total'][i]:.3f}",
+                f"${returns['growth_per_dollar_cash'][i]:.3f} cash"
+            )
+
+    with st.expander("📐 Доходность в зависимости от GGR"):
+        surface = analytic.return_surface(np.round(np.arange(1.0, 5.01, 0.1), 2), 1.0, 1.0, 1.0, STABLE_TIERS, GROWTH_TIERS)
+        surface["Тир"] = surface["pool"].str.capitalize() + " " + surface["tier"].str.capitalize()
+        chart = alt.Chart(surface).mark_line().encode(
+            x=alt.X("ggr_multiplier:Q", axis=alt.Axis(title="GGR множитель")),
+            y=alt.Y("per_dollar_total:Q", axis=alt.Axis(title="Возврат на $1")),
+            color=alt.Color("Тир:N"),
+        )
+        breakeven_rule = alt.Chart(pd.DataFrame({"y": [1.0]})).mark_rule(strokeDash=[4, 4]).encode(y="y:Q")
+        current_rule = alt.Chart(pd.DataFrame({"x": [ggr_multiplier]})).mark_rule(color="gray").encode(x="x:Q")
+        st.altair_chart(chart + breakeven_rule + current_rule, use_container_width=True)
+        breakeven = analytic.breakeven_multipliers(STABLE_TIERS)
+        st.markdown("**Безубыточность Stable:** " + " | ".join(
+            f"{tier.capitalize()}: {m:.2f}x" for tier, m in zip(STABLE_TIERS.names, breakeven)
+        ))
+
+
+def display_return_summary(ggr_multiplier, pool_size, stable_ratio, growth_ratio):
+    """Итоговая таблица возврата на каждый вложенный доллар (аналитически, без симуляции)"""
+    st.subheader("💰 Итоговая доходность: возврат на каждый вложенный доллар")
+    returns = analytic.tier_returns(ggr_multiplier, pool_size, stable_ratio, growth_ratio, STABLE_TIERS, GROWTH_TIERS)
+    
+    # Stable: payout = investment × GGR_multiplier × tier_rate
+    # Growth: total = (investment × GGR_multiplier × tier_rate) + investment
+    names = [
+        f"{icon} {pool.capitalize()} {tier.capitalize()} ({rate*100:g}%)"
+        for icon, pool, cfg in [("🔵", "stable", STABLE_TIERS), ("🟢", "growth", GROWTH_TIERS)]
+        for tier, rate in zip(cfg.names, analytic.tier_rates(cfg))
+    ]
+    invested = np.concatenate([returns["stable_invested"], returns["growth_invested"]])
+    received = np.concatenate([returns["stable_received"], returns["growth_total"]])
+    per_dollar = np.concatenate([returns["stable_per_dollar"], returns["growth_per_dollar_total"]])
+    summary_df = pd.DataFrame({
+        "Пул": names,
+        "Вложено ($)": [f"${v:,.0f}" for v in invested],
+        "Получено ($)": [f"${v:,.0f}" for v in received],
+        "На $1 получаешь": [f"${v:.2f}" for v in per_dollar],
+    })
+    st.dataframe(summary_df, use_container_width=True, hide_index=True)
+    
+    # Add interactive explanation
+    with st.expander("🧮 Формулы расчетов"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"""
+            **💰 Stable пул:**
+            - Формула: `investment × GGR × tier_rate`
+            - {" | ".join(f"{t.capitalize()}: {r*100:g}%" for t, r in zip(STABLE_TIERS.names, analytic.tier_rates(STABLE_TIERS)))}
+            - Возврат на $1: `GGR × tier_rate`
+            """)
+        with col2:
+            st.markdown(f"""
+            **🚀 Growth пул:**
+            - Формула: `(investment × GGR × tier_rate) + investment`
+            - {" | ".join(f"{t.capitalize()}: {r*100:g}%" for t, r in zip(GROWTH_TIERS.names, analytic.tier_rates(GROWTH_TIERS)))}
+            - Возврат на $1: `(GGR × tier_rate) + 1.00`
+            """)
+        shares = " | ".join(f"{t.capitalize()} {s*100:g}%" for t, s in zip(STABLE_TIERS.names, STABLE_TIERS.capital_shares))
+        st.markdown(f"**📊 Распределение капитала:** {shares}")
+
+
 # Data loading function (defined before generation logic)
-@st.cache_data(show_spinner=False)
-def load_data():
-    daily = pd.read_csv(DAILY_CSV, parse_dates=["date"]) if os.path.exists(DAILY_CSV) else None
-    monthly = pd.read_csv(MONTHLY_CSV) if os.path.exists(MONTHLY_CSV) else None
-    tiers = pd.read_csv(MONTHLY_TIERS_ZNX_CSV) if os.path.exists(MONTHLY_TIERS_ZNX_CSV) else None
-    return daily, monthly, tiers
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES, ttl=DATASET_CACHE_TTL, show_spinner=False)
+def read_dataset(fingerprint, _directory):
+    """Tables of one dataset, shared by every session that shows it.
+
+    Keyed by the data fingerprint only, so a new or loaded result gets its
+    own entry and nothing has to be cleared. cache_resource returns the
+    memory-mapped frames themselves (st.cache_data would pickle and copy
+    them); callers must not modify them.
+    """
+    return ResultStore(_directory).read_all()
+
+def result_fingerprint(result_id, store):
+    """Cheap key of a result's data for the in-memory caches, computed on every rerun without reading the data.
+
+    A cache entry's key already determines its tables (entries are written
+    once); saved results and the run.py output are keyed by file stats.
+    """
+    if result_id.startswith("cache:"):
+        return result_id
+    return store.stat_fingerprint()
+
+def load_data(result_id):
+    """Tables of result ``result_id``, read where they are stored, and their fingerprint."""
+    store = result_store(result_id)
+    if result_id == DEFAULT_RESULT_ID and not store.exists() and os.path.exists(CSV_PREFIX + CSV_SUFFIXES["daily"]):
+        # CSV от старых запусков run.py: импортировать в хранилище один раз
+        store = ResultStore.from_csv(RESULTS_DIR, CSV_PREFIX)
+    if not store.exists():
+        return None, None, None, None
+    fingerprint = result_fingerprint(result_id, store)
+    daily_df, monthly_df, tiers_df = read_dataset(fingerprint, store.directory)
+    return daily_df, monthly_df, tiers_df, fingerprint
+
+@st.cache_data(max_entries=DATASET_CACHE_ENTRIES, ttl=DATASET_CACHE_TTL, show_spinner=False)
+def derive_dashboard_data(fingerprint, _daily_df, _monthly_df, _tiers_df):
+    """KPI и таблицы для графиков, один раз на набор данных.
+
+    Кэш по отпечатку данных результата: фреймы (с подчеркиванием) не
+    хэшируются, так что перезапуски от виджетов, не меняющих данные, берут
+    готовый результат.
+    """
+    return dashboard_data.derive_dashboard_data(_daily_df, _monthly_df, _tiers_df, DEFAULT_POOL_SIZE)
 
 generate_button = st.sidebar.button("🚀 Генерировать данные", type="primary")
+profile_generation = st.sidebar.checkbox("⏱ Профилировать генерацию", value=False, help="Время по фазам (калибровка, симуляция, выплаты, месячная сводка) и число случайных чисел. Только для новой генерации, не для кэша")
+
+@st.cache_resource
+def get_result_cache():
+    # One cache object per server process, so hit/miss statistics survive reruns
+    return ResultCache(RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MAX_BYTES,
+                       calibration_index=CalibrationIndex(CALIBRATION_INDEX_PATH))
+
+result_cache = get_result_cache()
+
+@st.cache_resource
+def get_generation_runner():
+    # One job pool per server process: jobs outlive reruns and sessions poll them by ID
+    return GenerationRunner(get_result_cache(), max_workers=GENERATION_WORKERS)
+
+generation_runner = get_generation_runner()
 
-# Generate data if button is clicked
+# Generate data in the background if button is clicked
 if generate_button:
-    with st.spinner("Генерирую данные..."):
-        from revshare_pool import RevSharePoolGenerator
-        import os
-        import random
-        import time
-        
-        # Generate random seed based on current time and parameters
-        seed = int(time.time() * 1000) % 1000000 + hash(str(pool_size) + str(stable_ratio) + str(target_ggr)) % 1000
-        random.seed(seed)
-        np.random.seed(seed)
-        
-        # Create generator with custom parameters
-        generator = RevSharePoolGenerator(
-            pool_size=pool_size,
-            stable_ratio=stable_ratio,
-            growth_ratio=growth_ratio,
-            cpa_range=(effective_cpa_min, effective_cpa_max),
-            target_ggr_multiplier=target_ggr,
-            ggr_volatility=ggr_volatility,
-            start_date=start_date.strftime("%Y-%m-%d"),
-            referral_ratio=referral_ratio,
-            upfront_bonus_stable=upfront_bonus_stable,
-            upfront_bonus_growth=upfront_bonus_growth,
-            ongoing_share_stable=ongoing_share_stable,
-            ongoing_share_growth=ongoing_share_growth,
-            seed=seed
-        )
-        
-        # Calibrate to target GGR multiplier
-        generator.calibrate_to_target_ggr(tolerance=0.1)
-        
-        # Generate data
-        daily_data = generator.generate_daily_data()
-        monthly_data = generator.get_monthly_summary(daily_data)
-        monthly_tiers_data = generator.get_monthly_tier_payouts_per_znx(daily_data)
-        
-        # Save data to CSV files
-        daily_data.to_csv(DAILY_CSV, index=False)
-        monthly_data.to_csv(MONTHLY_CSV, index=False)
-        monthly_tiers_data.to_csv(MONTHLY_TIERS_ZNX_CSV, index=False)
-        
-        # Clear cache to reload data
-        st.cache_data.clear()
-        
-        st.sidebar.success("✅ Данные сгенерированы!")
-        
-        # Add save functionality
-        st.sidebar.markdown("---")
-        st.sidebar.markdown("### 💾 Сохранить результат")
-        save_name = st.sidebar.text_input("📝 Название результата", value=f"Результат_{datetime.now().strftime('%Y%m%d_%H%M')}", help="Введите название для сохранения результата")
-        
-        if st.sidebar.button("💾 Сохранить результат", help="Сохранить параметры генерации и CSV файлы"):
-            if save_name.strip():
-                # Prepare parameters for saving
-                generation_params = {
-                    'znx_amount': znx_amount,
-                    'znx_rate': znx_rate,
-                    'pool_size': pool_size,
-                    'stable_znx_amount': stable_znx_amount,
-                    'growth_znx_amount': growth_znx_amount,
-                    'stable_ratio': stable_ratio,
-                    'growth_ratio': growth_ratio,
-                    'start_date': start_date.strftime("%Y-%m-%d"),
-                    'target_ggr': target_ggr,
-                    'ggr_volatility': ggr_volatility,
-                    'cpa_min': cpa_min,
-                    'cpa_max': cpa_max,
-                    'effective_cpa_min': effective_cpa_min,
-                    'effective_cpa_max': effective_cpa_max,
-                    'referral_ratio': referral_ratio,
-                    'upfront_bonus_stable': upfront_bonus_stable,
-                    'upfront_bonus_growth': upfront_bonus_growth,
-                    'ongoing_share_stable': ongoing_share_stable,
-                    'ongoing_share_growth': ongoing_share_growth,
-                    'seed': seed,
-                    'generation_timestamp': datetime.now().isoformat()
-                }
-                
-                try:
-                    save_generation_result(generation_params, save_name.strip())
-                    st.sidebar.success(f"✅ Результат '{save_name.strip()}' сохранен!")
-                except Exception as e:
-                    st.sidebar.error(f"❌ Ошибка сохранения: {str(e)}")
-            else:
-                st.sidebar.error("❌ Введите название для сохранения")
-        
+    # Generator parameters; the same parameters + seed are served from the result cache
+    generator_params = dict(
+        pool_size=pool_size,
+        stable_ratio=stable_ratio,
+        growth_ratio=growth_ratio,
+        cpa_range=(effective_cpa_min, effective_cpa_max),
+        target_ggr_multiplier=target_ggr,
+        ggr_volatility=ggr_volatility,
+        start_date=start_date.strftime("%Y-%m-%d"),
+        referral_ratio=referral_ratio,
+        upfront_bonus_stable=upfront_bonus_stable,
+        upfront_bonus_growth=upfront_bonus_growth,
+        ongoing_share_stable=ongoing_share_stable,
+        ongoing_share_growth=ongoing_share_growth,
+        seed=seed,
+        engine="numpy"
+    )
+    # Calibrate to target GGR multiplier, generate and store (or take the cached result)
+    job = generation_runner.submit(
+        generator_params, calibration={"tolerance": 0.02, "method": "crn"}, profile=profile_generation
+    )
+    # A new generation replaces this session's previous one: release its subscription
+    # (the same job when resubmitted; either way it keeps running for other sessions)
+    previous = generation_runner.get(st.session_state.get("generation_job_id"))
+    if previous is not None and not previous.snapshot().is_finished:
+        previous.cancel()
+    st.session_state.generation_job_id = job.id
+    # Sidebar inputs that are not generator kwargs, kept with the job for saving its result
+    st.session_state.generation_inputs = {
+        'znx_amount': znx_amount,
+        'znx_rate': znx_rate,
+        'stable_znx_amount': stable_znx_amount,
+        'growth_znx_amount': growth_znx_amount,
+        'cpa_min': cpa_min,
+        'cpa_max': cpa_max,
+    }
+    st.session_state.pop("generation_done", None)
+
+def show_generation_job():
+    """Прогресс фоновой генерации этой сессии; готовый результат становится текущим.
+
+    Returns True while the job is still running (the script then polls it).
+    """
+    job_id = st.session_state.get("generation_job_id")
+    job = generation_runner.get(job_id) if job_id else None
+    if job is None:
+        return False
+    status = job.snapshot()
+    if not status.is_finished:
+        if status.phase == "calibration":
+            error = f", ошибка {status.calibration_error * 100:+.1f}%" if status.calibration_error is not None else ""
+            text = f"Калибровка: итерация {status.calibration_iteration}{error}"
+        elif status.phase == "simulation":
+            text = f"Симуляция: день {status.day} из {status.days}"
+        elif status.phase == "payouts":
+            text = "Расчет выплат..."
+        else:
+            text = "В очереди..." if status.state == "queued" else "Генерирую данные..."
+        st.sidebar.progress(status.fraction, text=text)
+        if st.sidebar.button("⏹ Отменить генерацию"):
+            # Only this session detaches; the job stops when no other session waits for it
+            job.cancel()
+            del st.session_state.generation_job_id
+            st.sidebar.warning("⏹ Генерация отменена")
+            return False
+        return True
+
+    del st.session_state.generation_job_id
+    if status.state == "done":
+        result = job.result()
+        # The cache entry becomes this session's result; nothing is copied
+        st.session_state.result_id = f"cache:{result.key}"
+        st.session_state.generation_done = {
+            "cache_hit": result.cache_hit,
+            "cache_key": result.key,
+            "profile": result.profile,
+            "params": result.params,
+            "calibration": result.calibration,
+            "inputs": st.session_state.pop("generation_inputs", {}),
+        }
+        st.rerun()
+    elif status.state == "cancelled":
+        st.sidebar.warning("⏹ Генерация отменена")
+    else:
+        st.sidebar.error(f"❌ Ошибка генерации: {status.error}")
+    return False
+
+generation_running = show_generation_job()
+
+def poll_generation_job():
+    """Rerun shortly while this session's generation runs; called once the page is drawn."""
+    if generation_running:
+        time.sleep(GENERATION_POLL_SECONDS)
         st.rerun()
 
+# Result of the last finished generation of this session
+generation_done = st.session_state.get("generation_done")
+if generation_done is not None:
+    cache_hit = generation_done["cache_hit"]
+    cache_key = generation_done["cache_key"]
+    st.sidebar.success("✅ Данные взяты из кэша!" if cache_hit else "✅ Данные сгенерированы!")
+    cache_stats = result_cache.stats()
+    st.sidebar.caption(
+        f"Кэш: {cache_stats['hits']} попаданий / {cache_stats['misses']} промахов, "
+        f"{cache_stats['entries']} записей, {cache_stats['bytes'] / 2**20:.1f} МБ"
+    )
+    profile_report = generation_done["profile"]
+    if profile_report is not None:
+        with st.sidebar.expander("⏱ Профиль генерации", expanded=True):
+            st.caption(
+                f"Всего {profile_report.total_seconds * 1000:.0f} мс, "
+                f"{profile_report.counters.get('calibration_iterations', 0)} итераций калибровки, "
+                f"{profile_report.draws:,} случайных чисел"
+            )
+            profile_df = profile_report.to_frame()
+            profile_df["seconds"] = (profile_df["seconds"] * 1000).round(1)
+            profile_df["share"] = (profile_df["share"] * 100).round(1)
+            st.dataframe(
+                profile_df.rename(columns={"phase": "Фаза", "calls": "Вызовы", "seconds": "мс",
+                                           "share": "%", "draws": "Случайные числа"}),
+                hide_index=True, use_container_width=True,
+            )
+    elif profile_generation and cache_hit:
+        st.sidebar.caption("⏱ Результат из кэша — профилировать нечего")
+    
+    # Add save functionality
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 💾 Сохранить результат")
+    save_name = st.sidebar.text_input("📝 Название результата", value=f"Результат_{datetime.now().strftime('%Y%m%d_%H%M')}", help="Введите название для сохранения результата")
+    save_tags = st.sidebar.text_input("🏷️ Теги", value="", help="Через запятую, для фильтра сохраненных результатов")
+    
+    if st.sidebar.button("💾 Сохранить результат", help="Сохранить параметры генерации и файлы результата"):
+        if save_name.strip():
+            # Parameters the result was generated with (the sidebar may have changed since)
+            generator_params = generation_done["params"]
+            generation_params = {
+                **generation_done["inputs"],
+                **generator_params,
+                'target_ggr': generator_params['target_ggr_multiplier'],
+                'effective_cpa_min': generator_params['cpa_range'][0],
+                'effective_cpa_max': generator_params['cpa_range'][1],
+                'calibration': generation_done["calibration"],
+                'cache_key': cache_key,
+                'generation_timestamp': datetime.now().isoformat()
+            }
+            
+            try:
+                saved_path, created = save_generation_result(f"cache:{cache_key}", generation_params, save_name.strip(),
+                                                             tags=save_tags.split(","))
+                if created:
+                    st.sidebar.success(f"✅ Результат '{save_name.strip()}' сохранен!")
+                else:
+                    st.sidebar.info(f"ℹ️ Этот результат уже сохранен как '{os.path.basename(saved_path)}'")
+            except Exception as e:
+                st.sidebar.error(f"❌ Ошибка сохранения: {str(e)}")
+        else:
+            st.sidebar.error("❌ Введите название для сохранения")
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -479,16 +791,28 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load data using the function defined earlier
-daily_df, monthly_df, tiers_df = load_data()
+daily_df, monthly_df, tiers_df, data_fingerprint = load_data(st.session_state.result_id)
+if daily_df is None and st.session_state.result_id != DEFAULT_RESULT_ID:
+    # Запись кэша вытеснена или сохраненный результат удален в другой сессии
+    st.warning("Выбранный результат больше не доступен, показан результат run.py")
+    st.session_state.result_id = DEFAULT_RESULT_ID
+    daily_df, monthly_df, tiers_df, data_fingerprint = load_data(DEFAULT_RESULT_ID)
 
 if daily_df is None or monthly_df is None:
-    st.warning("CSV файлы не найдены. Запустите run.py для генерации данных.")
+    st.warning("Данные не найдены. Запустите run.py или сгенерируйте данные.")
+    # Tier returns need only the GGR multiplier: preview them at the target without simulating
+    st.caption(f"Предварительный расчет при целевом GGR {target_ggr:.1f}x")
+    display_tier_returns(target_ggr)
+    display_return_summary(target_ggr, pool_size, stable_ratio, growth_ratio)
+    poll_generation_job()
     st.stop()
 
-# Calculate key metrics from data (consolidated calculations)
-final_ggr = float(daily_df["cumulative_ggr"].iloc[-1])
-ggr_multiplier = float(daily_df["ggr_multiplier"].iloc[-1])
-real_pool_size = final_ggr / ggr_multiplier if ggr_multiplier > 0 else DEFAULT_POOL_SIZE
+# Key metrics and chart data, computed once per dataset (consolidated calculations)
+derived = derive_dashboard_data(data_fingerprint, daily_df, monthly_df, tiers_df)
+metrics = derived["metrics"]
+final_ggr = metrics["final_ggr"]
+ggr_multiplier = metrics["daily_multiplier"]
+real_pool_size = metrics["real_pool_size"]
 real_stable_ratio = stable_ratio  # Use calculated ratio from user input
 real_growth_ratio = growth_ratio  # Use calculated ratio from user input
 
@@ -562,7 +886,7 @@ with col_action2:
                             'is_favorite': True
                         }
                         
-                        save_generation_result(current_params, favorite_name.strip())
+                        save_generation_result(st.session_state.result_id, current_params, favorite_name.strip())
                         st.success(f"⭐ Конфигурация '{favorite_name.strip()}' сохранена в избранное!")
                         st.session_state.show_save_favorite = False
                         st.rerun()
@@ -578,55 +902,20 @@ with col_action2:
 
 # Removed duplicate calculations and title - using consolidated values from above
 
-def display_tier_returns(ggr_multiplier):
-    """Отображение доходности по тирам"""
-    st.subheader("💰 Доходность на $1 инвестиции")
-    
-    cols = st.columns(2)
-    
-    with cols[0]:
-        st.markdown("**🔵 Stable Pool** (только cash)")
-        for tier, rate in [('Basic', 0.34), ('Advanced', 0.3825), ('Premium', 0.425)]:
-            per_dollar = ggr_multiplier * rate
-            profit_pct = (per_dollar - 1) * 100
-            
-            color = "🟢" if per_dollar >= 1.0 else "🔴"
-            st.metric(
-                f"{color} {tier} ({rate*100:.2f}%)",
-                f"${per_dollar:.3f}",
-                f"{profit_pct:+.1f}%"
-            )
-    
-    with cols[1]:
-        st.markdown("**🟢 Growth Pool** (cash + 100% токенов)")
-        for tier, rate in [('Basic', 0.085), ('Advanced', 0.10625), ('Premium', 0.1275)]:
-            cash_per_dollar = ggr_multiplier * rate
-            total_per_dollar = cash_per_dollar + 1.0
-            
-            st.metric(
-                f"🟢 {tier} ({rate*100:.2f}%)",
-                f"${total_per_dollar:.3f}",
-                f"${cash_per_dollar:.3f} cash"
-            )
-
 # Дублированная секция экспорта удалена - используется объединенная версия ниже
 
 # Consolidated metrics section
 st.subheader("📊 Ключевые показатели и анализ")
 
-# Calculate all metrics once
-total_collected = real_pool_size
-total_stable_payout = float(monthly_df["stable_payout"].sum())
-total_growth_payout = float(monthly_df["growth_payout"].sum())
-total_cash_paid = total_stable_payout + total_growth_payout
-final_ggr = float(daily_df["cumulative_ggr"].iloc[-1])
-ggr_multiplier = final_ggr / total_collected if total_collected > 0 else 0
-total_referral_cost = float(monthly_df["monthly_referral_cost"].sum()) if "monthly_referral_cost" in monthly_df.columns else 0
-total_payments = total_cash_paid + total_referral_cost
-cost_of_capital = (total_payments / total_collected) * 100 if total_collected > 0 else 0
-spent = float(daily_df["cumulative_traffic"].iloc[-1])
-ftds = int(daily_df["new_ftds"].sum())
-avg_cpa = spent / max(1, ftds)
+# All metrics come from derive_dashboard_data
+total_collected = metrics["total_collected"]
+total_cash_paid = metrics["total_cash_paid"]
+ggr_multiplier = metrics["ggr_multiplier"]
+total_referral_cost = metrics["total_referral_cost"]
+cost_of_capital = metrics["cost_of_capital"]
+spent = metrics["spent"]
+ftds = metrics["ftds"]
+avg_cpa = metrics["avg_cpa"]
 
 # Main metrics in compact layout
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -650,20 +939,12 @@ with col6:
 with col7:
     st.metric("🤝 Реферальные", f"${total_referral_cost:,.0f}", help="Расходы на реферальную программу")
 with col8:
-    investment_ratio = (total_cash_paid / total_collected) * 100 if total_collected > 0 else 0
+    investment_ratio = metrics["investment_ratio"]
     st.metric("📊 Инвест. %", f"{investment_ratio:.1f}%", help="Процент инвестиционных выплат")
 with col9:
-    referral_ratio = (total_referral_cost / total_collected) * 100 if total_collected > 0 else 0
-    st.metric("🎁 Рефер. %", f"{referral_ratio:.1f}%", help="Процент реферальных расходов")
+    st.metric("🎁 Рефер. %", f"{metrics['referral_pct']:.1f}%", help="Процент реферальных расходов")
 with col10:
-    # Use the correct column name from the new referral system implementation
-    if "monthly_referral_cost" in monthly_df.columns:
-        referral_total = float(monthly_df["monthly_referral_cost"].sum())
-    elif "referral_paid_usd" in monthly_df.columns:
-        referral_total = float(monthly_df["referral_paid_usd"].sum())
-    else:
-        referral_total = 0.0
-    st.metric("🤝 Referral", f"${referral_total:,.0f}", delta="Payouts", help="Общие выплаты по реферальной программе. Включает моментальные и постоянные бонусы рефералам")
+    st.metric("🤝 Referral", f"${metrics['referral_total']:,.0f}", delta="Payouts", help="Общие выплаты по реферальной программе. Включает моментальные и постоянные бонусы рефералам")
 with col6:
     # Пустая колонка для баланса
     st.write("")
@@ -761,7 +1042,7 @@ with left:
 
 with right:
     st.subheader("💎 Total GGR")
-    total_ggr = float(daily_df["cumulative_ggr"].iloc[-1])
+    total_ggr = final_ggr
     multiplier = total_ggr / pool_size
     st.metric("💰 GGR", f"${total_ggr:,.0f}", delta=f"{multiplier:.2f}x множитель")
     
@@ -779,19 +1060,7 @@ st.divider()
 
 # Monthly payouts per pool (bar chart)
 st.subheader("📊 Ежемесячные выплаты по пулам")
-monthly_df_display = monthly_df.copy()
-# Add one month offset for payout dates (payouts happen at the end of the month, so display next month)
-monthly_df_display["date"] = pd.to_datetime(monthly_df_display[["year", "month"]].assign(day=1)) + pd.DateOffset(months=1)
-payouts_melt = monthly_df_display[["date", "stable_payout", "growth_payout"]].melt("date", var_name="pool", value_name="payout")
-payouts_melt["payout"] = payouts_melt["payout"].clip(lower=0)
-
-# Rename pools for better display
-payouts_melt["pool"] = payouts_melt["pool"].map({
-    "stable_payout": "🔵 Stable",
-    "growth_payout": "🟢 Growth"
-})
-
-monthly_chart = alt.Chart(payouts_melt).mark_bar().encode(
+monthly_chart = alt.Chart(derived["payouts_melt"]).mark_bar().encode(
     x=alt.X("pool:N", axis=alt.Axis(title="Пул")),
     y=alt.Y("payout:Q", axis=alt.Axis(title="Выплата (USD)")),
     color=alt.Color("pool:N", 
@@ -810,31 +1079,7 @@ st.divider()
 
 # Daily table with key metrics
 st.subheader("📅 Ежедневные ключевые показатели")
-daily_cols = [
-    "date",
-    "new_ftds",
-    "active_players", 
-    "total_deposits",
-    "daily_ggr",
-    "ggr_multiplier",
-    "traffic_spend",
-    "cumulative_ggr",
-]
-
-# Format the dataframe for better display
-daily_display = daily_df[daily_cols].copy()
-daily_display.columns = [
-    "📅 Дата",
-    "👥 Новые FTD", 
-    "🎮 Активные игроки",
-    "💰 Общие депозиты",
-    "📈 Дневной GGR",
-    "🎯 GGR множитель",
-    "📊 Трафик расходы",
-    "📊 Накопительный GGR"
-]
-
-st.dataframe(daily_display, use_container_width=True, hide_index=True)
+st.dataframe(derived["daily_display"], use_container_width=True, hide_index=True)
 
 st.divider()
 
@@ -855,117 +1100,16 @@ with col2:
         """)
 
 if tiers_df is None:
-    st.info("Запустите run.py, чтобы сгенерировать таблицу выплат по ZNX: pool1_nov2025_monthly_tiers_znx.csv")
+    st.info("Запустите run.py или сгенерируйте данные, чтобы получить таблицу выплат по ZNX")
 else:
-    tiers_df_display = tiers_df.copy()
-    # Add one month offset for payout dates (payouts happen at the end of the month, so display next month)
-    tiers_df_display["date"] = pd.to_datetime(tiers_df_display[["year", "month"]].assign(day=1)) + pd.DateOffset(months=1)
-    st.dataframe(
-        tiers_df_display[["date", "pool", "tier", "per_znx_cash_usd", "per_znx_total_usd"]],
-        use_container_width=True,
-        hide_index=True,
-    )
+    st.dataframe(derived["tiers_display"], use_container_width=True, hide_index=True)
 
     # Диаграмма удалена - таблицы достаточно
 
 # Add summary table for return per dollar invested
 st.divider()
-st.subheader("💰 Итоговая доходность: возврат на каждый вложенный доллар")
+display_return_summary(ggr_multiplier, real_pool_size, real_stable_ratio, real_growth_ratio)
 
-# Use CORRECT values from CSV data that includes proper tier calculations
-if daily_df is not None and monthly_df is not None and tiers_df is not None:
-    # Get final values from CSV
-    final_ggr = daily_df["cumulative_ggr"].iloc[-1]
-    ggr_multiplier = final_ggr / real_pool_size
-    
-    # Pool allocations (capital shares)
-    stable_basic_invested = real_pool_size * real_stable_ratio * 0.5
-    stable_advanced_invested = real_pool_size * real_stable_ratio * 0.3
-    stable_premium_invested = real_pool_size * real_stable_ratio * 0.2
-    
-    growth_basic_invested = real_pool_size * real_growth_ratio * 0.5
-    growth_advanced_invested = real_pool_size * real_growth_ratio * 0.3
-    growth_premium_invested = real_pool_size * real_growth_ratio * 0.2
-    
-    # NEW FORMULAS - Stable Pool (NO tokens returned)
-    # Stable: payout = investment × GGR_multiplier × tier_rate
-    stable_basic_received = stable_basic_invested * ggr_multiplier * 0.34
-    stable_advanced_received = stable_advanced_invested * ggr_multiplier * 0.3825
-    stable_premium_received = stable_premium_invested * ggr_multiplier * 0.425
-    
-    # NEW FORMULAS - Growth Pool (100% tokens RETURNED)
-    # Growth: total = (investment × GGR_multiplier × tier_rate) + investment
-    growth_basic_cash = growth_basic_invested * ggr_multiplier * 0.085
-    growth_advanced_cash = growth_advanced_invested * ggr_multiplier * 0.10625
-    growth_premium_cash = growth_premium_invested * ggr_multiplier * 0.1275
-    
-    growth_basic_total = growth_basic_cash + growth_basic_invested  # cash + tokens
-    growth_advanced_total = growth_advanced_cash + growth_advanced_invested  # cash + tokens
-    growth_premium_total = growth_premium_cash + growth_premium_invested  # cash + tokens
-    
-    # Per dollar calculations
-    stable_basic_per_dollar = ggr_multiplier * 0.34
-    stable_advanced_per_dollar = ggr_multiplier * 0.3825
-    stable_premium_per_dollar = ggr_multiplier * 0.425
-    
-    growth_basic_per_dollar = (ggr_multiplier * 0.085) + 1.00
-    growth_advanced_per_dollar = (ggr_multiplier * 0.10625) + 1.00
-    growth_premium_per_dollar = (ggr_multiplier * 0.1275) + 1.00
-    
-    # Create summary table
-    summary_data = {
-        "Пул": [
-            "🔵 Stable Basic (34%)", "🔵 Stable Advanced (38.25%)", "🔵 Stable Premium (42.5%)",
-            "🟢 Growth Basic (8.5%)", "🟢 Growth Advanced (10.625%)", "🟢 Growth Premium (12.75%)"
-        ],
-        "Вложено ($)": [
-            f"${stable_basic_invested:,.0f}",
-            f"${stable_advanced_invested:,.0f}",
-            f"${stable_premium_invested:,.0f}",
-            f"${growth_basic_invested:,.0f}",
-            f"${growth_advanced_invested:,.0f}",
-            f"${growth_premium_invested:,.0f}"
-        ],
-        "Получено ($)": [
-            f"${stable_basic_received:,.0f}",
-            f"${stable_advanced_received:,.0f}",
-            f"${stable_premium_received:,.0f}",
-            f"${growth_basic_total:,.0f}",
-            f"${growth_advanced_total:,.0f}",
-            f"${growth_premium_total:,.0f}"
-        ],
-        "На $1 получаешь": [
-            f"${stable_basic_per_dollar:.2f}",
-            f"${stable_advanced_per_dollar:.2f}",
-            f"${stable_premium_per_dollar:.2f}",
-            f"${growth_basic_per_dollar:.2f}",
-            f"${growth_advanced_per_dollar:.2f}",
-            f"${growth_premium_per_dollar:.2f}"
-        ]
-    }
-    
-    summary_df = pd.DataFrame(summary_data)
-    st.dataframe(summary_df, use_container_width=True, hide_index=True)
-    
-    # Add interactive explanation
-    with st.expander("🧮 Формулы расчетов"):
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("""
-            **💰 Stable пул:**
-            - Формула: `investment × GGR × tier_rate`
-            - Basic: 34% | Advanced: 38.25% | Premium: 42.5%
-            - Возврат на $1: `GGR × tier_rate`
-            """)
-        with col2:
-            st.markdown("""
-            **🚀 Growth пул:**
-            - Формула: `(investment × GGR × tier_rate) + investment`
-            - Basic: 8.5% | Advanced: 10.625% | Premium: 12.75%
-            - Возврат на $1: `(GGR × tier_rate) + 1.00`
-            """)
-        st.markdown("**📊 Распределение капитала:** Basic 30% | Advanced 40% | Premium 30%")
-else:
-    st.warning("Сгенерируйте данные для просмотра итоговой доходности")
+st.caption("Built with Streamlit + Altair")
 
-st.caption("Built with Streamlit + Altair")
\ No newline at end of file
+poll_generation_job()
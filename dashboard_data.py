@@ -0,0 +1,84 @@
+"""Data the dashboard derives from a loaded result: KPIs and chart / table frames.
+
+Kept free of Streamlit so benchmarks and scripts can time and reuse exactly
+what the dashboard computes; ``dashboard_app`` caches the result per dataset.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import pandas as pd
+
+# Daily table columns and their display names
+DAILY_DISPLAY_COLUMNS = {
+    "date": "📅 Дата",
+    "new_ftds": "👥 Новые FTD",
+    "active_players": "🎮 Активные игроки",
+    "total_deposits": "💰 Общие депозиты",
+    "daily_ggr": "📈 Дневной GGR",
+    "ggr_multiplier": "🎯 GGR множитель",
+    "traffic_spend": "📊 Трафик расходы",
+    "cumulative_ggr": "📊 Накопительный GGR",
+}
+
+
+def derive_dashboard_data(daily_df: pd.DataFrame, monthly_df: pd.DataFrame, tiers_df: Optional[pd.DataFrame] = None,
+                          fallback_pool_size: float = 50000) -> Dict[str, object]:
+    """KPI и таблицы для графиков одного результата; входные фреймы не изменяются."""
+    final_ggr = float(daily_df["cumulative_ggr"].iloc[-1])
+    daily_multiplier = float(daily_df["ggr_multiplier"].iloc[-1])
+    real_pool_size = final_ggr / daily_multiplier if daily_multiplier > 0 else fallback_pool_size
+
+    total_collected = real_pool_size
+    total_stable_payout = float(monthly_df["stable_payout"].sum())
+    total_growth_payout = float(monthly_df["growth_payout"].sum())
+    total_cash_paid = total_stable_payout + total_growth_payout
+    total_referral_cost = float(monthly_df["monthly_referral_cost"].sum()) if "monthly_referral_cost" in monthly_df.columns else 0
+    total_payments = total_cash_paid + total_referral_cost
+    spent = float(daily_df["cumulative_traffic"].iloc[-1])
+    ftds = int(daily_df["new_ftds"].sum())
+    # Use the correct column name from the new referral system implementation
+    if "monthly_referral_cost" in monthly_df.columns:
+        referral_total = float(monthly_df["monthly_referral_cost"].sum())
+    elif "referral_paid_usd" in monthly_df.columns:
+        referral_total = float(monthly_df["referral_paid_usd"].sum())
+    else:
+        referral_total = 0.0
+    metrics = {
+        "final_ggr": final_ggr,
+        "daily_multiplier": daily_multiplier,
+        "real_pool_size": real_pool_size,
+        "total_collected": total_collected,
+        "total_cash_paid": total_cash_paid,
+        "ggr_multiplier": final_ggr / total_collected if total_collected > 0 else 0,
+        "total_referral_cost": total_referral_cost,
+        "cost_of_capital": (total_payments / total_collected) * 100 if total_collected > 0 else 0,
+        "spent": spent,
+        "ftds": ftds,
+        "avg_cpa": spent / max(1, ftds),
+        "investment_ratio": (total_cash_paid / total_collected) * 100 if total_collected > 0 else 0,
+        "referral_pct": (total_referral_cost / total_collected) * 100 if total_collected > 0 else 0,
+        "referral_total": referral_total,
+    }
+
+    # Monthly payouts per pool for the bar chart
+    # Add one month offset for payout dates (payouts happen at the end of the month, so display next month)
+    payout_dates = pd.to_datetime(monthly_df[["year", "month"]].assign(day=1)) + pd.DateOffset(months=1)
+    payouts_melt = monthly_df[["stable_payout", "growth_payout"]].assign(date=payout_dates).melt(
+        "date", var_name="pool", value_name="payout")
+    payouts_melt["payout"] = payouts_melt["payout"].clip(lower=0)
+    # Rename pools for better display
+    payouts_melt["pool"] = payouts_melt["pool"].map({
+        "stable_payout": "🔵 Stable",
+        "growth_payout": "🟢 Growth"
+    })
+
+    # Daily table with key metrics
+    daily_display = daily_df[list(DAILY_DISPLAY_COLUMNS)].rename(columns=DAILY_DISPLAY_COLUMNS)
+
+    tiers_display = None
+    if tiers_df is not None:
+        tiers_display = tiers_df[["pool", "tier", "per_znx_cash_usd", "per_znx_total_usd"]].copy()
+        tiers_display.insert(0, "date", pd.to_datetime(tiers_df[["year", "month"]].assign(day=1)) + pd.DateOffset(months=1))
+    return {"metrics": metrics, "payouts_melt": payouts_melt, "daily_display": daily_display, "tiers_display": tiers_display}
@@ -0,0 +1,219 @@
+"""Background generation jobs with progress, polling and cancellation.
+
+The dashboard submits ``ResultCache.get_or_generate`` to a thread pool
+instead of running it inside the Streamlit script, so the page stays
+responsive and a rerun does not abort the work. Every job has a
+``JobStatus`` that the worker updates from the generator's progress
+callbacks (calibration iteration and error, simulated day) and that any
+session can poll with ``GenerationJob.snapshot()``. Jobs for the same cache
+key share one run, and every session that submitted it is a subscriber:
+``cancel()`` detaches one subscriber, and only the last one stops the work
+(cooperatively: the next progress callback raises ``GenerationCancelled``).
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, Mapping, Optional, Tuple
+
+from profiling import ProfileReport
+from result_cache import ResultCache, cache_key
+from result_store import ResultStore
+
+STATES = ("queued", "running", "done", "failed", "cancelled")
+FINISHED = ("done", "failed", "cancelled")
+
+# Progress bar bands: calibration fills the first part (its iteration count is unknown up front)
+CALIBRATION_BAND = (0.05, 0.70)
+CALIBRATION_EXPECTED_ITERATIONS = 8
+SIMULATION_BAND = (0.70, 0.95)
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+@dataclass
+class JobStatus:
+    state: str = "queued"
+    phase: str = ""
+    calibration_iteration: int = 0
+    calibration_error: Optional[float] = None
+    calibrating: bool = False
+    day: int = 0
+    days: int = 0
+    fraction: float = 0.0  # 0..1 for a progress bar
+    error: Optional[str] = None
+    subscribers: int = 1  # sessions waiting for this job
+    submitted: float = 0.0
+    finished: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in FINISHED
+
+
+@dataclass
+class JobResult:
+    store: ResultStore
+    key: str
+    cache_hit: bool
+    profile: Optional[ProfileReport] = None
+    params: Dict[str, object] = field(default_factory=dict)  # generator kwargs the result was made with
+    calibration: Optional[Dict[str, object]] = None
+
+
+class GenerationJob:
+    def __init__(self, job_id: str, key: str) -> None:
+        self.id = job_id
+        self.key = key
+        self._status = JobStatus(submitted=time.time())
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._future: Optional[Future] = None
+        self._result: Optional[JobResult] = None
+
+    def snapshot(self) -> JobStatus:
+        """Copy of the current status, safe to read while the worker updates it."""
+        with self._lock:
+            return replace(self._status)
+
+    def cancel(self) -> None:
+        """Detach one subscriber; the job stops once no subscriber is left."""
+        with self._lock:
+            self._status.subscribers = max(0, self._status.subscribers - 1)
+            if self._status.subscribers > 0:
+                return
+        self._stop()
+
+    def _subscribe(self) -> bool:
+        """Attach another session; False if the job is already being stopped."""
+        with self._lock:
+            if self._cancel.is_set():
+                return False
+            self._status.subscribers += 1
+            return True
+
+    def _stop(self) -> None:
+        with self._lock:
+            self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._update(state="cancelled", finished=time.time())
+
+    def result(self) -> Optional[JobResult]:
+        """The finished job's result; None while running, after a failure or a cancellation."""
+        with self._lock:
+            return self._result
+
+    def _update(self, **fields: object) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self._status, name, value)
+
+    def _on_progress(self, phase: str, info: Dict[str, object]) -> None:
+        """Generator progress callback (runs in the worker thread)."""
+        if self._cancel.is_set():
+            raise GenerationCancelled(self.id)
+        with self._lock:
+            status = self._status
+            status.phase = phase
+            if phase == "calibration":
+                status.calibration_iteration = int(info["iteration"])
+                status.calibration_error = float(info["error"])
+                status.calibrating = not info.get("done", False)
+                low, high = CALIBRATION_BAND
+                done = 1.0 if not status.calibrating else min(
+                    1.0, status.calibration_iteration / CALIBRATION_EXPECTED_ITERATIONS)
+                status.fraction = max(status.fraction, low + (high - low) * done)
+            elif phase == "simulation":
+                status.day, status.days = int(info["day"]), int(info["days"])
+                # Calibration runs simulations too; only the final one moves the bar past calibration
+                if not status.calibrating:
+                    low, high = SIMULATION_BAND
+                    status.fraction = max(status.fraction, low + (high - low) * status.day / max(1, status.days))
+            elif phase == "payouts" and not status.calibrating:
+                status.fraction = max(status.fraction, SIMULATION_BAND[1])
+
+    def _run(self, cache: ResultCache, params: Mapping[str, object], calibration: Optional[Mapping[str, object]],
+             profile: bool) -> JobResult:
+        if self._cancel.is_set():
+            self._update(state="cancelled", finished=time.time())
+            raise GenerationCancelled(self.id)
+        self._update(state="running", calibrating=bool(calibration))
+        try:
+            store, key, hit = cache.get_or_generate(params, calibration=calibration, profile=profile,
+                                                    progress=self._on_progress)
+        except GenerationCancelled:
+            self._update(state="cancelled", finished=time.time())
+            raise
+        except Exception as exc:
+            self._update(state="failed", error=f"{type(exc).__name__}: {exc}", finished=time.time())
+            raise
+        result = JobResult(store=store, key=key, cache_hit=hit, profile=cache.last_profile, params=dict(params),
+                           calibration=None if calibration is None else dict(calibration))
+        with self._lock:
+            self._result = result
+        self._update(state="done", phase="done", fraction=1.0, finished=time.time())
+        return result
+
+
+class GenerationRunner:
+    """Thread pool of generation jobs shared by every dashboard session."""
+
+    def __init__(self, cache: ResultCache, max_workers: int = 2, keep_finished: int = 32) -> None:
+        self.cache = cache
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation")
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def submit(self, params: Mapping[str, object], calibration: Optional[Mapping[str, object]] = None,
+               profile: bool = False) -> GenerationJob:
+        """Start generating in the background; an unfinished job for the same result is reused.
+
+        Every call subscribes the caller to the returned job; release it with ``job.cancel()``.
+        """
+        key = cache_key(params, calibration)
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and not job.snapshot().is_finished and job._subscribe():
+                    return job
+            self._prune()
+            job = GenerationJob(f"job-{next(self._ids)}", key)
+            self._jobs[job.id] = job
+            job._future = self._executor.submit(job._run, self.cache, dict(params), calibration, profile)
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        finished = sorted(
+            (job.snapshot().finished, job_id) for job_id, job in self._jobs.items() if job.snapshot().is_finished
+        )
+        for _, job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, cancel: bool = True) -> None:
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job._stop()
+        self._executor.shutdown(wait=True)
+
+
+def wait(job: GenerationJob, poll_seconds: float = 0.1, timeout: Optional[float] = None) -> Tuple[JobStatus, Optional[JobResult]]:
+    """Block until ``job`` finishes (for scripts and tests); returns its final status and result."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not job.snapshot().is_finished:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        time.sleep(poll_seconds)
+    return job.snapshot(), job.result()
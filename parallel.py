@@ -0,0 +1,129 @@
+"""Process-pool execution for Monte Carlo runs and parameter sweeps.
+
+Work is cut into fixed-size shards (path ranges or parameter sets). Every
+shard gets its own child of one root ``SeedSequence``, and each worker builds
+its own ``RevSharePoolGenerator``, so no RNG or generator state is shared
+between processes. Shard boundaries do not depend on the worker count, so a
+run reproduces exactly with any ``max_workers``.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from revshare_pool import MonteCarloResult, RevSharePoolGenerator
+
+
+def parallel_map(func: Callable, tasks: Iterable, max_workers: Optional[int] = None,
+                 chunksize: Optional[int] = None) -> List:
+    """Run ``func`` over ``tasks`` in a process pool, keeping task order.
+
+    ``func`` must be a picklable top-level function (use functools.partial for
+    extra arguments). ``max_workers=1`` runs inline, e.g. inside Streamlit.
+    Workers live for the whole call, so imports happen once per worker; by
+    default tasks are sent in chunks of about a quarter of each worker's share.
+    """
+    tasks = list(tasks)
+    workers = min(max_workers or os.cpu_count() or 1, max(1, len(tasks)))
+    if workers == 1:
+        return [func(task) for task in tasks]
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, tasks, chunksize=chunksize))
+
+
+def _build_generator(params: Mapping[str, object], seed: Optional[int],
+                     scales: Optional[Tuple[float, float, float]] = None) -> RevSharePoolGenerator:
+    kwargs = {"engine": "numpy", **params, "seed": seed}
+    gen = RevSharePoolGenerator(**kwargs)
+    if scales is not None:
+        gen._deposit_scale, gen._retention_scale, gen._cpa_scale = scales
+    return gen
+
+
+def _seed_int(seed_seq: np.random.SeedSequence) -> int:
+    return int(seed_seq.generate_state(1)[0])
+
+
+def _simulate_shard(task: Tuple[Mapping[str, object], Tuple[float, float, float], int,
+                                np.random.SeedSequence]) -> Tuple[Dict[str, np.ndarray], pd.DataFrame]:
+    params, scales, n_paths, seed_seq = task
+    gen = _build_generator(params, _seed_int(seed_seq), scales)
+    result = gen.simulate_many(n_paths, seeds=seed_seq)
+    return {name: getattr(result, name) for name in MonteCarloResult.ARRAYS}, result.path_metrics
+
+
+def run_monte_carlo(
+    params: Mapping[str, object],
+    n_paths: int,
+    seed: Optional[int] = None,
+    calibrate: bool = True,
+    tolerance: float = 0.02,
+    shard_size: int = 500,
+    max_workers: Optional[int] = None,
+    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+) -> MonteCarloResult:
+    """Shard ``n_paths`` Monte Carlo paths of one parameter set across processes.
+
+    ``params`` are RevSharePoolGenerator kwargs. Calibration (CRN) runs once in
+    the parent; every shard reuses the calibrated scales.
+    """
+    if n_paths <= 0:
+        raise ValueError("n_paths must be positive")
+    root = np.random.SeedSequence(seed)
+    calibration_seed, shards_seed = root.spawn(2)
+    gen = _build_generator(params, _seed_int(calibration_seed))
+    if calibrate:
+        gen.calibrate_to_target_ggr(tolerance=tolerance, method="crn")
+    scales = (gen._deposit_scale, gen._retention_scale, gen._cpa_scale)
+
+    sizes = [min(shard_size, n_paths - start) for start in range(0, n_paths, shard_size)]
+    tasks = [(dict(params), scales, size, child) for size, child in zip(sizes, shards_seed.spawn(len(sizes)))]
+    shards = parallel_map(_simulate_shard, tasks, max_workers, chunksize=1)
+
+    arrays = {name: np.concatenate([arrays[name] for arrays, _ in shards]) for name in MonteCarloResult.ARRAYS}
+    path_metrics = pd.concat([metrics for _, metrics in shards], ignore_index=True)
+    return MonteCarloResult.from_arrays(arrays, path_metrics, quantiles)
+
+
+def evaluate_parameter_set(task: Tuple[Mapping[str, object], np.random.SeedSequence],
+                           n_paths: int = 200, tolerance: float = 0.02) -> Dict[str, object]:
+    """Calibrate one parameter set and summarize ``n_paths`` Monte Carlo paths as one result row."""
+    params, seed_seq = task
+    gen = _build_generator(params, _seed_int(seed_seq))
+    calibration = gen.calibrate_to_target_ggr(tolerance=tolerance, method="crn")
+    result = gen.simulate_many(n_paths, seeds=seed_seq)
+    row: Dict[str, object] = dict(params)
+    row.update({
+        "calibration_iterations": calibration.iterations,
+        "calibration_error": calibration.error,
+        "deposit_scale": calibration.deposit_scale,
+        "retention_scale": calibration.retention_scale,
+        "cpa_scale": calibration.cpa_scale,
+    })
+    medians = result.path_metrics.select_dtypes(include="number").median()
+    row.update({f"median_{name}": float(value) for name, value in medians.items()})
+    row.update({f"p_{name}": value for name, value in result.probabilities.items()})
+    return row
+
+
+def run_parameter_sets(
+    param_sets: Sequence[Mapping[str, object]],
+    evaluate: Callable[[Tuple[Mapping[str, object], np.random.SeedSequence]], Dict[str, object]] = evaluate_parameter_set,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Evaluate parameter sets across processes and gather one row per set.
+
+    ``evaluate`` receives ``(params, seed_sequence)`` and returns a flat dict;
+    the default calibrates and summarizes a small Monte Carlo batch.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(param_sets))
+    rows = parallel_map(evaluate, [(dict(params), child) for params, child in zip(param_sets, children)], max_workers)
+    return pd.DataFrame(rows)
@@ -0,0 +1,239 @@
+"""Portfolio of several RevShare pools simulated in one vectorized pass.
+
+Every pool is a ``RevSharePoolGenerator`` (its own size, stable/growth split,
+CPA range, horizon and calibrated scales). The pools are laid on one common
+calendar starting at the earliest ``start_date``: a later pool simply
+acquires its FTDs later, so the cohort engine runs once with the pools on its
+path axis, and per-pool settings broadcast as one value per path.
+
+Traffic is either bought per pool (each pool spends its ``pool_size`` over
+its own acquisition window, as the generator does) or from one shared
+``traffic_budget`` split day by day between the pools acquiring that day, in
+proportion to their size. Daily CPAs keep each pool's uniform range but are
+correlated across pools through a Gaussian copula (``cpa_correlation``).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import cohort_engine
+from revshare_pool import RevSharePoolGenerator
+
+# Daily money flows summed over pools and months
+FLOWS = (
+    "new_ftds", "active_players", "total_deposits", "daily_ggr", "traffic_spend",
+    "stable_payout", "growth_payout", "daily_upfront_referral", "daily_total_referral",
+)
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+
+@dataclass
+class PortfolioResult:
+    daily: pd.DataFrame  # portfolio totals per calendar day
+    monthly: pd.DataFrame  # portfolio totals per calendar month
+    pools: Dict[str, pd.DataFrame]  # per-pool daily frames, same columns as generate_daily_data
+    pool_monthly: pd.DataFrame  # per-pool monthly totals, one row per (pool, year, month)
+
+
+class _PoolStack:
+    """Generator-like view of several pools for ``cohort_engine``: numeric settings are one value per pool."""
+
+    def __init__(self, gens, start_date, bucket: int) -> None:
+        first = gens[0]
+        for name in ("pool_size", "stable_ratio", "growth_ratio", "ggr_volatility", "referral_ratio",
+                     "upfront_bonus_stable", "upfront_bonus_growth", "ongoing_share_stable",
+                     "ongoing_share_growth", "stable_weighted_rate", "growth_weighted_rate",
+                     "_deposit_scale", "_retention_scale", "_cpa_scale"):
+            setattr(self, name, np.array([getattr(gen, name) for gen in gens], dtype=float))
+        self.cpa_range = tuple(np.array([float(gen.cpa_range[i]) for gen in gens]) for i in range(2))
+        self.use_enhanced_retention = first.use_enhanced_retention
+        self._retention_table = first._retention_table
+        self._deposit_table = first._deposit_table
+        self.start_date = start_date
+        self.cohort_bucket_days = bucket
+
+
+class Portfolio:
+    def __init__(
+        self,
+        pools: Mapping[str, Union[RevSharePoolGenerator, Mapping[str, object]]],
+        traffic_budget: Optional[float] = None,
+        cpa_correlation: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """``pools`` maps a pool name to a generator or to generator kwargs; pools keep their own scales."""
+        if not pools:
+            raise ValueError("portfolio needs at least one pool")
+        if not 0.0 <= cpa_correlation <= 1.0:
+            raise ValueError("cpa_correlation must be between 0 and 1")
+        self.pools: Dict[str, RevSharePoolGenerator] = {
+            name: pool if isinstance(pool, RevSharePoolGenerator) else RevSharePoolGenerator(**pool)
+            for name, pool in pools.items()
+        }
+        first = next(iter(self.pools.values()))
+        for name, gen in self.pools.items():
+            # One cohort pass needs one retention / deposit model
+            if (gen.use_enhanced_retention != first.use_enhanced_retention
+                    or gen.retention_schedule != first.retention_schedule
+                    or gen.deposit_by_days != first.deposit_by_days):
+                raise ValueError(f"pool {name!r} must use the same retention model and schedules as the others")
+        self.traffic_budget = None if traffic_budget is None else float(traffic_budget)
+        self.cpa_correlation = float(cpa_correlation)
+        self.seed = seed
+        self._rng = np.random.default_rng(seed)
+
+        gens = list(self.pools.values())
+        self.start_date = min(gen.start_date for gen in gens)
+        self.offsets = np.array([(gen.start_date - self.start_date).days for gen in gens])
+        self.horizons = np.array([gen.horizon_days for gen in gens])
+        self.acquisition = np.array([gen.acquisition_days for gen in gens])
+        self.days = int((self.offsets + self.horizons).max())
+        self._stack = _PoolStack(gens, self.start_date, max(gen.cohort_bucket_days for gen in gens))
+
+    def _traffic_schedule(self, span: int) -> Dict[str, np.ndarray]:
+        """(pools × span) spend, CPA and FTDs on the portfolio calendar."""
+        rng = self._rng
+        stack = self._stack
+        day = np.arange(span)[None, :]
+        window = (day >= self.offsets[:, None]) & (day < (self.offsets + self.acquisition)[:, None])
+
+        # Dirichlet(2, ..., 2) = normalized Gamma(2) draws
+        if self.traffic_budget is None:
+            weights = rng.gamma(2.0, size=window.shape) * window
+            spends = weights / weights.sum(axis=1, keepdims=True) * stack.pool_size[:, None]
+        else:
+            buying = window.any(axis=0)
+            daily = rng.gamma(2.0, size=span) * buying
+            daily *= self.traffic_budget / daily.sum()
+            size = window * stack.pool_size[:, None]
+            spends = daily * size / np.where(buying, size.sum(axis=0), 1.0)
+
+        # Gaussian copula: a common daily CPA factor, uniform marginals per pool
+        rho = self.cpa_correlation
+        z = math.sqrt(rho) * rng.standard_normal(span) + math.sqrt(1.0 - rho) * rng.standard_normal(window.shape)
+        u = 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+        low, high = (bound[:, None] * stack._cpa_scale[:, None] for bound in stack.cpa_range)
+        cpas = np.where(window, low + (high - low) * u, 0.0)
+        ftds = np.where(window, np.maximum(0, np.round(spends / np.where(window, cpas, 1.0))), 0).astype(np.int64)
+        return {"traffic_spend": spends, "cpa": cpas, "new_ftds": ftds}
+
+    def simulate(self) -> PortfolioResult:
+        """Simulate every pool in one pass; returns portfolio and per-pool daily / monthly frames."""
+        stack = self._stack
+        rng = self._rng
+        days = self.days
+        cal = cohort_engine.calendar_arrays(self.start_date, days)
+        span = int((self.offsets + self.acquisition).max())
+        schedule = self._traffic_schedule(span)
+        ftds = schedule["new_ftds"]
+
+        active_players, total_deposits = cohort_engine.simulate_cohorts(
+            stack, rng, ftds, cal, stack.cohort_bucket_days)
+        # Each pool stops at the end of its own horizon
+        day = np.arange(days)[None, :]
+        live = (day >= self.offsets[:, None]) & (day < (self.offsets + self.horizons)[:, None])
+        active_players *= live
+        total_deposits *= live
+        daily_ggr = cohort_engine.simulate_daily_ggr(stack, rng, total_deposits)
+
+        pad = ((0, 0), (0, days - span))
+        upfront = np.pad(cohort_engine.simulate_upfront_referral(stack, rng, ftds, cal), pad)
+        arrays = {
+            "new_ftds": np.pad(ftds, pad),
+            "active_players": active_players,
+            "total_deposits": total_deposits,
+            "daily_ggr": daily_ggr,
+            "traffic_spend": np.pad(schedule["traffic_spend"], pad),
+            "daily_upfront_referral": upfront,
+        }
+        arrays.update(cohort_engine.distribute_payouts(stack, daily_ggr, upfront, cal))
+
+        return PortfolioResult(
+            daily=self._portfolio_daily(arrays, cal, live),
+            monthly=self._monthly(arrays, cal),
+            pools={name: self._pool_daily(i, arrays) for i, name in enumerate(self.pools)},
+            pool_monthly=self._pool_monthly(arrays, cal, live),
+        )
+
+    def _pool_daily(self, i: int, arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+        gen = list(self.pools.values())[i]
+        window = slice(int(self.offsets[i]), int(self.offsets[i] + self.horizons[i]))
+        own = {name: values[i:i + 1, window] for name, values in arrays.items()}
+        own["cumulative_ggr"] = np.cumsum(own["daily_ggr"], axis=1)
+        own["cumulative_traffic"] = np.cumsum(own["traffic_spend"], axis=1)
+        df = cohort_engine.daily_frame(gen, own)
+        if self.traffic_budget is not None:
+            df["effective_traffic_budget"] = float(own["traffic_spend"].sum())
+
+        # Same payout columns as RevSharePoolGenerator._distribute_payouts
+        cumulative_stable = np.cumsum(own["stable_payout"][0])
+        cumulative_growth = np.cumsum(own["growth_payout"][0])
+        stable_pool_size = gen.pool_size * gen.stable_ratio
+        growth_pool_size = gen.pool_size * gen.growth_ratio
+        df["stable_payout"] = own["stable_payout"][0]
+        df["growth_payout"] = own["growth_payout"][0]
+        df["cumulative_stable"] = cumulative_stable
+        df["cumulative_growth"] = cumulative_growth
+        df["stable_return_pct"] = (cumulative_stable / stable_pool_size) * 100.0 if stable_pool_size > 0 else 0.0
+        df["growth_return_pct"] = (cumulative_growth / growth_pool_size) * 100.0 if growth_pool_size > 0 else 0.0
+        df["daily_total_referral"] = own["daily_total_referral"][0]
+        df["cumulative_referral_cost"] = np.cumsum(own["daily_total_referral"][0])
+        return df
+
+    def _portfolio_daily(self, arrays: Dict[str, np.ndarray], cal: Dict[str, np.ndarray],
+                         live: np.ndarray) -> pd.DataFrame:
+        df = pd.DataFrame({
+            "date": cal["date"],
+            "day": np.arange(1, self.days + 1),
+            "month": cal["month"],
+            "year": cal["year"],
+            "active_pools": live.sum(axis=0),
+        })
+        for name in FLOWS:
+            df[name] = arrays[name].sum(axis=0)
+        df["cumulative_ggr"] = np.cumsum(df["daily_ggr"].to_numpy())
+        df["cumulative_traffic"] = np.cumsum(df["traffic_spend"].to_numpy())
+        df["cumulative_stable"] = np.cumsum(df["stable_payout"].to_numpy())
+        df["cumulative_growth"] = np.cumsum(df["growth_payout"].to_numpy())
+        df["cumulative_referral_cost"] = np.cumsum(df["daily_total_referral"].to_numpy())
+        return df
+
+    def _monthly_sums(self, arrays: Dict[str, np.ndarray], cal: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """(pools × months) sums of every flow; active players are the month's average."""
+        starts, month_of_day = cohort_engine.month_starts(cal)
+        sums = {name: np.add.reduceat(arrays[name], starts, axis=1) for name in FLOWS}
+        days_in_month = np.bincount(month_of_day)
+        sums["active_players"] = sums["active_players"] / days_in_month
+        return sums
+
+    def _monthly(self, arrays: Dict[str, np.ndarray], cal: Dict[str, np.ndarray]) -> pd.DataFrame:
+        starts, _ = cohort_engine.month_starts(cal)
+        sums = self._monthly_sums(arrays, cal)
+        df = pd.DataFrame({"year": cal["year"][starts], "month": cal["month"][starts]})
+        for name in FLOWS:
+            df[name] = sums[name].sum(axis=0)
+        df["cumulative_ggr"] = np.cumsum(df["daily_ggr"].to_numpy())
+        return df
+
+    def _pool_monthly(self, arrays: Dict[str, np.ndarray], cal: Dict[str, np.ndarray],
+                      live: np.ndarray) -> pd.DataFrame:
+        starts, _ = cohort_engine.month_starts(cal)
+        sums = self._monthly_sums(arrays, cal)
+        n_pools, n_months = sums["daily_ggr"].shape
+        df = pd.DataFrame({
+            "pool": np.repeat(list(self.pools), n_months),
+            "year": np.tile(cal["year"][starts], n_pools),
+            "month": np.tile(cal["month"][starts], n_pools),
+        })
+        for name in FLOWS:
+            df[name] = sums[name].ravel()
+        df["cumulative_ggr"] = np.cumsum(sums["daily_ggr"], axis=1).ravel()
+        # Only the months within each pool's horizon
+        return df[np.add.reduceat(live, starts, axis=1).ravel() > 0].reset_index(drop=True)
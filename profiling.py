@@ -0,0 +1,180 @@
+"""Opt-in timing instrumentation for RevSharePoolGenerator.
+
+``with gen.profiling() as profiler:`` times every instrumented phase
+(calibration, simulation, payouts, monthly summary, ...) with wall-clock
+timers, counts calibration iterations and evaluations, and counts random
+draws by routing the generator's ``np.random.Generator`` through a counting
+proxy (same stream, so results do not change). Nested phases are reported as
+``outer/inner`` with inclusive times; draws go to the innermost phase.
+Outside ``profiling()`` the phase decorators only check one attribute.
+
+``capture="cprofile"`` (standard library) or ``capture="pyinstrument"``
+(optional dependency) additionally records a call profile of the whole block
+as text in the report.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pyinstrument import Profiler as _Pyinstrument
+except ImportError:  # optional dependency
+    _Pyinstrument = None
+
+
+CAPTURES = ("cprofile", "pyinstrument")
+
+# np.random.Generator methods that consume the stream
+DRAW_METHODS = frozenset({
+    "random", "uniform", "normal", "standard_normal", "integers", "choice", "dirichlet", "gamma",
+    "standard_gamma", "exponential", "standard_exponential", "poisson", "binomial", "beta", "lognormal",
+    "permutation", "shuffle", "bytes",
+})
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    seconds: float = 0.0  # inclusive of nested phases
+    draws: int = 0  # random numbers drawn directly in this phase
+
+
+@dataclass
+class ProfileReport:
+    phases: Dict[str, PhaseStats]
+    counters: Dict[str, int]
+    total_seconds: float
+    draws: int
+    profile: Optional[str] = None  # cProfile / pyinstrument text
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per phase path with calls, seconds, share of the total and draws."""
+        rows = [
+            {"phase": name, "calls": s.calls, "seconds": s.seconds,
+             "share": s.seconds / self.total_seconds if self.total_seconds > 0 else 0.0, "draws": s.draws}
+            for name, s in self.phases.items()
+        ]
+        return pd.DataFrame(rows, columns=["phase", "calls", "seconds", "share", "draws"])
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "phases": {name: vars(s).copy() for name, s in self.phases.items()},
+            "counters": dict(self.counters),
+            "total_seconds": self.total_seconds,
+            "draws": self.draws,
+        }
+
+
+class _CountingRNG:
+    """np.random.Generator proxy that counts drawn numbers per phase; everything else passes through."""
+
+    def __init__(self, rng: np.random.Generator, profiler: "GenerationProfiler") -> None:
+        self._rng = rng
+        self._profiler = profiler
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._rng, name)
+        if name not in DRAW_METHODS:
+            return attr
+
+        def draw(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            self._profiler._add_draws(1 if result is None else int(np.size(result)))
+            return result
+
+        return draw
+
+
+class GenerationProfiler:
+    def __init__(self, capture: Optional[str] = None) -> None:
+        if capture is not None and capture not in CAPTURES:
+            raise ValueError(f"capture must be one of {CAPTURES}")
+        if capture == "pyinstrument" and _Pyinstrument is None:
+            raise ImportError("capture='pyinstrument' needs the pyinstrument package")
+        self.capture = capture
+        self.phases: Dict[str, PhaseStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._stack: List[str] = []
+        self._started = 0.0
+        self._elapsed = 0.0
+        self._capture = None
+        self._profile_text: Optional[str] = None
+
+    def wrap_rng(self, rng: np.random.Generator) -> _CountingRNG:
+        return _CountingRNG(rng, self)
+
+    def _stats(self) -> PhaseStats:
+        name = "/".join(self._stack) if self._stack else "(outside phases)"
+        return self.phases.setdefault(name, PhaseStats())
+
+    def _add_draws(self, n: int) -> None:
+        self._stats().draws += n
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        stats = self._stats()
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - started
+            self._stack.pop()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def start(self) -> None:
+        if self.capture == "cprofile":
+            self._capture = cProfile.Profile()
+            self._capture.enable()
+        elif self.capture == "pyinstrument":
+            self._capture = _Pyinstrument()
+            self._capture.start()
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        self._elapsed += time.perf_counter() - self._started
+        if self.capture == "cprofile":
+            self._capture.disable()
+            out = io.StringIO()
+            pstats.Stats(self._capture, stream=out).sort_stats("cumulative").print_stats(30)
+            self._profile_text = out.getvalue()
+        elif self.capture == "pyinstrument":
+            self._capture.stop()
+            self._profile_text = self._capture.output_text()
+
+    def report(self) -> ProfileReport:
+        return ProfileReport(
+            phases={name: PhaseStats(**vars(s)) for name, s in self.phases.items()},
+            counters=dict(self.counters),
+            total_seconds=self._elapsed,
+            draws=sum(s.draws for s in self.phases.values()),
+            profile=self._profile_text,
+        )
+
+
+def timed_phase(name: str) -> Callable:
+    """Method decorator: time the call as phase ``name`` while the instance's ``_profiler`` is set."""
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self._profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            with profiler.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
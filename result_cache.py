@@ -0,0 +1,204 @@
+"""Content-addressed cache of generated results.
+
+The key is a SHA-256 of the normalized ``RevSharePoolGenerator`` kwargs
+(defaults filled in, numbers as floats, schedules as sorted lists), the seed,
+the engine and ``ENGINE_VERSION``, and the calibration settings. Each entry is
+a ResultStore directory plus ``meta.json``; its mtime is the last access, and
+the least recently used entries are evicted once the cache exceeds
+``max_bytes``. Entries are written to a temp directory and renamed into
+place, so concurrent sessions never see partial results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from calibration_index import CalibrationIndex
+from profiling import ProfileReport
+from result_store import ResultStore
+from revshare_pool import RevSharePoolGenerator
+
+META_FILE = "meta.json"
+
+
+def normalize_params(params: Mapping[str, object]) -> Dict[str, object]:
+    """Full RevSharePoolGenerator kwargs with defaults applied, in a canonical JSON-able form."""
+    bound = inspect.signature(RevSharePoolGenerator.__init__).bind(None, **params)
+    bound.apply_defaults()
+    kwargs = dict(bound.arguments)
+    kwargs.pop("self")
+    if kwargs["traffic_budget"] is None:
+        kwargs["traffic_budget"] = kwargs["pool_size"]
+
+    def canonical(value):
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, Mapping):
+            return sorted([list(map(canonical, key)), canonical(v)] for key, v in value.items())
+        if isinstance(value, (tuple, list)):
+            return [canonical(v) for v in value]
+        return str(value)
+
+    normalized = {name: canonical(value) for name, value in kwargs.items() if name != "seed"}
+    normalized["seed"] = None if kwargs["seed"] is None else int(kwargs["seed"])
+    return normalized
+
+
+def cache_key(params: Mapping[str, object], calibration: Optional[Mapping[str, object]] = None) -> str:
+    payload = {
+        "params": normalize_params(params),
+        "engine_version": RevSharePoolGenerator.ENGINE_VERSION,
+        "calibration": dict(calibration) if calibration else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _dir_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class ResultCache:
+    def __init__(self, directory: str = os.path.join(".cache", "results"), max_bytes: int = 256 * 2**20,
+                 calibration_index: Optional[CalibrationIndex] = None) -> None:
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        # Converged calibrations of misses are recorded for opt-in warm starts (sweeps); misses themselves
+        # always calibrate from the nominal scales, so a key maps to one result whatever the index holds
+        self.calibration_index = calibration_index
+        # Shared by the generation threads of every dashboard session: += on an attribute is not atomic
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+
+    @property
+    def last_profile(self) -> Optional[ProfileReport]:
+        """Report of this thread's last miss generated with profile=True (threads share the cache)."""
+        return getattr(self._local, "profile", None)
+
+    @last_profile.setter
+    def last_profile(self, report: Optional[ProfileReport]) -> None:
+        self._local.profile = report
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[ResultStore]:
+        entry = self._entry(key)
+        store = ResultStore(entry)
+        if not store.exists():
+            self._count("misses")
+            return None
+        self._count("hits")
+        meta = os.path.join(entry, META_FILE)
+        if os.path.exists(meta):
+            os.utime(meta)  # mark as recently used
+        return store
+
+    def store(self, key: str) -> ResultStore:
+        """Entry of ``key`` as a store to read in place (no lookup counted; it may have been evicted)."""
+        return ResultStore(self._entry(key))
+
+    def put(self, key: str, daily, monthly, tiers=None, meta: Optional[Mapping[str, object]] = None) -> ResultStore:
+        entry = self._entry(key)
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        ResultStore(tmp).write(daily, monthly, tiers)
+        with open(os.path.join(tmp, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"key": key, "created": time.time(), **(meta or {})}, f, ensure_ascii=False, indent=2, default=str)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another process stored the same key first; its result is identical
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._evict(keep=key)
+        return ResultStore(entry)
+
+    def get_or_generate(self, params: Mapping[str, object], calibration: Optional[Mapping[str, object]] = None,
+                        profile: bool = False,
+                        progress: Optional[Callable[[str, Dict[str, object]], None]] = None,
+                        ) -> Tuple[ResultStore, str, bool]:
+        """Cached result for ``params`` (+ calibration kwargs); returns ``(store, key, hit)``.
+
+        With ``profile`` a miss is generated under ``gen.profiling()``; the
+        report is kept in ``last_profile`` and in the entry's meta.json.
+        ``progress`` receives the generator's progress (see
+        ``RevSharePoolGenerator.tracking_progress``) and may raise to abort.
+        """
+        self.last_profile = None
+        key = cache_key(params, calibration)
+        store = self.get(key)
+        if store is not None:
+            return store, key, True
+        gen = RevSharePoolGenerator(**params)
+        with ExitStack() as stack:
+            profiler = stack.enter_context(gen.profiling()) if profile else None
+            if progress is not None:
+                stack.enter_context(gen.tracking_progress(progress))
+            if calibration:
+                report = gen.calibrate_to_target_ggr(**calibration)
+                if self.calibration_index is not None:
+                    self.calibration_index.record(gen, report)
+            daily_df = gen.generate_daily_data()
+            monthly_df = gen.get_monthly_summary(daily_df)
+            tiers_df = gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+        meta = {"params": normalize_params(params), "calibration": calibration}
+        if profiler is not None:
+            self.last_profile = profiler.report()
+            meta["profile"] = self.last_profile.to_dict()
+        return self.put(key, daily_df, monthly_df, tiers_df, meta), key, False
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for item in os.scandir(self.directory):
+            meta = os.path.join(item.path, META_FILE)
+            if item.is_dir() and not item.name.endswith(".tmp") and os.path.exists(meta):
+                entries.append((os.path.getmtime(meta), _dir_size(item.path), item.path))
+        return entries
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = sorted(self._entries())  # least recently used first
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.basename(path) == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self._count("evictions")
+
+    def _count(self, counter: str) -> None:
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, object]:
+        entries = self._entries()
+        with self._counter_lock:
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,277 @@
+"""SQLite catalog of saved results.
+
+One row per folder in ``saved_results/`` with its generation parameters,
+headline KPIs, creation time and tags, written when a result is saved and
+removed when it is deleted. The dashboard lists, filters and sorts saved
+results with one indexed query instead of opening every
+``generation_params.json`` on every rerun. ``sync`` reconciles the catalog
+with the folders whenever the folder listing changes (results saved before
+the catalog existed or by another process, folders removed by hand) and
+reports the folders it could not read instead of skipping them silently.
+
+Like ``CalibrationIndex``: WAL and a busy timeout make it safe to share
+between sessions, and connections are opened per call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from result_store import ResultStore
+
+PARAMS_FILE = "generation_params.json"
+CATALOG_FILE = "catalog.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_results (
+    name TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    cache_key TEXT,
+    pool_size REAL,
+    target_ggr REAL,
+    ggr_multiplier REAL,
+    cost_of_capital REAL,
+    total_cash_paid REAL,
+    params TEXT NOT NULL,
+    kpis TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saved_results_created ON saved_results (created);
+CREATE INDEX IF NOT EXISTS saved_results_cache_key ON saved_results (cache_key);
+CREATE INDEX IF NOT EXISTS saved_results_ggr ON saved_results (ggr_multiplier);
+CREATE INDEX IF NOT EXISTS saved_results_cost ON saved_results (cost_of_capital);
+CREATE TABLE IF NOT EXISTS result_tags (
+    tag TEXT NOT NULL,
+    name TEXT NOT NULL REFERENCES saved_results (name) ON DELETE CASCADE,
+    PRIMARY KEY (tag, name)
+);
+CREATE INDEX IF NOT EXISTS result_tags_name ON result_tags (name);
+"""
+
+# Sortable columns (whitelisted: they are formatted into the query)
+SORT_COLUMNS = ("created", "name", "pool_size", "target_ggr", "ggr_multiplier", "cost_of_capital", "total_cash_paid")
+
+
+def kpis_from_tables(daily: Optional[pd.DataFrame], monthly: Optional[pd.DataFrame]) -> Dict[str, float]:
+    """Headline KPIs of a stored result (empty without data), as shown in the dashboard."""
+    if daily is None or monthly is None or daily.empty:
+        return {}
+    final_ggr = float(daily["cumulative_ggr"].iloc[-1])
+    ggr_multiplier = float(daily["ggr_multiplier"].iloc[-1])
+    pool_size = final_ggr / ggr_multiplier if ggr_multiplier > 0 else 0.0
+    total_cash_paid = float(monthly["stable_payout"].sum() + monthly["growth_payout"].sum())
+    referral = float(monthly["monthly_referral_cost"].sum()) if "monthly_referral_cost" in monthly.columns else 0.0
+    return {
+        "final_ggr": final_ggr,
+        "ggr_multiplier": ggr_multiplier,
+        "total_cash_paid": total_cash_paid,
+        "total_referral_cost": referral,
+        "cost_of_capital": (total_cash_paid + referral) / pool_size * 100 if pool_size > 0 else 0.0,
+        "spent": float(daily["cumulative_traffic"].iloc[-1]),
+        "ftds": int(daily["new_ftds"].sum()),
+    }
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class ResultCatalog:
+    def __init__(self, directory: str = "saved_results", path: Optional[str] = None,
+                 csv_prefix: Optional[str] = None) -> None:
+        self.directory = directory
+        # Next to the folders by default: tags are user data, not a rebuildable cache
+        self.path = path if path is not None else os.path.join(directory, CATALOG_FILE)
+        self.csv_prefix = csv_prefix  # old CSV-only folders are imported into a ResultStore first
+        self._lock = threading.Lock()
+        self._synced: Optional[Tuple[frozenset, List[Tuple[str, str]]]] = None  # (listing, problems)
+
+    def _connect(self) -> sqlite3.Connection:
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def add(self, name: str, params: Mapping[str, object], kpis: Optional[Mapping[str, float]] = None,
+            tags: Iterable[str] = (), created: Optional[float] = None) -> None:
+        """Insert or replace the entry of folder ``name``."""
+        kpis = dict(kpis or {})
+        tags = sorted({tag.strip() for tag in tags if tag.strip()})
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM saved_results WHERE name = ?", (name,))
+                conn.execute(
+                    "INSERT INTO saved_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, time.time() if created is None else float(created), params.get("cache_key"),
+                     _number(params.get("pool_size")), _number(params.get("target_ggr")),
+                     kpis.get("ggr_multiplier"), kpis.get("cost_of_capital"), kpis.get("total_cash_paid"),
+                     json.dumps(params, ensure_ascii=False, default=str), json.dumps(kpis)),
+                )
+                conn.executemany("INSERT INTO result_tags VALUES (?, ?)", [(tag, name) for tag in tags])
+        finally:
+            conn.close()
+
+    def add_store(self, name: str, params: Mapping[str, object], tags: Iterable[str] = (),
+                  created: Optional[float] = None) -> None:
+        """``add`` with the KPIs read from the folder's stored tables."""
+        folder = os.path.join(self.directory, name)
+        store = ResultStore(folder)
+        if not store.exists() and self.csv_prefix:
+            store = ResultStore.from_csv(folder, os.path.join(folder, self.csv_prefix))
+        daily, monthly, _ = store.read_all(memory_map=False)
+        self.add(name, params, kpis_from_tables(daily, monthly), tags, created)
+
+    def add_tags(self, name: str, tags: Iterable[str]) -> None:
+        tags = sorted({tag.strip() for tag in tags if tag.strip()})
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO result_tags VALUES (?, ?)", [(tag, name) for tag in tags])
+        finally:
+            conn.close()
+
+    def remove(self, name: str) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM saved_results WHERE name = ?", (name,))
+        finally:
+            conn.close()
+
+    def find(self, cache_key: str) -> Optional[Dict[str, object]]:
+        """Saved result with this ResultCache key, if any."""
+        rows = self.list(cache_key=cache_key, limit=1)
+        return rows[0] if rows else None
+
+    def list(self, tag: Optional[str] = None, cache_key: Optional[str] = None,
+             ranges: Optional[Mapping[str, Tuple[Optional[float], Optional[float]]]] = None,
+             order_by: str = "created", descending: bool = True, limit: Optional[int] = None,
+             ) -> List[Dict[str, object]]:
+        """Saved results matching the filters, sorted, in one query.
+
+        ``ranges`` maps a sortable numeric column to ``(low, high)``
+        bounds (None for open). Rows are dicts with the columns, parsed
+        ``params`` / ``kpis``, ``tags`` and the folder ``path``.
+        """
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"order_by must be one of {SORT_COLUMNS}")
+        where, args = [], []
+        if tag is not None:
+            where.append("name IN (SELECT name FROM result_tags WHERE tag = ?)")
+            args.append(tag)
+        if cache_key is not None:
+            where.append("cache_key = ?")
+            args.append(cache_key)
+        for column, (low, high) in (ranges or {}).items():
+            if column not in SORT_COLUMNS:
+                raise ValueError(f"range column must be one of {SORT_COLUMNS}")
+            if low is not None:
+                where.append(f"{column} >= ?")
+                args.append(low)
+            if high is not None:
+                where.append(f"{column} <= ?")
+                args.append(high)
+        query = (
+            "SELECT name, created, cache_key, pool_size, target_ggr, ggr_multiplier, cost_of_capital, "
+            "total_cash_paid, params, kpis, "
+            "(SELECT group_concat(tag, ',') FROM result_tags t WHERE t.name = saved_results.name) "
+            "FROM saved_results"
+        )
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, name {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(int(limit))
+        conn = self._connect()
+        try:
+            rows = conn.execute(query, args).fetchall()
+        finally:
+            conn.close()
+        return [self._row(row) for row in rows]
+
+    def _row(self, row: Sequence[object]) -> Dict[str, object]:
+        (name, created, cache_key, pool_size, target_ggr, ggr_multiplier, cost_of_capital,
+         total_cash_paid, params, kpis, tags) = row
+        return {
+            "name": name,
+            "path": os.path.join(self.directory, name),
+            "created": created,
+            "timestamp": datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M"),
+            "cache_key": cache_key,
+            "pool_size": pool_size,
+            "target_ggr": target_ggr,
+            "ggr_multiplier": ggr_multiplier,
+            "cost_of_capital": cost_of_capital,
+            "total_cash_paid": total_cash_paid,
+            "params": json.loads(params),
+            "kpis": json.loads(kpis),
+            "tags": sorted(tags.split(",")) if tags else [],
+        }
+
+    def tags(self) -> List[str]:
+        conn = self._connect()
+        try:
+            return [row[0] for row in conn.execute("SELECT DISTINCT tag FROM result_tags ORDER BY tag")]
+        finally:
+            conn.close()
+
+    def sync(self, force: bool = False) -> List[Tuple[str, str]]:
+        """Add folders missing from the catalog and drop entries whose folder is gone.
+
+        Cheap on every call: only listing the directory, unless the folders
+        changed since the last sync (or ``force``). Returns ``(folder, error)``
+        for folders that could not be read.
+        """
+        folders = frozenset()
+        if os.path.isdir(self.directory):
+            folders = frozenset(entry.name for entry in os.scandir(self.directory)
+                                if entry.is_dir() and os.path.exists(os.path.join(entry.path, PARAMS_FILE)))
+        with self._lock:
+            if not force and self._synced is not None and self._synced[0] == folders:
+                return list(self._synced[1])
+            problems = self._sync(folders)
+            self._synced = (folders, problems)
+            return list(problems)
+
+    def _sync(self, folders: frozenset) -> List[Tuple[str, str]]:
+        conn = self._connect()
+        try:
+            known = {row[0] for row in conn.execute("SELECT name FROM saved_results")}
+        finally:
+            conn.close()
+        for name in known - folders:
+            self.remove(name)
+
+        problems = []
+        for name in sorted(folders - known):
+            folder = os.path.join(self.directory, name)
+            try:
+                with open(os.path.join(folder, PARAMS_FILE), encoding="utf-8") as f:
+                    params = json.load(f)
+                created = params.get("generation_timestamp")
+                created = datetime.fromisoformat(created).timestamp() if created else os.path.getmtime(folder)
+                tags = ["favorite"] if params.get("is_favorite") else []
+                self.add_store(name, params, tags=tags, created=created)
+            except (OSError, ValueError, KeyError) as exc:
+                problems.append((name, f"{type(exc).__name__}: {exc}"))
+        return problems
+
+    def __len__(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM saved_results").fetchone()[0]
+        finally:
+            conn.close()
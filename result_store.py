@@ -0,0 +1,117 @@
+"""Binary result store for generated daily / monthly / per-ZNX tier tables.
+
+A store is a directory with one file per table: uncompressed Arrow IPC
+(Feather v2) files with typed columns, read back memory-mapped so numeric
+columns are not copied or re-parsed. Stores are shared between sessions and
+copied in from saved folders, so nothing is ever unpickled from them. CSV is
+an export format only (``export_csv``); ``from_csv`` imports old CSV results
+once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from pyarrow import feather
+
+
+TABLES = ("daily", "monthly", "tiers")
+
+# CSV export names, as written by export_to_csv / export_monthly_tier_znx
+CSV_SUFFIXES = {"daily": "_daily.csv", "monthly": "_monthly.csv", "tiers": "_monthly_tiers_znx.csv"}
+
+FEATHER = ".feather"
+
+
+class ResultStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+
+    def path(self, table: str) -> str:
+        if table not in TABLES:
+            raise ValueError(f"table must be one of {TABLES}")
+        return os.path.join(self.directory, table + FEATHER)
+
+    def exists(self) -> bool:
+        return all(os.path.exists(self.path(table)) for table in ("daily", "monthly"))
+
+    def files(self) -> List[str]:
+        return [self.path(table) for table in TABLES if os.path.exists(self.path(table))]
+
+    def fingerprint(self) -> Optional[str]:
+        """SHA-256 of the stored tables' content (None if the store is empty); equal data, equal fingerprint."""
+        files = self.files()
+        if not files:
+            return None
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(os.path.basename(path).encode("utf-8"))
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    def stat_fingerprint(self) -> Optional[str]:
+        """Cheap change marker from (path, inode, mtime, size) of the stored tables; no content is read.
+
+        Tables are only replaced whole (write then rename, a new inode), so
+        any rewrite changes it. Unlike ``fingerprint``, copies of the same data get different markers.
+        """
+        files = self.files()
+        if not files:
+            return None
+        digest = hashlib.sha256()
+        for path in files:
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}\0{stat.st_ino}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def write(self, daily: pd.DataFrame, monthly: pd.DataFrame, tiers: Optional[pd.DataFrame] = None) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        for table, df in zip(TABLES, (daily, monthly, tiers)):
+            if df is None:
+                continue
+            path = self.path(table)
+            # Write then rename, so readers never see a half-written table
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+            os.replace(tmp, path)
+
+    def read(self, table: str, memory_map: bool = True) -> Optional[pd.DataFrame]:
+        path = self.path(table)
+        if not os.path.exists(path):
+            return None
+        # split_blocks keeps each memory-mapped numeric column as its own zero-copy block
+        return feather.read_table(path, memory_map=memory_map).to_pandas(split_blocks=True)
+
+    def read_all(self, memory_map: bool = True) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        daily, monthly, tiers = (self.read(table, memory_map) for table in TABLES)
+        return daily, monthly, tiers
+
+    def export_csv(self, prefix: str) -> Dict[str, str]:
+        """Write every stored table as ``{prefix}_daily.csv`` etc.; returns table -> path."""
+        paths = {}
+        for table in TABLES:
+            df = self.read(table, memory_map=False)
+            if df is not None:
+                paths[table] = prefix + CSV_SUFFIXES[table]
+                df.to_csv(paths[table], index=False)
+        return paths
+
+    @classmethod
+    def from_csv(cls, directory: str, prefix: str) -> "ResultStore":
+        """Import ``{prefix}_daily.csv`` etc. (old results) into a store at ``directory``."""
+        frames = {}
+        for table in TABLES:
+            path = prefix + CSV_SUFFIXES[table]
+            if os.path.exists(path):
+                frames[table] = pd.read_csv(path, parse_dates=["date"] if table == "daily" else None)
+        store = cls(directory)
+        if "daily" in frames and "monthly" in frames:
+            store.write(frames["daily"], frames["monthly"], frames.get("tiers"))
+        return store
@@ -1,28 +1,172 @@
 from __future__ import annotations
 
+import copy
 import math
-import random
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+import analytic
+import cohort_engine
+from daily_records import WEEKDAY_NAMES, DailyRecords
+from profiling import GenerationProfiler, timed_phase
+from result_store import ResultStore
+
+if TYPE_CHECKING:
+    from calibration_index import CalibrationIndex
+
 
 @dataclass
 class TierConfig:
     basic_rate: float
     advanced_rate: float
     premium_rate: float
-    capital_shares: Tuple[float, float, float]
+    capital_shares: Tuple[float, ...]
+    # Tiers above premium as (name, rate); their capital shares follow premium's in capital_shares
+    extra_tiers: Tuple[Tuple[str, float], ...] = ()
+
+    def __post_init__(self) -> None:
+        if len(self.capital_shares) != len(self.rates):
+            raise ValueError("capital_shares needs one share per tier")
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return analytic.TIERS + tuple(name for name, _ in self.extra_tiers)
+
+    @property
+    def rates(self) -> Tuple[float, ...]:
+        return (self.basic_rate, self.advanced_rate, self.premium_rate) + tuple(rate for _, rate in self.extra_tiers)
+
+
+# Default tier configs (rates and capital shares) of every generator
+STABLE_TIERS = TierConfig(basic_rate=0.34, advanced_rate=0.3825, premium_rate=0.425, capital_shares=(0.30, 0.40, 0.30))
+GROWTH_TIERS = TierConfig(basic_rate=0.085, advanced_rate=0.10625, premium_rate=0.1275, capital_shares=(0.30, 0.40, 0.30))
+
+
+class AgeSchedule:
+    """``{(first_age, last_age): value}`` schedule compiled to a dense per-age table.
+
+    Index = age_days, so scalar (``schedule[age]``) and vectorized
+    (``schedule.lookup(ages)``) lookups are O(1) for schedules of any length.
+    The first matching range wins; ages outside every range get the last value.
+    """
+
+    def __init__(self, mapping: Dict[Tuple[int, int], Union[float, Tuple[float, ...]]]) -> None:
+        items = list(mapping.items())
+        if not items:
+            raise ValueError("schedule must not be empty")
+        if any(a > b for (a, b), _ in items):
+            raise ValueError("schedule ranges must be (first_age, last_age) with first_age <= last_age")
+        fallback = np.asarray(items[-1][1], dtype=float)
+        # One slot past the last range holds the fallback for every older age
+        size = max(max(b for (_, b), _ in items), 0) + 2
+        table = np.empty((size,) + fallback.shape)
+        table[:] = fallback
+        for (a, b), v in reversed(items):
+            table[max(a, 0):max(b + 1, 0)] = v
+        self.table = table
+        self._last = size - 1
+        self._values = [tuple(row) for row in table.tolist()] if table.ndim > 1 else table.tolist()
+
+    def __getitem__(self, age: int):
+        return self._values[min(max(age, 0), self._last)]
+
+    def lookup(self, ages: np.ndarray) -> np.ndarray:
+        return self.table[np.clip(ages, 0, self._last)]
+
+
+class DayRecord(NamedTuple):
+    """One simulated day, as yielded by ``stream_daily_data`` (fields = daily frame columns)."""
+    date: datetime
+    day: int
+    month: int
+    year: int
+    day_of_week: str
+    new_ftds: int
+    active_players: float
+    avg_deposit: float
+    total_deposits: float
+    daily_ggr: float
+    cumulative_ggr: float
+    traffic_spend: float
+    cumulative_traffic: float
+    effective_traffic_budget: float
+    ggr_multiplier: float
+    daily_upfront_referral: float
+    # Payout fields are None when streaming without payouts
+    stable_payout: Optional[float] = None
+    growth_payout: Optional[float] = None
+    cumulative_stable: Optional[float] = None
+    cumulative_growth: Optional[float] = None
+    stable_return_pct: Optional[float] = None
+    growth_return_pct: Optional[float] = None
+    daily_total_referral: Optional[float] = None
+    cumulative_referral_cost: Optional[float] = None
+
+
+@dataclass
+class CalibrationReport:
+    method: str
+    iterations: int
+    error: float  # relative error of the final GGR multiplier vs target
+    converged: bool
+    elapsed_seconds: float
+    deposit_scale: float
+    retention_scale: float
+    cpa_scale: float
 
 
+@dataclass
+class MonteCarloResult:
+    # (paths × days) float32 arrays
+    daily_ggr: np.ndarray
+    cumulative_ggr: np.ndarray
+    stable_payout: np.ndarray
+    growth_payout: np.ndarray
+    referral_cost: np.ndarray
+    path_metrics: pd.DataFrame  # one row of final KPIs per path
+    quantiles: pd.DataFrame  # quantiles of path_metrics
+    cumulative_ggr_quantiles: pd.DataFrame  # quantile × day bands
+    probabilities: Dict[str, float]
 
+    ARRAYS = ("daily_ggr", "cumulative_ggr", "stable_payout", "growth_payout", "referral_cost")
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], path_metrics: pd.DataFrame,
+                    quantiles: Sequence[float]) -> "MonteCarloResult":
+        """Summarize per-path arrays and KPIs; also used to merge shards of a parallel run."""
+        q = np.asarray(quantiles, dtype=float)
+        probabilities = {
+            "is_breakeven": float(path_metrics["is_breakeven"].mean()),
+            "stable_meets_minimum": float(path_metrics["stable_meets_minimum"].mean()),
+        }
+        for column in path_metrics.columns:
+            if column.startswith("stable_") and column.endswith("_per_dollar"):
+                probabilities[column[:-len("_per_dollar")] + "_below_1"] = float((path_metrics[column] < 1.0).mean())
+        days = arrays["cumulative_ggr"].shape[1]
+        return cls(
+            **{name: arrays[name] for name in cls.ARRAYS},
+            path_metrics=path_metrics,
+            quantiles=path_metrics.select_dtypes(include="number").quantile(q),
+            cumulative_ggr_quantiles=pd.DataFrame(
+                np.quantile(arrays["cumulative_ggr"], q, axis=0), index=q, columns=np.arange(1, days + 1)
+            ),
+            probabilities=probabilities,
+        )
 
 
 class RevSharePoolGenerator:
-    """Generate realistic 365-day casino traffic RevShare Pool data."""
+    """Generate realistic casino traffic RevShare Pool data (365 days by default)."""
+
+    ENGINES = ("python", "numpy")
+    # Bump whenever simulation output for the same kwargs + seed changes (invalidates ResultCache)
+    ENGINE_VERSION = 5
+    CALIBRATION_METHODS = ("proportional", "crn")
 
     def __init__(
         self,
@@ -42,7 +186,17 @@ class RevSharePoolGenerator:
         upfront_bonus_stable: float = 0.03,  # 3% upfront bonus for stable pool
         upfront_bonus_growth: float = 0.03,  # 3% upfront bonus for growth pool
         ongoing_share_stable: float = 0.04,  # 4% ongoing share from stable pool profits
-        ongoing_share_growth: float = 0.15   # 15% ongoing share from growth pool profits
+        ongoing_share_growth: float = 0.15,  # 15% ongoing share from growth pool profits
+        # Simulation engine: "python" (per-cohort loop) or "numpy" (vectorized cohort_engine)
+        engine: str = "python",
+        # Custom {(first_age, last_age): ...} schedules of any length; None = defaults below
+        retention_schedule: Optional[Dict[Tuple[int, int], Tuple[float, float]]] = None,
+        deposit_by_days: Optional[Dict[Tuple[int, int], float]] = None,
+        # Simulated days, and days over which the traffic budget (pool_size) is spent
+        horizon_days: int = 365,
+        acquisition_days: int = 30,
+        # numpy engine: acquisition days merged into one cohort (opt-in speedup; 1 = exact per-day cohorts)
+        cohort_bucket_days: int = 1,
     ) -> None:
         if traffic_budget is None:
             traffic_budget = pool_size
@@ -54,6 +208,12 @@ class RevSharePoolGenerator:
             raise ValueError("stable_ratio + growth_ratio must equal 1.0")
         if cpa_range[0] <= 0 or cpa_range[1] <= 0 or cpa_range[0] >= cpa_range[1]:
             raise ValueError("Invalid cpa_range")
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {self.ENGINES}")
+        if not 1 <= acquisition_days <= horizon_days:
+            raise ValueError("acquisition_days must be between 1 and horizon_days")
+        if cohort_bucket_days < 1:
+            raise ValueError("cohort_bucket_days must be positive")
 
         self.pool_size = float(pool_size)
         self.stable_ratio = float(stable_ratio)
@@ -74,13 +234,16 @@ class RevSharePoolGenerator:
         self.upfront_bonus_growth = float(upfront_bonus_growth)
         self.ongoing_share_stable = float(ongoing_share_stable)
         self.ongoing_share_growth = float(ongoing_share_growth)
+        self.engine = engine
+        self.horizon_days = int(horizon_days)
+        self.acquisition_days = int(acquisition_days)
+        self.cohort_bucket_days = int(cohort_bucket_days)
         
         # Set effective traffic budget
         self.effective_traffic_budget = self.traffic_budget
 
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # Every draw comes from this generator: instances never share or reseed global RNG state
+        self._rng = np.random.default_rng(seed)
 
         # Variables for negative day clusters
         self.negative_cluster_days = 0
@@ -88,43 +251,22 @@ class RevSharePoolGenerator:
         self.negative_cluster_probability = 0.15
         self.negative_cluster_max_days = 5
 
-        # High watermark for monthly payouts
-        self.high_watermark = 0.0
-
         # Tier configs (rates and capital shares)
-        self.stable_cfg = TierConfig(
-            basic_rate=0.34, 
-            advanced_rate=0.3825, 
-            premium_rate=0.425,
-            capital_shares=(0.30, 0.40, 0.30)
-        )
-        self.growth_cfg = TierConfig(
-            basic_rate=0.085, 
-            advanced_rate=0.10625, 
-            premium_rate=0.1275,
-            capital_shares=(0.30, 0.40, 0.30)
-        )
+        self.stable_cfg = copy.copy(STABLE_TIERS)
+        self.growth_cfg = copy.copy(GROWTH_TIERS)
 
         # Weighted pool rates
-        self.stable_weighted_rate = (
-            self.stable_cfg.capital_shares[0] * self.stable_cfg.basic_rate +
-            self.stable_cfg.capital_shares[1] * self.stable_cfg.advanced_rate +
-            self.stable_cfg.capital_shares[2] * self.stable_cfg.premium_rate
-        )
-        self.growth_weighted_rate = (
-            self.growth_cfg.capital_shares[0] * self.growth_cfg.basic_rate +
-            self.growth_cfg.capital_shares[1] * self.growth_cfg.advanced_rate +
-            self.growth_cfg.capital_shares[2] * self.growth_cfg.premium_rate
-        )
+        self.stable_weighted_rate = analytic.weighted_rate(self.stable_cfg)
+        self.growth_weighted_rate = analytic.weighted_rate(self.growth_cfg)
 
-        # Schedules
-        self.retention_schedule: Dict[Tuple[int, int], Tuple[float, float]] = {
+        # Schedules (compiled to AgeSchedule tables on assignment)
+        self.retention_schedule = retention_schedule if retention_schedule is not None else {
             (1, 30): (1.00, 0.00), (31, 60): (0.42, 0.03), (61, 90): (0.33, 0.03),
             (91, 120): (0.26, 0.02), (121, 150): (0.22, 0.02), (151, 180): (0.19, 0.02),
             (181, 210): (0.16, 0.02), (211, 240): (0.14, 0.02), (241, 270): (0.12, 0.02),
             (271, 300): (0.10, 0.015), (301, 330): (0.09, 0.015), (331, 365): (0.08, 0.01),
         }
-        self.deposit_by_days: Dict[Tuple[int, int], float] = {
+        self.deposit_by_days = deposit_by_days if deposit_by_days is not None else {
             (1, 30): 23, (31, 60): 49, (61, 90): 66, (91, 120): 81, (121, 150): 91,
             (151, 180): 101, (181, 210): 108, (211, 240): 115, (241, 270): 121,
             (271, 300): 125, (301, 330): 129, (331, 365): 132,
@@ -144,26 +286,43 @@ class RevSharePoolGenerator:
         self._deposit_scale = 1.0
         self._retention_scale = 1.0
         self._cpa_scale = 1.0
+        self.last_calibration: Optional[CalibrationReport] = None
+
+        # Set only inside profiling() / tracking_progress()
+        self._profiler: Optional[GenerationProfiler] = None
+        self._progress: Optional[Callable[[str, Dict[str, object]], None]] = None
+
+    @property
+    def retention_schedule(self) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        return self._retention_schedule
 
-    def _range_value(self, mapping: Dict[Tuple[int, int], float], age: int) -> float:
-        for (a, b), v in mapping.items():
-            if a <= age <= b:
-                return v
-        return list(mapping.values())[-1]
+    @retention_schedule.setter
+    def retention_schedule(self, mapping: Dict[Tuple[int, int], Tuple[float, float]]) -> None:
+        table = AgeSchedule(mapping)
+        if table.table.ndim != 2 or table.table.shape[1] != 2:
+            raise ValueError("retention_schedule values must be (base, variance) pairs")
+        self._retention_schedule = dict(mapping)
+        self._retention_table = table
 
-    def _range_pair(self, mapping: Dict[Tuple[int, int], Tuple[float, float]], age: int) -> Tuple[float, float]:
-        for (a, b), v in mapping.items():
-            if a <= age <= b:
-                return v
-        return list(mapping.values())[-1]
+    @property
+    def deposit_by_days(self) -> Dict[Tuple[int, int], float]:
+        return self._deposit_by_days
+
+    @deposit_by_days.setter
+    def deposit_by_days(self, mapping: Dict[Tuple[int, int], float]) -> None:
+        table = AgeSchedule(mapping)
+        if table.table.ndim != 1:
+            raise ValueError("deposit_by_days values must be numbers")
+        self._deposit_by_days = dict(mapping)
+        self._deposit_table = table
 
     def _generate_ftd_schedule(self) -> pd.DataFrame:
-        days = 30
+        days = self.acquisition_days
         # Спенд равен собранным средствам (pool_size)
-        # Allocate pool_size across 30 days (Dirichlet for realistic variance)
-        weights = np.random.dirichlet([2.0] * days)
+        # Allocate pool_size across the acquisition window (Dirichlet for realistic variance)
+        weights = self._rng.dirichlet([2.0] * days)
         spends = weights * self.pool_size  # Используем pool_size вместо traffic_budget
-        cpas = np.random.uniform(self.cpa_range[0] * self._cpa_scale, self.cpa_range[1] * self._cpa_scale, size=days)
+        cpas = self._rng.uniform(self.cpa_range[0] * self._cpa_scale, self.cpa_range[1] * self._cpa_scale, size=days)
         ftds = np.maximum(0, np.round(spends / cpas).astype(int))
         traffic_df = pd.DataFrame({
             "day": np.arange(1, days + 1),
@@ -176,9 +335,9 @@ class RevSharePoolGenerator:
         return traffic_df
 
     def _get_retention_rate(self, age_days: int) -> float:
-        base, var = self._range_pair(self.retention_schedule, age_days)
+        base, var = self._retention_table[age_days]
         adj = base * self._retention_scale
-        delta = random.uniform(-var, var)
+        delta = self._rng.uniform(-var, var)
         return max(0.0, min(1.0, adj + delta))
 
     def _get_enhanced_retention_rate(self, age_days: int, date: datetime, cohort_size: int) -> float:
@@ -193,12 +352,12 @@ class RevSharePoolGenerator:
         base_retention = self._get_retention_rate(age_days)
         
         # VIP игроки - 5-10% от когорты с повышенным retention
-        vip_percentage = random.uniform(0.05, 0.10)
+        vip_percentage = self._rng.uniform(0.05, 0.10)
         vip_players = int(cohort_size * vip_percentage)
         regular_players = cohort_size - vip_players
         
         # VIP retention (в 2-3 раза выше базового)
-        vip_retention_multiplier = random.uniform(2.0, 3.0) if age_days > 30 else 1.0
+        vip_retention_multiplier = self._rng.uniform(2.0, 3.0) if age_days > 30 else 1.0
         vip_retention = min(1.0, base_retention * vip_retention_multiplier)
         
         # Всплески активности
@@ -256,12 +415,12 @@ class RevSharePoolGenerator:
             boost *= 1.08
             
         # Случайные акции и турниры (5% шанс каждый день)
-        if random.random() < 0.05:
-            boost *= random.uniform(1.10, 1.30)
+        if self._rng.random() < 0.05:
+            boost *= self._rng.uniform(1.10, 1.30)
             
         # Персональные предложения для старых игроков (возрастает с возрастом)
-        if age_days > 60 and random.random() < (age_days / 1000.0):
-            boost *= random.uniform(1.15, 1.40)
+        if age_days > 60 and self._rng.random() < (age_days / 1000.0):
+            boost *= self._rng.uniform(1.15, 1.40)
             
         return boost
 
@@ -298,8 +457,8 @@ class RevSharePoolGenerator:
             base_reactivation *= 1.8
             
         # Случайные email/push кампании (10% шанс каждый день)
-        if random.random() < 0.10:
-            base_reactivation *= random.uniform(1.5, 2.5)
+        if self._rng.random() < 0.10:
+            base_reactivation *= self._rng.uniform(1.5, 2.5)
             
         return base_reactivation
         
@@ -309,18 +468,18 @@ class RevSharePoolGenerator:
         Базируется на активности игроков и их депозитах.
         """
         # Базовый оборот как процент от месячных депозитов
-        base_turnover_multiplier = random.uniform(8.0, 15.0)  # 8-15x от депозитов
+        base_turnover_multiplier = self._rng.uniform(8.0, 15.0)  # 8-15x от депозитов
         
         # Сезонные корректировки
         seasonal_multiplier = 1.0
         if month in [12, 1]:  # Новогодние праздники
-            seasonal_multiplier = random.uniform(1.2, 1.5)
+            seasonal_multiplier = self._rng.uniform(1.2, 1.5)
         elif month in [6, 7, 8]:  # Летний сезон
-            seasonal_multiplier = random.uniform(1.1, 1.3)
+            seasonal_multiplier = self._rng.uniform(1.1, 1.3)
         elif month == 11:  # Black Friday
-            seasonal_multiplier = random.uniform(1.15, 1.4)
+            seasonal_multiplier = self._rng.uniform(1.15, 1.4)
         elif month in [2, 9]:  # Низкие месяцы
-            seasonal_multiplier = random.uniform(0.8, 0.95)
+            seasonal_multiplier = self._rng.uniform(0.8, 0.95)
             
         # Примерный месячный оборот (будет скорректирован на основе реальных депозитов)
         estimated_monthly_deposits = self.pool_size * 0.1  # 10% от пула в месяц
@@ -342,7 +501,7 @@ class RevSharePoolGenerator:
         growth_ref_cost = growth_payout * self.ongoing_share_growth
         
         # Комиссия с оборота (0.5-1.5% от оборота)
-        turnover_commission_rate = random.uniform(0.005, 0.015)
+        turnover_commission_rate = self._rng.uniform(0.005, 0.015)
         turnover_commission = monthly_turnover * turnover_commission_rate
         
         return stable_ref_cost, growth_ref_cost, turnover_commission
@@ -373,8 +532,8 @@ class RevSharePoolGenerator:
 
 
     def _get_avg_deposit(self, age_days: int, date: datetime) -> float:
-        base = self._range_value(self.deposit_by_days, age_days) * self._deposit_scale
-        base *= random.uniform(0.85, 1.15)
+        base = self._deposit_table[age_days] * self._deposit_scale
+        base *= self._rng.uniform(0.85, 1.15)
         return base * self._calculate_seasonality(date)
 
     def _calculate_daily_ggr(self, total_deposits: float) -> float:
@@ -383,10 +542,10 @@ class RevSharePoolGenerator:
         
         # Реалистичное моделирование RTP казино 94-97% (house edge 3-6%)
         # Базовая маржа дома варьируется в зависимости от типа игр
-        base_house_edge = random.uniform(0.03, 0.06)  # 3-6% house edge
+        base_house_edge = self._rng.uniform(0.03, 0.06)  # 3-6% house edge
         
         # Умеренная дневная волатильность
-        daily_variance = float(np.random.normal(1.0, self.ggr_volatility))  # Нормальная волатильность
+        daily_variance = float(self._rng.normal(1.0, self.ggr_volatility))  # Нормальная волатильность
         
         # Базовый GGR от депозитов
         theoretical_ggr = total_deposits * base_house_edge * daily_variance
@@ -394,44 +553,62 @@ class RevSharePoolGenerator:
         # Check if we're in a negative cluster (уменьшенная вероятность)
         if self.negative_cluster_remaining > 0:
             # В кластере негативных дней - умеренные потери казино
-            theoretical_ggr = -abs(theoretical_ggr * random.uniform(1.2, 2.5))  # Умеренные потери
+            theoretical_ggr = -abs(theoretical_ggr * self._rng.uniform(1.2, 2.5))  # Умеренные потери
             self.negative_cluster_remaining -= 1
         else:
             # Start new negative cluster (2% chance вместо 5%)
-            if random.random() < 0.02:
-                self.negative_cluster_remaining = random.randint(2, 4)  # 2-4 дня вместо 3-8
-                theoretical_ggr = -abs(theoretical_ggr * random.uniform(1.2, 2.5))
+            if self._rng.random() < 0.02:
+                self.negative_cluster_remaining = int(self._rng.integers(2, 5))  # 2-4 дня вместо 3-8
+                theoretical_ggr = -abs(theoretical_ggr * self._rng.uniform(1.2, 2.5))
             # Regular negative days - редкие дни когда игроки выигрывают больше
-            elif random.random() < 0.15:  # 15% chance вместо 25%
-                theoretical_ggr = -abs(theoretical_ggr * random.uniform(1.1, 2.0))  # Меньшие потери
+            elif self._rng.random() < 0.15:  # 15% chance вместо 25%
+                theoretical_ggr = -abs(theoretical_ggr * self._rng.uniform(1.1, 2.0))  # Меньшие потери
         
         # Экстремальная волатильность - джекпоты или крупные проигрыши (реже)
-        if random.random() < 0.03:  # 3% chance вместо 8%
-            if random.random() < 0.2:  # 20% шанс что это джекпот (потери казино)
-                theoretical_ggr = -abs(theoretical_ggr * random.uniform(2.0, 5.0))  # Меньшие джекпоты
+        if self._rng.random() < 0.03:  # 3% chance вместо 8%
+            if self._rng.random() < 0.2:  # 20% шанс что это джекпот (потери казино)
+                theoretical_ggr = -abs(theoretical_ggr * self._rng.uniform(2.0, 5.0))  # Меньшие джекпоты
             else:  # 80% шанс что это крупные проигрыши игроков
-                theoretical_ggr = abs(theoretical_ggr * random.uniform(2.0, 4.0))  # Умеренные выигрыши
+                theoretical_ggr = abs(theoretical_ggr * self._rng.uniform(2.0, 4.0))  # Умеренные выигрыши
         
         return theoretical_ggr
 
+    @timed_phase("generate")
     def generate_daily_data(self) -> pd.DataFrame:
+        records = self.generate_daily_records()
+        self._notify("payouts")
+        return self._distribute_payouts(records.to_frame())
+
+    @timed_phase("simulation")
+    def generate_daily_records(self) -> DailyRecords:
+        """Pre-payout days as a compact typed array; no DataFrame is built until ``to_frame()``."""
+        if self.engine == "numpy":
+            self._notify("simulation", day=0, days=self.horizon_days)
+            paths = cohort_engine.simulate_paths(self, self._rng, n_paths=1)
+            self._notify("simulation", day=self.horizon_days, days=self.horizon_days)
+            return cohort_engine.daily_records(self, paths)
+        # Reference engine: walk every day and every FTD cohort in Python
+        return DailyRecords.from_rows(self._iter_daily_loop(), self.horizon_days, self.start_date,
+                                      self.effective_traffic_budget, self.pool_size)
+
+    def _iter_daily_loop(self) -> Iterator[DayRecord]:
+        """Pre-payout day rows of the reference engine, one at a time."""
         traffic_df = self._generate_ftd_schedule()
-        ftd_map = {int(row.day): int(row.new_ftds) for _, row in traffic_df.iterrows()}
+        ftd_map = dict(zip(traffic_df["day"].tolist(), traffic_df["new_ftds"].tolist()))
+        spend_map = dict(zip(traffic_df["day"].tolist(), traffic_df["traffic_spend"].tolist()))
+        acquisition_days = self.acquisition_days
         
         # First, generate basic daily data without payouts
-        days = 365
-        rows: List[Dict[str, float]] = []
+        days = self.horizon_days
         cumulative_ggr = 0.0
         cumulative_traffic = 0.0
-        stable_pool_size = self.pool_size * self.stable_ratio
-        growth_pool_size = self.pool_size * self.growth_ratio
 
         for day in range(1, days + 1):
             date = self.start_date + timedelta(days=day - 1)
             # Compute active players by summing cohorts (days since FTD)
             active_players = 0.0
             total_deposits = 0.0
-            for ftd_day in range(1, min(day, 30) + 1):
+            for ftd_day in range(1, min(day, acquisition_days) + 1):
                 age = day - ftd_day + 1
                 cohort_size = ftd_map.get(ftd_day, 0)
                 
@@ -453,13 +630,15 @@ class RevSharePoolGenerator:
 
             daily_ggr = self._calculate_daily_ggr(total_deposits)
             cumulative_ggr += daily_ggr
+            if self._progress is not None:
+                self._notify("simulation", day=day, days=days)
 
-            traffic_spend = float(traffic_df.loc[traffic_df['day'] == day, 'traffic_spend'].sum()) if day <= 30 else 0.0
-            if day <= 30:
+            traffic_spend = float(spend_map[day]) if day <= acquisition_days else 0.0
+            if day <= acquisition_days:
                 cumulative_traffic += traffic_spend
             
             # Calculate upfront referral bonuses for new deposits
-            new_ftds_today = int(ftd_map.get(day, 0)) if day <= 30 else 0
+            new_ftds_today = int(ftd_map.get(day, 0)) if day <= acquisition_days else 0
             if new_ftds_today > 0:
                 # Calculate deposits from referrals
                 referral_ftds = new_ftds_today * self.referral_ratio
@@ -478,106 +657,183 @@ class RevSharePoolGenerator:
             else:
                 daily_upfront_referral = 0.0
 
-            rows.append({
-                "date": date,
-                "day": day,
-                "month": date.month,
-                "year": date.year,
-                "day_of_week": ["Mon","Tue","Wed","Thu","Fri","Sat","Sun"][date.weekday()],
-                "new_ftds": int(ftd_map.get(day, 0)) if day <= 30 else 0,
-                "active_players": float(active_players),
-                "avg_deposit": float(total_deposits / active_players) if active_players > 0 else 0.0,
-                "total_deposits": float(total_deposits),
-                "daily_ggr": float(daily_ggr),
-                "cumulative_ggr": float(cumulative_ggr),
-                "traffic_spend": float(traffic_spend),
-                "cumulative_traffic": float(cumulative_traffic),
-                "effective_traffic_budget": float(self.effective_traffic_budget),
-                "ggr_multiplier": float(cumulative_ggr / self.pool_size),
-                "daily_upfront_referral": float(daily_upfront_referral),
-            })
-
-        # Create DataFrame and get monthly summary with high watermark logic
-        df = pd.DataFrame(rows)
-        monthly_summary = self.get_monthly_summary(df)
-        
-        # Now distribute monthly payouts across days of each month
-        cumulative_stable = 0.0
-        cumulative_growth = 0.0
-        cumulative_referral_cost = 0.0
-        
-        for i, row in df.iterrows():
-            # Find the monthly payout for this day's month/year
-            month_data = monthly_summary[
-                (monthly_summary['year'] == row['year']) & 
-                (monthly_summary['month'] == row['month'])
-            ]
-            
-            if len(month_data) > 0:
-                monthly_stable = float(month_data.iloc[0]['stable_payout'])
-                monthly_growth = float(month_data.iloc[0]['growth_payout'])
-                
-                # Get days in this month
-                import calendar
-                days_in_month = calendar.monthrange(row['year'], row['month'])[1]
-                
-                # Distribute monthly payout evenly across days (only on positive GGR days)
-                if row['daily_ggr'] > 0:
-                    # Count positive GGR days in this month
-                    month_mask = (df['year'] == row['year']) & (df['month'] == row['month'])
-                    positive_ggr_days = (df[month_mask]['daily_ggr'] > 0).sum()
-                    
-                    if positive_ggr_days > 0:
-                        daily_stable = monthly_stable / positive_ggr_days
-                        daily_growth = monthly_growth / positive_ggr_days
-                    else:
-                        daily_stable = 0.0
-                        daily_growth = 0.0
-                else:
-                    # No payout on negative GGR days
-                    daily_stable = 0.0
-                    daily_growth = 0.0
+            yield DayRecord(
+                date=date,
+                day=day,
+                month=date.month,
+                year=date.year,
+                day_of_week=WEEKDAY_NAMES[date.weekday()],
+                new_ftds=new_ftds_today,
+                active_players=float(active_players),
+                avg_deposit=float(total_deposits / active_players) if active_players > 0 else 0.0,
+                total_deposits=float(total_deposits),
+                daily_ggr=float(daily_ggr),
+                cumulative_ggr=float(cumulative_ggr),
+                traffic_spend=float(traffic_spend),
+                cumulative_traffic=float(cumulative_traffic),
+                effective_traffic_budget=float(self.effective_traffic_budget),
+                ggr_multiplier=float(cumulative_ggr / self.pool_size),
+                daily_upfront_referral=float(daily_upfront_referral),
+            )
+
+    def stream_daily_data(self, with_payouts: bool = True) -> Iterator[DayRecord]:
+        """Yield the simulation one DayRecord at a time with running cumulative state.
+
+        Nothing but the current month is kept. Monthly payouts depend on the
+        month-end high watermark, so with payouts the days of a month are
+        released when the month closes; ``with_payouts=False`` yields every day
+        as soon as it is simulated (payout fields None). Breaking out of the
+        loop stops the simulation (the numpy engine simulates the horizon in one
+        vectorized pass first, then streams it). With the same seed the records
+        match the rows of generate_daily_data() up to float rounding.
+        """
+        if self.engine == "numpy":
+            paths = cohort_engine.simulate_paths(self, self._rng, n_paths=1)
+            frame = cohort_engine.daily_records(self, paths).to_frame()
+            days = (DayRecord(*row) for row in frame.itertuples(index=False, name=None))
+        else:
+            days = self._iter_daily_loop()
+        if not with_payouts:
+            yield from days
+            return
+
+        stable_pool_size = self.pool_size * self.stable_ratio
+        growth_pool_size = self.pool_size * self.growth_ratio
+        watermark = 0.0
+        cumulative_month_ggr = 0.0
+        cumulative_stable = cumulative_growth = cumulative_referral = 0.0
+        month: List[DayRecord] = []
+
+        def close_month() -> Iterator[DayRecord]:
+            nonlocal watermark, cumulative_month_ggr, cumulative_stable, cumulative_growth, cumulative_referral
+            monthly_ggr = 0.0
+            for row in month:
+                monthly_ggr += row.daily_ggr
+            cumulative_month_ggr += monthly_ggr
+            # High watermark: pay only on the increment above the previous month-end peak
+            if cumulative_month_ggr > watermark:
+                increment = cumulative_month_ggr - watermark
+                monthly_stable = increment * self.stable_weighted_rate * self.stable_ratio
+                monthly_growth = increment * self.growth_weighted_rate * self.growth_ratio
+                watermark = cumulative_month_ggr
             else:
-                daily_stable = 0.0
-                daily_growth = 0.0
-            
-            cumulative_stable += daily_stable
-            cumulative_growth += daily_growth
-            
-            # Calculate referral costs (percentage from each payout)
-            daily_referral_stable = daily_stable * self.ongoing_share_stable
-            daily_referral_growth = daily_growth * self.ongoing_share_growth
-            
-            # Add upfront referral bonuses from daily data
-            daily_upfront_referral = row.get('daily_upfront_referral', 0.0)
-                
-            daily_total_referral = daily_referral_stable + daily_referral_growth + daily_upfront_referral
-            cumulative_referral_cost += daily_total_referral
-            
-            # Update the row with payout information
-            df.at[i, 'stable_payout'] = float(daily_stable)
-            df.at[i, 'growth_payout'] = float(daily_growth)
-            df.at[i, 'cumulative_stable'] = float(cumulative_stable)
-            df.at[i, 'cumulative_growth'] = float(cumulative_growth)
-            df.at[i, 'stable_return_pct'] = float((cumulative_stable / stable_pool_size) * 100.0) if stable_pool_size > 0 else 0.0
-            df.at[i, 'growth_return_pct'] = float((cumulative_growth / growth_pool_size) * 100.0) if growth_pool_size > 0 else 0.0
-            df.at[i, 'daily_total_referral'] = float(daily_total_referral)
-            df.at[i, 'cumulative_referral_cost'] = float(cumulative_referral_cost)
+                monthly_stable = monthly_growth = 0.0
+            positive_days = sum(1 for row in month if row.daily_ggr > 0)
+            for row in month:
+                pays = row.daily_ggr > 0
+                stable = monthly_stable / positive_days if pays else 0.0
+                growth = monthly_growth / positive_days if pays else 0.0
+                referral = (stable * self.ongoing_share_stable + growth * self.ongoing_share_growth
+                            + row.daily_upfront_referral)
+                cumulative_stable += stable
+                cumulative_growth += growth
+                cumulative_referral += referral
+                yield row._replace(
+                    stable_payout=stable,
+                    growth_payout=growth,
+                    cumulative_stable=cumulative_stable,
+                    cumulative_growth=cumulative_growth,
+                    stable_return_pct=cumulative_stable / stable_pool_size * 100.0,
+                    growth_return_pct=cumulative_growth / growth_pool_size * 100.0,
+                    daily_total_referral=referral,
+                    cumulative_referral_cost=cumulative_referral,
+                )
+            month.clear()
 
-        return df
+        for row in days:
+            if month and (row.year, row.month) != (month[0].year, month[0].month):
+                yield from close_month()
+            month.append(row)
+        if month:
+            yield from close_month()
+
+    @timed_phase("payouts")
+    def _distribute_payouts(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Spread high-watermark monthly payouts over positive-GGR days and add referral costs."""
+        stable_pool_size = self.pool_size * self.stable_ratio
+        growth_pool_size = self.pool_size * self.growth_ratio
+        # Same high watermark as get_monthly_summary, on arrays (days are contiguous and in order)
+        cal = {"year": df['year'].to_numpy(), "month": df['month'].to_numpy()}
+        daily_upfront_referral = (
+            df['daily_upfront_referral'].to_numpy(dtype=float)
+            if 'daily_upfront_referral' in df.columns else np.zeros(len(df))
+        )
+        payouts = cohort_engine.distribute_payouts(
+            self, df['daily_ggr'].to_numpy(dtype=float)[None, :], daily_upfront_referral[None, :], cal)
+        daily_stable = payouts["stable_payout"][0]
+        daily_growth = payouts["growth_payout"][0]
+        daily_total_referral = payouts["daily_total_referral"][0]
+        cumulative_stable = np.cumsum(daily_stable)
+        cumulative_growth = np.cumsum(daily_growth)
 
-    def calibrate_to_target_ggr(self, tolerance: float = 0.1) -> None:
-        """Iteratively adjust CPA/retention/deposit scales to hit target multiplier.
-        Uses bounded proportional steps to avoid oscillations.
+        columns = {
+            'stable_payout': daily_stable,
+            'growth_payout': daily_growth,
+            'cumulative_stable': cumulative_stable,
+            'cumulative_growth': cumulative_growth,
+            'stable_return_pct': (cumulative_stable / stable_pool_size) * 100.0 if stable_pool_size > 0 else 0.0,
+            'growth_return_pct': (cumulative_growth / growth_pool_size) * 100.0 if growth_pool_size > 0 else 0.0,
+            'daily_total_referral': daily_total_referral,
+            'cumulative_referral_cost': np.cumsum(daily_total_referral),
+        }
+        # One concat instead of a block insert per column
+        return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+    @timed_phase("calibration")
+    def calibrate_to_target_ggr(self, tolerance: float = 0.1, method: str = "proportional",
+                                warm_start: Optional["CalibrationIndex"] = None) -> CalibrationReport:
+        """Adjust CPA/retention/deposit scales to hit target multiplier.
+
+        method="proportional" reruns the full simulation with fresh draws and
+        uses bounded proportional steps to avoid oscillations.
+        method="crn" fixes the random draws once (common random numbers),
+        evaluates only the final cumulative GGR and solves for the scales with
+        a bracketed secant search. The next generate_daily_data() call replays
+        the calibrated draws.
+        With a ``warm_start`` CalibrationIndex the search starts from the scales
+        of the nearest stored parameter set, and a converged result is stored.
         """
+        if method not in self.CALIBRATION_METHODS:
+            raise ValueError(f"method must be one of {self.CALIBRATION_METHODS}")
+        started = time.perf_counter()
+        response = 2.1
+        if warm_start is not None:
+            prediction = warm_start.nearest(self)
+            if prediction is not None:
+                x, response = prediction
+                self._set_calibration_point(x)
+        if method == "crn":
+            iterations, error = self._calibrate_crn(tolerance, response=response)
+        else:
+            iterations, error = self._calibrate_proportional(tolerance)
+        self.last_calibration = CalibrationReport(
+            method=method,
+            iterations=iterations,
+            error=error,
+            converged=abs(error) < tolerance,
+            elapsed_seconds=time.perf_counter() - started,
+            deposit_scale=self._deposit_scale,
+            retention_scale=self._retention_scale,
+            cpa_scale=self._cpa_scale,
+        )
+        if warm_start is not None:
+            warm_start.record(self, self.last_calibration)
+        self._notify("calibration", iteration=iterations, error=error, done=True)
+        if self._profiler is not None:
+            self._profiler.count("calibration_iterations", iterations)
+        return self.last_calibration
+
+    def _calibrate_proportional(self, tolerance: float) -> Tuple[int, float]:
         max_iterations = 40
         prev_error = None
-        for _ in range(max_iterations):
+        error = float("inf")
+        for iteration in range(1, max_iterations + 1):
             df = self.generate_daily_data()
             actual = float(df["cumulative_ggr"].iloc[-1] / self.pool_size)
             error = (actual - self.target_ggr_multiplier) / self.target_ggr_multiplier
+            self._notify("calibration", iteration=iteration, error=error)
             if abs(error) < tolerance:
-                return
+                return iteration, error
 
             # Step size proportional to error, bounded to keep stability
             step = min(0.20, max(0.02, abs(error)))
@@ -607,204 +863,291 @@ class RevSharePoolGenerator:
                 self._cpa_scale = (self._cpa_scale + 1.0) / 2.0
             prev_error = error
         # proceed even if slightly outside tolerance
+        return max_iterations, error
 
-    def _tier_weights(self, cfg: TierConfig) -> Tuple[float, float, float]:
-        b = cfg.capital_shares[0] * cfg.basic_rate
-        a = cfg.capital_shares[1] * cfg.advanced_rate
-        p = cfg.capital_shares[2] * cfg.premium_rate
-        s = b + a + p
-        return (b / s, a / s, p / s) if s > 0 else (1/3, 1/3, 1/3)
+    def _set_calibration_point(self, x: float) -> None:
+        """Map one log-step onto the three scales, in the 1 : 0.6 : -0.5 ratio of the proportional steps."""
+        self._deposit_scale = max(0.05, min(2.0, math.exp(x)))
+        self._retention_scale = max(0.30, min(1.0, math.exp(0.6 * x)))
+        self._cpa_scale = max(0.60, min(1.50, math.exp(-0.5 * x)))
+
+    @contextmanager
+    def profiling(self, capture: Optional[str] = None) -> Iterator[GenerationProfiler]:
+        """Time phases, count calibration steps and random draws inside the block; see ``profiling``.
+
+        ``capture`` ("cprofile" or "pyinstrument") also records a call profile.
+        Results are unchanged: the counted draws come from the same stream.
+        """
+        profiler = GenerationProfiler(capture)
+        rng = self._rng
+        self._profiler = profiler
+        self._rng = profiler.wrap_rng(rng)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+            self._profiler = None
+            self._rng = rng
+
+    @contextmanager
+    def tracking_progress(self, callback: Callable[[str, Dict[str, object]], None]) -> Iterator[None]:
+        """Call ``callback(phase, info)`` as work advances inside the block.
+
+        Phases: "calibration" (``iteration``, relative ``error``; ``done`` once
+        the scales are set), "simulation"
+        (``day`` of ``days``; the numpy engine reports only start and end) and
+        "payouts". An exception raised by the callback aborts the run, which
+        is how a caller cancels it.
+        """
+        self._progress = callback
+        try:
+            yield
+        finally:
+            self._progress = None
+
+    def _notify(self, phase: str, **info: object) -> None:
+        if self._progress is not None:
+            self._progress(phase, info)
+
+    def checkpoint(self) -> Dict[str, object]:
+        """Capture RNG and mutable simulation state so a run can be replayed from here."""
+        return {
+            "rng": copy.deepcopy(self._rng.bit_generator.state),
+            "negative_cluster_remaining": self.negative_cluster_remaining,
+            "scales": (self._deposit_scale, self._retention_scale, self._cpa_scale),
+        }
+
+    def restore(self, checkpoint: Dict[str, object]) -> None:
+        """Return to a state captured by checkpoint(); the next draws repeat exactly."""
+        self._rng.bit_generator.state = copy.deepcopy(checkpoint["rng"])
+        self.negative_cluster_remaining = checkpoint["negative_cluster_remaining"]
+        self._deposit_scale, self._retention_scale, self._cpa_scale = checkpoint["scales"]
+
+    def fork(self, independent: bool = False) -> "RevSharePoolGenerator":
+        """Copy this generator mid-simulation.
+
+        The copy continues the same random stream unless ``independent`` is set,
+        in which case it gets a statistically independent child stream.
+        """
+        child = copy.deepcopy(self)
+        if independent:
+            child._rng = self._rng.spawn(1)[0]
+        return child
+
+    @timed_phase("simulation")
+    def _final_ggr_multiplier(self) -> float:
+        """Final cumulative GGR / pool size, without payouts or the monthly summary."""
+        if self._profiler is not None:
+            self._profiler.count("calibration_evaluations")
+        if self.engine == "numpy":
+            final_ggr = float(cohort_engine.simulate_final_ggr(self, self._rng)[0])
+        else:
+            final_ggr = float(self.generate_daily_records()["cumulative_ggr"][-1])
+        return final_ggr / self.pool_size
+
+    def _calibrate_crn(self, tolerance: float, max_iterations: int = 40, response: float = 2.1) -> Tuple[int, float]:
+        target = self.target_ggr_multiplier
+        snapshot = self.checkpoint()
+        evaluations = 0
+
+        def evaluate(x: float) -> float:
+            nonlocal evaluations
+            self.restore(snapshot)
+            self._set_calibration_point(x)
+            error = (self._final_ggr_multiplier() - target) / target
+            evaluations += 1
+            self._notify("calibration", iteration=evaluations, error=error)
+            return error
+
+        # GGR grows roughly like exp(response · x), nominally 2.1: deposits x1, retention x0.6, FTDs (1/CPA) x0.5
+        lo, hi = math.log(0.05), math.log(2.0)
+        xa = max(lo, min(hi, math.log(self._deposit_scale)))
+        ea = evaluate(xa)
+        iterations = 1
+        best_x, best_error = xa, ea
+        if abs(ea) >= tolerance:
+            if ea > -1.0:
+                xb = xa - math.log1p(ea) / response
+            else:
+                xb = hi
+            xb = max(lo, min(hi, xb))
+            eb = evaluate(xb)
+            iterations += 1
+            while True:
+                if abs(eb) < abs(best_error):
+                    best_x, best_error = xb, eb
+                if abs(eb) < tolerance or iterations >= max_iterations or eb == ea:
+                    break
+                bracketed = ea * eb < 0
+                # Secant step; with a sign change it stays inside the bracket (Illinois variant)
+                xc = max(lo, min(hi, xb - eb * (xb - xa) / (eb - ea)))
+                if xc == xb:
+                    break  # target out of reach at the scale bounds
+                ec = evaluate(xc)
+                iterations += 1
+                if bracketed and ec * eb > 0:
+                    ea *= 0.5
+                else:
+                    xa, ea = xb, eb
+                xb, eb = xc, ec
+
+        self.restore(snapshot)
+        self._set_calibration_point(best_x)
+        return iterations, best_error
+
+    def _tier_weights(self, cfg: TierConfig) -> Tuple[float, ...]:
+        return tuple(analytic.tier_weights(cfg))
+
+    def calculate_tier_returns(self, daily_df: Optional[pd.DataFrame] = None,
+                               ggr_multiplier: Optional[float] = None) -> Dict[str, Dict]:
+        """Per-tier invested/received and $ per $1 (see analytic.tier_returns).
+
+        Pass ``ggr_multiplier`` to skip the simulation; otherwise it is taken
+        from ``daily_df`` (generated if omitted).
+        """
+        if ggr_multiplier is None:
+            if daily_df is None:
+                daily_df = self.generate_daily_data()
+            ggr_multiplier = float(daily_df["cumulative_ggr"].iloc[-1]) / self.pool_size
+        r = analytic.tier_returns(float(ggr_multiplier), self.pool_size, self.stable_ratio, self.growth_ratio,
+                                  self.stable_cfg, self.growth_cfg)
 
-    def calculate_tier_returns(self, daily_df: Optional[pd.DataFrame] = None) -> Dict[str, Dict]:
-        if daily_df is None:
-            daily_df = self.generate_daily_data()
-        
-        # Get final cumulative GGR and calculate multiplier
-        final_ggr = float(daily_df["cumulative_ggr"].iloc[-1])
-        ggr_multiplier = final_ggr / self.pool_size
-        
-        # Calculate pool sizes and investments per tier
-        stable_pool = self.pool_size * self.stable_ratio
-        growth_pool = self.pool_size * self.growth_ratio
-        
-        stable_invested = [stable_pool * s for s in self.stable_cfg.capital_shares]
-        growth_invested = [growth_pool * s for s in self.growth_cfg.capital_shares]
-        
-        # NEW SIMPLIFIED FORMULAS:
         # Stable: payout = investment × GGR_multiplier × tier_rate
         # Growth: total = (investment × GGR_multiplier × tier_rate) + investment
-        stable_rates = [self.stable_cfg.basic_rate, self.stable_cfg.advanced_rate, self.stable_cfg.premium_rate]
-        growth_rates = [self.growth_cfg.basic_rate, self.growth_cfg.advanced_rate, self.growth_cfg.premium_rate]
-        
-        stable_received = [inv * ggr_multiplier * rate for inv, rate in zip(stable_invested, stable_rates)]
-        growth_cash = [inv * ggr_multiplier * rate for inv, rate in zip(growth_invested, growth_rates)]
-        growth_tokens = growth_invested[:]  # 100% tokens returned (USD value)
-
-        def make_stable(inv: float, rec: float, rate: float) -> Dict[str, float]:
-            # Stable: per_dollar = ggr_multiplier × tier_rate
-            per_dollar = ggr_multiplier * rate
-            return {
-                "invested": inv,
-                "received": rec,
-                "per_dollar": per_dollar,
-            }
-
-        def make_growth(inv: float, cash: float, tokens: float, rate: float) -> Dict[str, float]:
-            # Growth: per_dollar = (ggr_multiplier × tier_rate) + 1.00
-            total = cash + tokens
-            per_dollar_cash = ggr_multiplier * rate
-            per_dollar_total = per_dollar_cash + 1.0
-            return {
-                "invested": inv,
-                "cash_received": cash,
-                "tokens_returned": tokens,
-                "total_value": total,
-                "per_dollar_cash": per_dollar_cash,
-                "per_dollar_total": per_dollar_total,
-            }
-
         return {
             "stable": {
-                "basic": make_stable(stable_invested[0], stable_received[0], stable_rates[0]),
-                "advanced": make_stable(stable_invested[1], stable_received[1], stable_rates[1]),
-                "premium": make_stable(stable_invested[2], stable_received[2], stable_rates[2]),
+                tier: {
+                    "invested": float(r["stable_invested"][i]),
+                    "received": float(r["stable_received"][i]),
+                    "per_dollar": float(r["stable_per_dollar"][i]),
+                }
+                for i, tier in enumerate(self.stable_cfg.names)
             },
             "growth": {
-                "basic": make_growth(growth_invested[0], growth_cash[0], growth_tokens[0], growth_rates[0]),
-                "advanced": make_growth(growth_invested[1], growth_cash[1], growth_tokens[1], growth_rates[1]),
-                "premium": make_growth(growth_invested[2], growth_cash[2], growth_tokens[2], growth_rates[2]),
+                tier: {
+                    "invested": float(r["growth_invested"][i]),
+                    "cash_received": float(r["growth_cash"][i]),
+                    "tokens_returned": float(r["growth_tokens"][i]),
+                    "total_value": float(r["growth_total"][i]),
+                    "per_dollar_cash": float(r["growth_per_dollar_cash"][i]),
+                    "per_dollar_total": float(r["growth_per_dollar_total"][i]),
+                }
+                for i, tier in enumerate(self.growth_cfg.names)
             },
         }
 
-    def _calculate_monthly_payout(self, month_end_cumulative_ggr: float) -> Tuple[float, float, bool]:
-        """Only pay when cumulative GGR exceeds previous high watermark.
-        
-        Returns:
-            Tuple of (stable_payout, growth_payout, watermark_exceeded)
-        """
-        if month_end_cumulative_ggr > self.high_watermark:
-            # New high reached - calculate payout only on the INCREMENT above watermark
-            ggr_increment = month_end_cumulative_ggr - self.high_watermark
-            
-            # Apply pool weights to the weighted rates
-            stable_payout = ggr_increment * self.stable_weighted_rate * self.stable_ratio
-            growth_payout = ggr_increment * self.growth_weighted_rate * self.growth_ratio
-            
-            # Update watermark
-            self.high_watermark = month_end_cumulative_ggr
-            return stable_payout, growth_payout, True
-        else:
-            # Below watermark - no payout this month
-            return 0.0, 0.0, False
-
+    @timed_phase("monthly_summary")
     def get_monthly_summary(self, daily_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Monthly totals with high-watermark payouts.
+
+        Pure: the daily frame is not copied and no generator state changes, so
+        it is safe to call concurrently. A ``path`` column (a batch of paths in
+        one long frame) is kept as the leading key, with a watermark per path.
+        """
         if daily_df is None:
             daily_df = self.generate_daily_data()
-        
-        # Reset high watermark for fresh calculation
-        self.high_watermark = 0.0
-        
-        df = daily_df.copy()
-        df['year'] = df['date'].dt.year
-        summary = (
-            df.groupby(['year', 'month'], as_index=False)[
-                ['new_ftds', 'active_players', 'total_deposits', 'daily_ggr', 'traffic_spend']
-            ].sum()
-        )
-        
-        # Calculate cumulative GGR for high watermark logic
+
+        keys = [daily_df['date'].dt.year.rename('year'), daily_df['month']]
+        if 'path' in daily_df.columns:
+            keys.insert(0, daily_df['path'])
+        grouped = daily_df.groupby(keys)
+        summary = grouped[['new_ftds', 'active_players', 'total_deposits', 'daily_ggr', 'traffic_spend']].sum()
+
         summary['monthly_ggr'] = summary['daily_ggr']
-        summary['cumulative_ggr'] = summary['monthly_ggr'].cumsum()
-        
-        # Track negative GGR days per month
-        negative_days_per_month = []
-        for _, row in summary.iterrows():
-            month_data = df[(df['year'] == row['year']) & (df['month'] == row['month'])]
-            negative_days = (month_data['daily_ggr'] < 0).sum()
-            negative_days_per_month.append(negative_days)
-        
-        summary['ggr_negative_days'] = negative_days_per_month
-        
-        # Apply high watermark logic for payouts
-        monthly_stable_payouts = []
-        monthly_growth_payouts = []
-        watermark_exceeded = []
-        
-        for _, row in summary.iterrows():
-            monthly_stable, monthly_growth, exceeded = self._calculate_monthly_payout(row['cumulative_ggr'])
-            
-            # Store only the monthly payout amounts (not cumulative)
-            monthly_stable_payouts.append(monthly_stable)
-            monthly_growth_payouts.append(monthly_growth)
-            watermark_exceeded.append(exceeded)
-        
-        summary['stable_payout'] = monthly_stable_payouts
-        summary['growth_payout'] = monthly_growth_payouts
-        summary['watermark_exceeded'] = watermark_exceeded
+        summary['ggr_negative_days'] = (daily_df['daily_ggr'] < 0).groupby(keys).sum()
+
+        # Month-end cumulative GGR as (paths × months); a single path is one row
+        monthly_ggr = summary['monthly_ggr'].to_numpy()
+        n_paths = summary.index.get_level_values('path').nunique() if 'path' in daily_df.columns else 1
+        if len(monthly_ggr) % n_paths:
+            raise ValueError("every path needs the same months")
+        cumulative = np.cumsum(monthly_ggr.reshape(n_paths, -1), axis=1)
+        summary.insert(summary.columns.get_loc('monthly_ggr') + 1, 'cumulative_ggr', cumulative.ravel())
+
+        # High watermark: pay only on the increment above the previous month-end peak
+        increment, exceeded = cohort_engine.watermark_increments(cumulative)
+        summary['stable_payout'] = (increment * self.stable_weighted_rate * self.stable_ratio).ravel()
+        summary['growth_payout'] = (increment * self.growth_weighted_rate * self.growth_ratio).ravel()
+        summary['watermark_exceeded'] = exceeded.ravel()
         # Calculate monthly referral cost from daily data if available
         if 'daily_total_referral' in daily_df.columns:
-            monthly_referral = daily_df.groupby(['year', 'month'])['daily_total_referral'].sum().reset_index()
-            summary = summary.merge(monthly_referral, on=['year', 'month'], how='left')
-            summary['monthly_referral_cost'] = summary['daily_total_referral'].fillna(0)
-            summary = summary.drop('daily_total_referral', axis=1)
+            summary['monthly_referral_cost'] = grouped['daily_total_referral'].sum()
         else:
             summary['monthly_referral_cost'] = 0
         summary['capital_cost_usd'] = summary['traffic_spend'] + summary['monthly_referral_cost']
-        return summary
+        return summary.reset_index()
 
-    def get_monthly_tier_payouts_per_znx(self, daily_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-        """Return monthly payouts per 1 ZNX for each of the 6 scenarios.
-        Growth tiers: 100% tokens returned + cash share of GGR; Stable tiers: cash share of GGR only.
+    @timed_phase("tier_payouts")
+    def get_monthly_tier_payouts_per_znx(
+        self,
+        daily_df: Optional[pd.DataFrame] = None,
+        monthly_df: Optional[pd.DataFrame] = None,
+        monte_carlo: Optional[MonteCarloResult] = None,
+        as_array: bool = False,
+    ) -> Union[pd.DataFrame, np.ndarray]:
+        """Monthly payouts per 1 ZNX for every pool × tier (cash share of GGR; no token return).
+
+        The source is, in order of preference, a ``get_monthly_summary`` frame
+        (``monthly_df``), the payouts of a ``simulate_many`` batch
+        (``monte_carlo``) or ``daily_df`` (generated if omitted). All months,
+        pools and tiers are computed in one broadcast; a batch (``path`` column
+        or Monte Carlo paths) gets a leading ``path`` column.
+
+        ``as_array=True`` returns the ``(months, pools, tiers)`` array instead,
+        ``(paths, months, pools, tiers)`` for a batch (see
+        ``analytic.per_znx_payouts``).
         """
-        if daily_df is None:
-            daily_df = self.generate_daily_data()
-        monthly = self.get_monthly_summary(daily_df)
-
-        stable_pool = self.pool_size * self.stable_ratio
-        growth_pool = self.pool_size * self.growth_ratio
-        stable_invested = np.array([stable_pool * s for s in self.stable_cfg.capital_shares])
-        growth_invested = np.array([growth_pool * s for s in self.growth_cfg.capital_shares])
-        sw = np.array(self._tier_weights(self.stable_cfg))
-        gw = np.array(self._tier_weights(self.growth_cfg))
-
-        rows: List[Dict[str, float]] = []
-        for _, m in monthly.iterrows():
-            # monthly cash payouts per pool
-            stable_cash = float(m['stable_payout'])
-            growth_cash = float(m['growth_payout'])
-            # distribute to tiers by weights
-            stable_tier_cash = sw * stable_cash
-            growth_tier_cash = gw * growth_cash
-
-            # per 1 ZNX cash
-            stable_per_znx_cash = (stable_tier_cash / stable_invested) * self.znx_price if stable_pool > 0 else np.zeros(3)
-            growth_per_znx_cash = (growth_tier_cash / growth_invested) * self.znx_price if growth_pool > 0 else np.zeros(3)
-            # Убираем расчет возврата токенов - сосредотачиваемся только на cash выплатах
-            # growth per 1 ZNX total = только cash (без возврата токенов)
-            growth_per_znx_total = growth_per_znx_cash
-            # stable per 1 ZNX total == cash (no token return implied)
-            stable_per_znx_total = stable_per_znx_cash
-
-            tiers = ['basic', 'advanced', 'premium']
-            for i, t in enumerate(tiers):
-                rows.append({
-                    'year': int(m['year']),
-                    'month': int(m['month']),
-                    'pool': 'stable',
-                    'tier': t,
-                    'per_znx_cash_usd': float(stable_per_znx_cash[i]),
-                    'per_znx_total_usd': float(stable_per_znx_total[i]),
-                })
-            for i, t in enumerate(tiers):
-                rows.append({
-                    'year': int(m['year']),
-                    'month': int(m['month']),
-                    'pool': 'growth',
-                    'tier': t,
-                    'per_znx_cash_usd': float(growth_per_znx_cash[i]),
-                    'per_znx_total_usd': float(growth_per_znx_total[i]),
-                })
-        return pd.DataFrame(rows)
+        path_ids = None
+        if monthly_df is None and monte_carlo is not None:
+            cal = cohort_engine.calendar_arrays(self.start_date, monte_carlo.stable_payout.shape[1])
+            starts, _ = cohort_engine.month_starts(cal)
+            stable = np.add.reduceat(monte_carlo.stable_payout.astype(float), starts, axis=1)
+            growth = np.add.reduceat(monte_carlo.growth_payout.astype(float), starts, axis=1)
+            years, months = cal["year"][starts], cal["month"][starts]
+            path_ids = np.arange(stable.shape[0])
+        else:
+            if monthly_df is None:
+                if daily_df is None:
+                    daily_df = self.generate_daily_data()
+                monthly_df = self.get_monthly_summary(daily_df)
+            stable = monthly_df['stable_payout'].to_numpy(dtype=float)
+            growth = monthly_df['growth_payout'].to_numpy(dtype=float)
+            years, months = monthly_df['year'].to_numpy(), monthly_df['month'].to_numpy()
+            if 'path' in monthly_df.columns:
+                paths = monthly_df['path'].to_numpy()
+                path_ids = pd.unique(paths)
+                if len(stable) % len(path_ids):
+                    raise ValueError("every path needs the same months")
+                shape = (len(path_ids), -1)
+                stable, growth = stable.reshape(shape), growth.reshape(shape)
+                years, months = years.reshape(shape)[0], months.reshape(shape)[0]
+
+        per_znx = analytic.per_znx_payouts(stable, growth, self.pool_size, self.stable_ratio, self.growth_ratio,
+                                           self.stable_cfg, self.growth_cfg, self.znx_price)
+        if as_array:
+            return per_znx
+
+        # Long frame in (path, month, pool, tier) order; NaN padding of the shorter pool is dropped
+        n_months, n_pools, n_tiers = per_znx.shape[-3:]
+        n_paths = 1 if path_ids is None else len(path_ids)
+        names = [cfg.names + ('',) * (n_tiers - len(cfg.names)) for cfg in (self.stable_cfg, self.growth_cfg)]
+        block = n_pools * n_tiers
+        values = per_znx.ravel()
+        # Убираем расчет возврата токенов - сосредотачиваемся только на cash выплатах: total == cash
+        df = pd.DataFrame({
+            'year': np.tile(np.repeat(years.astype(np.int64), block), n_paths),
+            'month': np.tile(np.repeat(months.astype(np.int64), block), n_paths),
+            'pool': np.tile(np.repeat(['stable', 'growth'], n_tiers), n_paths * n_months),
+            'tier': np.tile(np.concatenate(names), n_paths * n_months),
+            'per_znx_cash_usd': values,
+            'per_znx_total_usd': values,
+        })
+        if path_ids is not None:
+            df.insert(0, 'path', np.repeat(path_ids, n_months * block))
+        if len(self.stable_cfg.names) != len(self.growth_cfg.names):
+            df = df[df['tier'] != ''].reset_index(drop=True)
+        return df
 
     def calculate_breakeven_metrics(self, daily_df: Optional[pd.DataFrame] = None) -> Dict[str, float]:
         """Рассчитывает метрики безубыточности для Stable пула.
@@ -817,16 +1160,20 @@ class RevSharePoolGenerator:
             
         final_ggr = float(daily_df['cumulative_ggr'].iloc[-1])
         final_spent = float(daily_df['cumulative_traffic'].iloc[-1])
+        stable_total_payout = float(daily_df['cumulative_stable'].iloc[-1])
+        return self._breakeven_metrics(final_ggr, final_spent, stable_total_payout)
+
+    def _breakeven_metrics(self, final_ggr, final_spent, stable_total_payout) -> Dict[str, object]:
+        """Breakeven logic shared by calculate_breakeven_metrics and simulate_many (floats or arrays)."""
         ggr_multiplier = (final_ggr / self.pool_size) if self.pool_size > 0 else 0.0
         
         # Расчет для Stable пула
         stable_pool_size = self.pool_size * self.stable_ratio
-        stable_total_payout = float(daily_df['cumulative_stable'].iloc[-1])
         stable_return_pct = (stable_total_payout / stable_pool_size * 100.0) if stable_pool_size > 0 else 0.0
         
         # Минимальные требования
-        min_ggr_multiplier_for_basic = 1 / 0.34  # = 2.94x for Stable Basic breakeven
-        min_stable_return = 34.0  # 34% минимум для Stable
+        min_ggr_multiplier_for_basic = float(analytic.breakeven_multipliers(self.stable_cfg)[0])  # = 2.94x for Stable Basic
+        min_stable_return = self.stable_cfg.basic_rate * 100  # 34% минимум для Stable
         
         # Статус безубыточности
         is_breakeven = ggr_multiplier >= min_ggr_multiplier_for_basic
@@ -845,6 +1192,84 @@ class RevSharePoolGenerator:
             'stable_total_payout': stable_total_payout
         }
 
+    @timed_phase("monte_carlo")
+    def simulate_many(
+        self,
+        n_paths: int,
+        seeds: Union[None, int, np.random.SeedSequence, Sequence[int]] = None,
+        batch_size: int = 100,
+        quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    ) -> MonteCarloResult:
+        """Simulate many independent paths over the horizon with the vectorized engine.
+
+        Uses the current (e.g. calibrated) scales. ``seeds`` is either a root
+        seed / SeedSequence, spawned into one child per batch of ``batch_size``
+        paths, or one integer seed per path; a per-path seed reproduces the
+        path of ``RevSharePoolGenerator(seed=s, engine="numpy")`` with the same
+        scales, at single-path speed.
+        """
+        if n_paths <= 0:
+            raise ValueError("n_paths must be positive")
+        if seeds is None or isinstance(seeds, (int, np.integer, np.random.SeedSequence)):
+            root = seeds if isinstance(seeds, np.random.SeedSequence) else np.random.SeedSequence(
+                self.seed if seeds is None else int(seeds))
+            sizes = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+            rngs = [np.random.default_rng(child) for child in root.spawn(len(sizes))]
+        else:
+            seeds = list(seeds)
+            if len(seeds) != n_paths:
+                raise ValueError("seeds must provide one seed per path")
+            sizes = [1] * n_paths
+            rngs = [np.random.default_rng(s) for s in seeds]
+        if self._profiler is not None:
+            rngs = [self._profiler.wrap_rng(rng) for rng in rngs]
+
+        days = self.horizon_days
+        cal = cohort_engine.calendar_arrays(self.start_date, days)
+        out = {name: np.empty((n_paths, days), dtype=np.float32) for name in MonteCarloResult.ARRAYS}
+        final_ggr = np.empty(n_paths)
+        final_spent = np.empty(n_paths)
+        totals = {name: np.empty(n_paths) for name in ("stable", "growth", "referral")}
+        start = 0
+        for size, rng in zip(sizes, rngs):
+            paths = cohort_engine.simulate_paths(self, rng, n_paths=size, days=days)
+            payouts = cohort_engine.distribute_payouts(self, paths["daily_ggr"], paths["daily_upfront_referral"], cal)
+            rows = slice(start, start + size)
+            out["daily_ggr"][rows] = paths["daily_ggr"]
+            out["cumulative_ggr"][rows] = paths["cumulative_ggr"]
+            out["stable_payout"][rows] = payouts["stable_payout"]
+            out["growth_payout"][rows] = payouts["growth_payout"]
+            out["referral_cost"][rows] = payouts["daily_total_referral"]
+            final_ggr[rows] = paths["cumulative_ggr"][:, -1]
+            final_spent[rows] = paths["cumulative_traffic"][:, -1]
+            totals["stable"][rows] = payouts["stable_payout"].sum(axis=1)
+            totals["growth"][rows] = payouts["growth_payout"].sum(axis=1)
+            totals["referral"][rows] = payouts["daily_total_referral"].sum(axis=1)
+            start += size
+
+        breakeven = self._breakeven_metrics(final_ggr, final_spent, totals["stable"])
+        ggr_multiplier = breakeven["ggr_multiplier"]
+        metrics = {
+            "final_ggr": final_ggr,
+            "ggr_multiplier": ggr_multiplier,
+            "final_spent": final_spent,
+            "total_stable_payout": totals["stable"],
+            "total_growth_payout": totals["growth"],
+            "total_referral_cost": totals["referral"],
+            "stable_return_pct": breakeven["stable_return_pct"],
+            "is_breakeven": breakeven["is_breakeven"],
+            "stable_meets_minimum": breakeven["stable_meets_minimum"],
+        }
+        # Per-dollar returns as in calculate_tier_returns
+        returns = analytic.tier_returns(ggr_multiplier, self.pool_size, self.stable_ratio, self.growth_ratio,
+                                        self.stable_cfg, self.growth_cfg)
+        for i, tier in enumerate(self.stable_cfg.names):
+            metrics[f"stable_{tier}_per_dollar"] = returns["stable_per_dollar"][:, i]
+        for i, tier in enumerate(self.growth_cfg.names):
+            metrics[f"growth_{tier}_per_dollar_total"] = returns["growth_per_dollar_total"][:, i]
+        return MonteCarloResult.from_arrays(out, pd.DataFrame(metrics), quantiles)
+
+    @timed_phase("validation")
     def validate_results(self, daily_df: Optional[pd.DataFrame] = None) -> Dict[str, object]:
         if daily_df is None:
             daily_df = self.generate_daily_data()
@@ -895,6 +1320,13 @@ class RevSharePoolGenerator:
 
         return {"passed": len(errors) == 0, "errors": errors, "warnings": warnings, "final_multiplier": final_mult}
 
+    def save_results(self, daily_df: pd.DataFrame, monthly_df: pd.DataFrame,
+                     tiers_df: Optional[pd.DataFrame] = None, directory: str = "results") -> ResultStore:
+        """Write the tables to a binary ResultStore (what the dashboard reads); CSV is export only."""
+        store = ResultStore(directory)
+        store.write(daily_df, monthly_df, tiers_df)
+        return store
+
     def export_to_csv(self, daily_df: pd.DataFrame, monthly_df: pd.DataFrame, prefix: str = "pool1") -> None:
         daily_path = f"{prefix}_daily.csv"
         monthly_path = f"{prefix}_monthly.csv"
@@ -1,27 +1,127 @@
+import argparse
+import json
+import os
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+
+from calibration_index import CalibrationIndex
 from revshare_pool import RevSharePoolGenerator
 
-if __name__ == "__main__":
-    gen = RevSharePoolGenerator(
-        pool_size=50000,
-        stable_ratio=0.6,
-        growth_ratio=0.4,
-        traffic_budget=50000,
-        start_date="2025-11-01",
-        cpa_range=(50, 60),
-        target_ggr_multiplier=3.0,
-        ggr_volatility=0.15,
-        seed=42,
-    )
+POOL_PARAMS = dict(
+    pool_size=50000,
+    stable_ratio=0.6,
+    growth_ratio=0.4,
+    traffic_budget=50000,
+    start_date="2025-11-01",
+    cpa_range=(50, 60),
+    target_ggr_multiplier=3.0,
+    ggr_volatility=0.15,
+)
+# Binary result store read by dashboard_app.py
+RESULTS_DIR = "results"
+
+
+def _parse_value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_grid(items: List[str]) -> Dict[str, list]:
+    # name=v1,v2,v3
+    grid = {}
+    for item in items:
+        name, values = item.split("=", 1)
+        grid[name] = [_parse_value(v) for v in values.split(",")]
+    return grid
+
+
+def _parse_lhs(items: List[str]) -> Dict[str, Tuple[float, float]]:
+    # name=low:high
+    bounds = {}
+    for item in items:
+        name, span = item.split("=", 1)
+        low, high = span.split(":", 1)
+        bounds[name] = (float(low), float(high))
+    return bounds
+
+
+def run_sweep(args: argparse.Namespace) -> None:
+    import sweep
+
+    spec = {}
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            spec = json.load(f)
+    base = {**POOL_PARAMS, **spec.get("base", {})}
+    grid = {**spec.get("grid", {}), **_parse_grid(args.grid)}
+    lhs = {**{k: tuple(v) for k, v in spec.get("lhs", {}).items()}, **_parse_lhs(args.lhs)}
+    samples = args.samples if args.samples is not None else spec.get("samples", 0)
+
+    points = sweep.build_points(base, grid, lhs, samples, seed=args.seed)
+    print(f"Sweep: {len(points)} points")
+    warm_start = CalibrationIndex(args.warm_start) if args.warm_start else None
+    results = sweep.run_sweep(points, seed=args.seed, max_workers=args.workers, warm_start=warm_start)
+    sweep.write_results(results, args.out)
+    failed = int((results["error"] != "").sum())
+    print(f"Wrote {len(results)} rows to {args.out}" + (f" ({failed} failed)" if failed else ""))
+
+
+def run_portfolio(args: argparse.Namespace) -> None:
+    from portfolio import Portfolio
 
-    gen.calibrate_to_target_ggr(tolerance=0.1)
-    daily_df = gen.generate_daily_data()
-    monthly_df = gen.get_monthly_summary(daily_df)
-    tier_returns = gen.calculate_tier_returns(daily_df)
+    spec = {}
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            spec = json.load(f)
+    pools = {}
+    for name, params in spec.get("pools", {"pool1": {}}).items():
+        gen = RevSharePoolGenerator(**{**POOL_PARAMS, "engine": "numpy", "seed": args.seed, **params})
+        # Each pool is calibrated on its own; the portfolio only couples traffic and CPA
+        gen.calibrate_to_target_ggr(tolerance=args.tolerance, method="crn")
+        pools[name] = gen
+    portfolio = Portfolio(pools, traffic_budget=spec.get("traffic_budget"),
+                          cpa_correlation=spec.get("cpa_correlation", 0.0), seed=args.seed)
+    result = portfolio.simulate()
 
-    # Monthly per-ZNX payouts for 6 scenarios (2 pools x 3 tiers)
-    monthly_tiers_znx = gen.get_monthly_tier_payouts_per_znx(daily_df)
+    for name, daily_df in result.pools.items():
+        gen = portfolio.pools[name]
+        gen.save_results(daily_df, gen.get_monthly_summary(daily_df), directory=os.path.join(args.out, name))
+    result.daily.to_csv(os.path.join(args.out, "portfolio_daily.csv"), index=False)
+    result.monthly.to_csv(os.path.join(args.out, "portfolio_monthly.csv"), index=False)
+    result.pool_monthly.to_csv(os.path.join(args.out, "pool_monthly.csv"), index=False)
 
-    validation = gen.validate_results(daily_df)
+    for name, daily_df in result.pools.items():
+        print(f"{name}: start {daily_df['date'].iloc[0]:%Y-%m-%d}, multiplier {daily_df['ggr_multiplier'].iloc[-1]:,.2f}x")
+    print(f"Portfolio GGR: ${result.daily['cumulative_ggr'].iloc[-1]:,.0f}, "
+          f"payouts ${result.daily['cumulative_stable'].iloc[-1] + result.daily['cumulative_growth'].iloc[-1]:,.0f}")
+    print(f"Wrote {len(result.pools)} pools to {args.out}")
+
+
+def print_profile(profiler) -> None:
+    report = profiler.report()
+    print(f"\nProfile: {report.total_seconds * 1000:.0f} ms, {report.draws:,} random draws, {report.counters}")
+    for row in report.to_frame().itertuples(index=False):
+        print(f"  {row.phase:<40} {row.calls:4d} calls {row.seconds * 1000:9.1f} ms {row.share:6.1%} {row.draws:>10,} draws")
+    if report.profile:
+        print(report.profile)
+
+
+def run_default(profile: Optional[str] = None, tolerance: float = 0.1) -> None:
+    gen = RevSharePoolGenerator(**POOL_PARAMS, seed=42, engine="numpy")
+
+    capture = None if profile in (None, "phases") else profile
+    with gen.profiling(capture) if profile else nullcontext() as profiler:
+        calibration = gen.calibrate_to_target_ggr(tolerance=tolerance, method="crn")
+        daily_df = gen.generate_daily_data()
+        monthly_df = gen.get_monthly_summary(daily_df)
+        tier_returns = gen.calculate_tier_returns(daily_df)
+
+        # Monthly per-ZNX payouts for every pool x tier scenario
+        monthly_tiers_znx = gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+
+        validation = gen.validate_results(daily_df)
     if not validation["passed"]:
         raise RuntimeError(f"Validation failed: {validation['errors']}")
     
@@ -32,6 +132,7 @@ if __name__ == "__main__":
             print(f"  {warning}")
         print("  💡 Losses possible with low GGR. Adjust parameters to improve returns.")
 
+    gen.save_results(daily_df, monthly_df, monthly_tiers_znx, directory=RESULTS_DIR)
     gen.export_to_csv(daily_df, monthly_df, prefix="pool1_nov2025")
     gen.export_monthly_tier_znx(monthly_tiers_znx, prefix="pool1_nov2025")
 
@@ -40,6 +141,10 @@ if __name__ == "__main__":
 
     print(f"Final GGR: ${total_ggr:,.0f}")
     print(f"Multiplier: {multiplier:,.2f}x")
+    print(
+        f"Calibration: {calibration.iterations} iterations, "
+        f"error {calibration.error:+.2%}, {calibration.elapsed_seconds * 1000:.0f} ms"
+    )
     print("\nStable Pool Returns ($ per $1 invested):")
     for tier, data in tier_returns['stable'].items():
         return_pct = (data['per_dollar'] - 1) * 100
@@ -47,4 +152,41 @@ if __name__ == "__main__":
     print("\nGrowth Pool Returns: 100% tokens + cash ($ per $1 invested)")
     for tier, data in tier_returns['growth'].items():
         cash_return_pct = (data['per_dollar_cash']) * 100
-        print(f"  {tier}: {cash_return_pct:.1f}% cash + tokens (${data['per_dollar_cash']:.2f} per $1)")
\ No newline at end of file
+        print(f"  {tier}: {cash_return_pct:.1f}% cash + tokens (${data['per_dollar_cash']:.2f} per $1)")
+    if profiler is not None:
+        print_profile(profiler)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="RevShare pool simulation")
+    parser.add_argument("--profile", nargs="?", const="phases", choices=("phases", "cprofile", "pyinstrument"),
+                        help="print per-phase timings of the default run (optionally with a call profile)")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative calibration tolerance of the default run's GGR multiplier (default: 0.1)")
+    sub = parser.add_subparsers(dest="command")
+    p = sub.add_parser("sweep", help="calibrate and simulate a grid / Latin-hypercube of parameters")
+    p.add_argument("--spec", help='JSON file: {"base": {...}, "grid": {name: [..]}, "lhs": {name: [low, high]}, "samples": N}')
+    p.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2", help="grid axis (repeatable)")
+    p.add_argument("--lhs", action="append", default=[], metavar="NAME=LOW:HIGH", help="Latin-hypercube range (repeatable)")
+    p.add_argument("--samples", type=int, help="Latin-hypercube samples per grid point")
+    p.add_argument("--out", default="sweep_results.csv", help="output .csv or .parquet")
+    p.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--warm-start", metavar="PATH", help="calibration index (SQLite) to warm-start from and update")
+    p = sub.add_parser("portfolio", help="simulate several pools with shared traffic in one pass")
+    p.add_argument("--spec", help='JSON file: {"pools": {name: {...}}, "traffic_budget": X, "cpa_correlation": R}')
+    p.add_argument("--out", default=os.path.join(RESULTS_DIR, "portfolio"), help="output directory")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--tolerance", type=float, default=0.1, help="relative calibration tolerance per pool")
+    args = parser.parse_args(argv)
+
+    if args.command == "sweep":
+        run_sweep(args)
+    elif args.command == "portfolio":
+        run_portfolio(args)
+    else:
+        run_default(args.profile, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
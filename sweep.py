@@ -0,0 +1,144 @@
+"""Parameter sweeps over pool and referral settings.
+
+A sweep is a list of points (generator kwargs) built from a grid and/or a
+Latin-hypercube spec on top of base parameters. Each point is calibrated
+(CRN) and simulated once in a worker process, and reduced to one row of KPIs:
+final multiplier, cost of capital, referral cost and per-tier per-dollar
+returns. Results are one tidy table written as Parquet or CSV.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from calibration_index import CalibrationIndex
+from parallel import _build_generator, _seed_int, run_parameter_sets
+
+# Sweep-only names mapped onto RevSharePoolGenerator kwargs by to_generator_kwargs
+CPA_MIN, CPA_MAX = "cpa_min", "cpa_max"
+
+
+def grid_points(grid: Mapping[str, Sequence[object]]) -> List[Dict[str, object]]:
+    """Cartesian product of the listed values, one dict per point."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def latin_hypercube_points(bounds: Mapping[str, Tuple[float, float]], n_points: int,
+                           seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """Latin-hypercube sample of ``n_points`` over ``{name: (low, high)}``."""
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, (low, high) in bounds.items():
+        strata = (rng.permutation(n_points) + rng.random(n_points)) / n_points
+        samples[name] = low + (high - low) * strata
+    return [{name: float(samples[name][i]) for name in bounds} for i in range(n_points)]
+
+
+def build_points(base: Mapping[str, object], grid: Optional[Mapping[str, Sequence[object]]] = None,
+                 lhs: Optional[Mapping[str, Tuple[float, float]]] = None, n_samples: int = 0,
+                 seed: Optional[int] = None) -> List[Dict[str, object]]:
+    """Base parameters overlaid with every grid point × every Latin-hypercube sample.
+
+    A swept ``stable_ratio`` without a swept ``growth_ratio`` drops the base
+    ``growth_ratio`` so that it is derived as the complement.
+    """
+    grid_part = grid_points(grid) if grid else [{}]
+    lhs_part = latin_hypercube_points(lhs, n_samples, seed) if lhs and n_samples > 0 else [{}]
+    points = []
+    for g in grid_part:
+        for l in lhs_part:
+            overlay = {**g, **l}
+            point = {**base, **overlay}
+            if "stable_ratio" in overlay and "growth_ratio" not in overlay:
+                point.pop("growth_ratio", None)
+            points.append(point)
+    return points
+
+
+def to_generator_kwargs(point: Mapping[str, object]) -> Dict[str, object]:
+    """Translate sweep names: cpa_min/cpa_max -> cpa_range, stable_ratio -> growth_ratio = 1 - stable_ratio."""
+    kwargs = dict(point)
+    if CPA_MIN in kwargs or CPA_MAX in kwargs:
+        low, high = kwargs.get("cpa_range", (55, 75))
+        kwargs["cpa_range"] = (float(kwargs.pop(CPA_MIN, low)), float(kwargs.pop(CPA_MAX, high)))
+    if "stable_ratio" in kwargs and "growth_ratio" not in kwargs:
+        kwargs["growth_ratio"] = 1.0 - float(kwargs["stable_ratio"])
+    return kwargs
+
+
+def _point_kpis(gen, tolerance: float, warm_start: Optional[CalibrationIndex]) -> Dict[str, object]:
+    calibration = gen.calibrate_to_target_ggr(tolerance=tolerance, method="crn", warm_start=warm_start)
+    daily_df = gen.generate_daily_data()
+    monthly_df = gen.get_monthly_summary(daily_df)
+
+    # Same definitions as the dashboard KPIs
+    total_cash_paid = float(monthly_df["stable_payout"].sum() + monthly_df["growth_payout"].sum())
+    total_referral_cost = float(monthly_df["monthly_referral_cost"].sum())
+    spent = float(daily_df["cumulative_traffic"].iloc[-1])
+    ftds = int(daily_df["new_ftds"].sum())
+    kpis: Dict[str, object] = {
+        "calibration_iterations": calibration.iterations,
+        "calibration_error": calibration.error,
+        "final_multiplier": float(daily_df["ggr_multiplier"].iloc[-1]),
+        "final_ggr": float(daily_df["cumulative_ggr"].iloc[-1]),
+        "total_cash_paid": total_cash_paid,
+        "total_referral_cost": total_referral_cost,
+        "cost_of_capital": (total_cash_paid + total_referral_cost) / gen.pool_size * 100,
+        "avg_cpa": spent / max(1, ftds),
+        "error": "",
+    }
+    tiers = gen.calculate_tier_returns(daily_df)
+    for tier, data in tiers["stable"].items():
+        kpis[f"stable_{tier}_per_dollar"] = data["per_dollar"]
+    for tier, data in tiers["growth"].items():
+        kpis[f"growth_{tier}_per_dollar_cash"] = data["per_dollar_cash"]
+        kpis[f"growth_{tier}_per_dollar_total"] = data["per_dollar_total"]
+    return kpis
+
+
+def evaluate_point(task: Tuple[Mapping[str, object], np.random.SeedSequence],
+                   tolerance: float = 0.02, warm_start: Optional[CalibrationIndex] = None) -> Dict[str, object]:
+    """Calibrate and simulate one sweep point; return its parameters and KPIs as a flat row.
+
+    A point that fails (invalid parameters, calibration or simulation error)
+    becomes a row with ``error`` set instead of aborting the whole sweep.
+    """
+    point, seed_seq = task
+    kwargs = to_generator_kwargs(point)
+    row: Dict[str, object] = {
+        name: (str(value) if isinstance(value, (tuple, list)) else value) for name, value in kwargs.items()
+    }
+    try:
+        gen = _build_generator(kwargs, _seed_int(seed_seq))
+        row.update(_point_kpis(gen, tolerance, warm_start))
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_sweep(points: Sequence[Mapping[str, object]], seed: Optional[int] = None,
+              max_workers: Optional[int] = None, warm_start: Optional[CalibrationIndex] = None) -> pd.DataFrame:
+    """Evaluate every point in parallel; one KPI row per point, in input order.
+
+    With a shared ``warm_start`` index calibrations start from earlier results;
+    the rows then depend on what the index held, not only on ``seed``.
+    """
+    evaluate = functools.partial(evaluate_point, warm_start=warm_start) if warm_start is not None else evaluate_point
+    results = run_parameter_sets(points, evaluate=evaluate, seed=seed, max_workers=max_workers)
+    results.insert(0, "point", np.arange(len(results)))
+    return results
+
+
+def write_results(results: pd.DataFrame, path: str) -> str:
+    """Write the KPI table as Parquet (``.parquet``, needs pyarrow) or CSV."""
+    if path.endswith(".parquet"):
+        results.to_parquet(path, index=False)
+    else:
+        results.to_csv(path, index=False)
+    return path
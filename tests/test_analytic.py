@@ -0,0 +1,67 @@
+"""Closed-form tier returns and breakeven surfaces."""
+
+import numpy as np
+import pytest
+
+import analytic
+from revshare_pool import GROWTH_TIERS, STABLE_TIERS, RevSharePoolGenerator
+
+POOL = dict(pool_size=20000, stable_ratio=0.6, growth_ratio=0.4)
+ARGS = (POOL["pool_size"], POOL["stable_ratio"], POOL["growth_ratio"], STABLE_TIERS, GROWTH_TIERS)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_tier_returns_match_baseline_formulas(engine):
+    gen = RevSharePoolGenerator(**POOL, seed=11, engine=engine)
+    daily_df = gen.generate_daily_data()
+    multiplier = float(daily_df["cumulative_ggr"].iloc[-1]) / gen.pool_size
+    tiers = gen.calculate_tier_returns(daily_df)
+    for tier, rate in zip(gen.stable_cfg.names, gen.stable_cfg.rates):
+        assert tiers["stable"][tier]["per_dollar"] == pytest.approx(multiplier * rate, rel=1e-12)
+    for tier, rate in zip(gen.growth_cfg.names, gen.growth_cfg.rates):
+        assert tiers["growth"][tier]["per_dollar_total"] == pytest.approx(multiplier * rate + 1.0, rel=1e-12)
+
+
+def test_tier_returns_broadcast_over_multipliers():
+    multipliers = np.array([[1.0, 2.5], [3.0, 4.0]])
+    returns = analytic.tier_returns(multipliers, *ARGS)
+    assert returns["stable_per_dollar"].shape == (2, 2, 3)
+    for index in np.ndindex(multipliers.shape):
+        single = analytic.tier_returns(multipliers[index], *ARGS)
+        for name, values in returns.items():
+            np.testing.assert_allclose(values[index], single[name])
+    np.testing.assert_allclose(returns["growth_per_dollar_total"], returns["growth_per_dollar_cash"] + 1.0)
+
+
+def test_breakeven_and_required_multipliers_invert_the_returns():
+    breakeven = analytic.breakeven_multipliers(STABLE_TIERS)
+    np.testing.assert_allclose(breakeven, 1.0 / np.array(STABLE_TIERS.rates))
+    required = analytic.multiplier_for_return(np.array([0.5, 2.0]), GROWTH_TIERS)
+    for row, target in zip(required, (0.5, 2.0)):
+        per_dollar = analytic.tier_returns(row, *ARGS)["growth_per_dollar_cash"]
+        np.testing.assert_allclose(np.diagonal(per_dollar), target)
+
+
+def test_payout_sensitivity_is_the_slope_of_payouts():
+    slope = analytic.payout_sensitivity(*ARGS)
+    low, high = (analytic.tier_returns(m, *ARGS) for m in (2.0, 3.0))
+    np.testing.assert_allclose(high["stable_received"] - low["stable_received"], slope["stable"])
+    np.testing.assert_allclose(high["growth_cash"] - low["growth_cash"], slope["growth"])
+
+
+def test_tier_weights_sum_to_one():
+    weights = analytic.tier_weights(STABLE_TIERS)
+    assert weights.sum() == pytest.approx(1.0)
+    assert analytic.weighted_rate(STABLE_TIERS) == pytest.approx(
+        float(np.dot(STABLE_TIERS.capital_shares, STABLE_TIERS.rates)))
+
+
+def test_return_surface_is_tidy():
+    multipliers = np.linspace(1.0, 5.0, 9)
+    surface = analytic.return_surface(multipliers, *ARGS)
+    assert len(surface) == len(multipliers) * (len(STABLE_TIERS.rates) + len(GROWTH_TIERS.rates))
+    growth = surface[surface["pool"] == "growth"]
+    assert growth["is_breakeven"].all()  # growth returns the tokens, so it never loses capital
+    stable = surface[(surface["pool"] == "stable") & (surface["tier"] == "basic")]
+    expected = multipliers >= 1.0 / STABLE_TIERS.basic_rate
+    np.testing.assert_array_equal(stable["is_breakeven"].to_numpy(), expected)
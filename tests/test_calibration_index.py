@@ -0,0 +1,58 @@
+"""Calibration warm-start index."""
+
+import sqlite3
+
+import pandas as pd
+
+from calibration_index import NO_SEED, SCHEMA, CalibrationIndex
+from result_cache import ResultCache
+from revshare_pool import RevSharePoolGenerator
+
+PARAMS = dict(pool_size=20000, seed=9, engine="numpy")
+CALIBRATION = {"tolerance": 0.05, "method": "crn"}
+
+
+def test_cache_result_independent_of_calibration_index(tmp_path):
+    index = CalibrationIndex(str(tmp_path / "index.sqlite"))
+    first, _, _ = ResultCache(str(tmp_path / "a"), calibration_index=index).get_or_generate(PARAMS, CALIBRATION)
+    assert len(index) == 1
+    second, _, _ = ResultCache(str(tmp_path / "b"), calibration_index=index).get_or_generate(PARAMS, CALIBRATION)
+    pd.testing.assert_frame_equal(first.read("daily"), second.read("daily"))
+
+
+def test_calibration_index_warm_start(tmp_path):
+    index = CalibrationIndex(str(tmp_path / "index.sqlite"))
+    gen = RevSharePoolGenerator(**PARAMS)
+    assert index.nearest(gen) is None
+    report = gen.calibrate_to_target_ggr(**CALIBRATION, warm_start=index)
+    assert report.converged and len(index) == 1
+    warm = RevSharePoolGenerator(**PARAMS).calibrate_to_target_ggr(**CALIBRATION, warm_start=index)
+    assert warm.converged and warm.iterations <= report.iterations
+
+
+def test_unseeded_calibrations_replace_each_other(tmp_path):
+    index = CalibrationIndex(str(tmp_path / "index.sqlite"))
+    for _ in range(2):
+        gen = RevSharePoolGenerator(**{**PARAMS, "seed": None})
+        gen.calibrate_to_target_ggr(**CALIBRATION, warm_start=index)
+    assert len(index) == 1
+
+
+def test_index_with_nullable_seed_is_migrated(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(SCHEMA.replace("seed INTEGER NOT NULL", "seed INTEGER"))
+        for created in (1.0, 2.0):
+            conn.execute("INSERT INTO calibrations VALUES ('f', '[0.0]', NULL, 0.0, ?, 'crn', 0.0, ?)",
+                         (created, created))
+        conn.execute("INSERT INTO calibrations VALUES ('f', '[0.0]', 7, 0.0, 0.5, 'crn', 0.0, 1.0)")
+    conn.close()
+
+    index = CalibrationIndex(path)
+    assert len(index) == 2
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("SELECT x FROM calibrations WHERE seed = ?", (NO_SEED,)).fetchall() == [(2.0,)]
+    finally:
+        conn.close()
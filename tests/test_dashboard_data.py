@@ -0,0 +1,28 @@
+"""KPIs and chart frames the dashboard derives from a result."""
+
+import pandas as pd
+import pytest
+
+import dashboard_data
+from revshare_pool import RevSharePoolGenerator
+
+
+def test_metrics_match_the_tables():
+    gen = RevSharePoolGenerator(pool_size=20000, seed=9, engine="numpy")
+    daily_df = gen.generate_daily_data()
+    monthly_df = gen.get_monthly_summary(daily_df)
+    tiers_df = gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+    before = daily_df.copy()
+
+    derived = dashboard_data.derive_dashboard_data(daily_df, monthly_df, tiers_df)
+    metrics = derived["metrics"]
+    assert metrics["real_pool_size"] == pytest.approx(gen.pool_size)
+    assert metrics["ggr_multiplier"] == pytest.approx(float(daily_df["ggr_multiplier"].iloc[-1]))
+    assert metrics["total_cash_paid"] == pytest.approx(float(daily_df["cumulative_stable"].iloc[-1]
+                                                             + daily_df["cumulative_growth"].iloc[-1]))
+    assert metrics["ftds"] == int(daily_df["new_ftds"].sum())
+    assert len(derived["payouts_melt"]) == 2 * len(monthly_df) and (derived["payouts_melt"]["payout"] >= 0).all()
+    assert list(derived["daily_display"].columns) == list(dashboard_data.DAILY_DISPLAY_COLUMNS.values())
+    assert len(derived["tiers_display"]) == len(tiers_df)
+    pd.testing.assert_frame_equal(daily_df, before)
+    assert dashboard_data.derive_dashboard_data(daily_df, monthly_df)["tiers_display"] is None
@@ -0,0 +1,82 @@
+"""Background generation jobs: progress, sharing and cancellation."""
+
+import threading
+
+import pytest
+
+from generation_jobs import GenerationRunner, wait
+from result_cache import ResultCache
+
+PARAMS = dict(pool_size=20000, seed=9, engine="numpy")
+CALIBRATION = {"tolerance": 0.05, "method": "crn"}
+
+
+class _GatedCache(ResultCache):
+    """Holds every generation until ``gate`` is set, so tests can act on running jobs."""
+
+    def __init__(self, directory: str) -> None:
+        super().__init__(directory)
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def get_or_generate(self, *args, **kwargs):
+        self.started.set()
+        self.gate.wait(10)
+        return super().get_or_generate(*args, **kwargs)
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = GenerationRunner(_GatedCache(str(tmp_path / "cache")), max_workers=1)
+    yield runner
+    runner.cache.gate.set()
+    runner.shutdown()
+
+
+def test_job_runs_to_done_and_then_hits_the_cache(runner):
+    runner.cache.gate.set()
+    status, result = wait(runner.submit(PARAMS, CALIBRATION, profile=True), timeout=30)
+    assert status.state == "done" and status.fraction == 1.0
+    assert status.calibration_iteration > 0 and status.day == status.days
+    assert not result.cache_hit and result.store.exists() and result.profile is not None
+    assert result.params == PARAMS and result.calibration == CALIBRATION
+
+    status, again = wait(runner.submit(PARAMS, CALIBRATION), timeout=30)
+    assert status.state == "done" and again.cache_hit and again.key == result.key
+
+
+def test_unfinished_job_is_shared_until_the_last_subscriber_leaves(runner):
+    job = runner.submit(PARAMS)
+    assert runner.submit(PARAMS) is job and job.snapshot().subscribers == 2
+    assert runner.submit({**PARAMS, "seed": 10}) is not job
+
+    job.cancel()  # one session leaves: the other still waits for the result
+    runner.cache.gate.set()
+    status, result = wait(job, timeout=30)
+    assert status.state == "done" and result is not None
+
+
+def test_cancel_stops_a_running_job(runner):
+    job = runner.submit(PARAMS, CALIBRATION)
+    assert runner.cache.started.wait(10)
+    job.cancel()
+    runner.cache.gate.set()
+    status, result = wait(job, timeout=30)
+    assert status.state == "cancelled" and result is None
+    # A stopped job is not reused: the next submit starts a new run
+    assert runner.submit(PARAMS, CALIBRATION) is not job
+
+
+def test_cancel_drops_a_queued_job(runner):
+    running = runner.submit(PARAMS)
+    queued = runner.submit({**PARAMS, "seed": 10})
+    queued.cancel()
+    assert queued.snapshot().state == "cancelled"
+    runner.cache.gate.set()
+    assert wait(running, timeout=30)[0].state == "done"
+
+
+def test_failure_is_reported(runner):
+    runner.cache.gate.set()
+    status, result = wait(runner.submit({**PARAMS, "stable_ratio": 0.9}), timeout=30)
+    assert status.state == "failed" and status.error.startswith("ValueError") and result is None
@@ -0,0 +1,130 @@
+"""Monthly summary and payouts against the original row-by-row implementation.
+
+The ``_baseline_*`` helpers are ports of the original code; the vectorized
+versions must reproduce them on the same daily data.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from revshare_pool import RevSharePoolGenerator
+
+POOL = dict(pool_size=20000, stable_ratio=0.6, growth_ratio=0.4)
+PAYOUT_COLUMNS = ["stable_payout", "growth_payout", "cumulative_stable", "cumulative_growth",
+                  "stable_return_pct", "growth_return_pct", "daily_total_referral", "cumulative_referral_cost"]
+
+
+def _baseline_monthly_summary(gen, daily_df):
+    watermark = 0.0
+    df = daily_df.copy()
+    df["year"] = df["date"].dt.year
+    summary = df.groupby(["year", "month"], as_index=False)[
+        ["new_ftds", "active_players", "total_deposits", "daily_ggr", "traffic_spend"]
+    ].sum()
+    summary["monthly_ggr"] = summary["daily_ggr"]
+    summary["cumulative_ggr"] = summary["monthly_ggr"].cumsum()
+    summary["ggr_negative_days"] = [
+        int((df[(df["year"] == row["year"]) & (df["month"] == row["month"])]["daily_ggr"] < 0).sum())
+        for _, row in summary.iterrows()
+    ]
+    stable, growth, exceeded = [], [], []
+    for _, row in summary.iterrows():
+        if row["cumulative_ggr"] > watermark:
+            increment = row["cumulative_ggr"] - watermark
+            stable.append(increment * gen.stable_weighted_rate * gen.stable_ratio)
+            growth.append(increment * gen.growth_weighted_rate * gen.growth_ratio)
+            exceeded.append(True)
+            watermark = row["cumulative_ggr"]
+        else:
+            stable.append(0.0)
+            growth.append(0.0)
+            exceeded.append(False)
+    summary["stable_payout"] = stable
+    summary["growth_payout"] = growth
+    summary["watermark_exceeded"] = exceeded
+    monthly_referral = df.groupby(["year", "month"])["daily_total_referral"].sum().reset_index()
+    summary = summary.merge(monthly_referral, on=["year", "month"], how="left")
+    summary["monthly_referral_cost"] = summary.pop("daily_total_referral").fillna(0)
+    summary["capital_cost_usd"] = summary["traffic_spend"] + summary["monthly_referral_cost"]
+    return summary
+
+
+def _baseline_daily_payouts(gen, daily_df):
+    df = daily_df.drop(columns=PAYOUT_COLUMNS)
+    # The baseline built the monthly summary before the referral columns existed
+    monthly = _baseline_monthly_summary(gen, df.assign(daily_total_referral=0.0))
+    stable_pool, growth_pool = gen.pool_size * gen.stable_ratio, gen.pool_size * gen.growth_ratio
+    cumulative_stable = cumulative_growth = cumulative_referral = 0.0
+    rows = []
+    for _, row in df.iterrows():
+        month = monthly[(monthly["year"] == row["year"]) & (monthly["month"] == row["month"])]
+        month_mask = (df["year"] == row["year"]) & (df["month"] == row["month"])
+        positive_days = (df[month_mask]["daily_ggr"] > 0).sum()
+        if row["daily_ggr"] > 0 and positive_days > 0:
+            daily_stable = float(month.iloc[0]["stable_payout"]) / positive_days
+            daily_growth = float(month.iloc[0]["growth_payout"]) / positive_days
+        else:
+            daily_stable = daily_growth = 0.0
+        cumulative_stable += daily_stable
+        cumulative_growth += daily_growth
+        total_referral = (daily_stable * gen.ongoing_share_stable + daily_growth * gen.ongoing_share_growth
+                          + row["daily_upfront_referral"])
+        cumulative_referral += total_referral
+        rows.append([daily_stable, daily_growth, cumulative_stable, cumulative_growth,
+                     cumulative_stable / stable_pool * 100.0, cumulative_growth / growth_pool * 100.0,
+                     total_referral, cumulative_referral])
+    return pd.DataFrame(rows, columns=PAYOUT_COLUMNS)
+
+
+def _baseline_tier_payouts(gen, monthly):
+    rows = []
+    for pool, payout_column, pool_size, cfg in (
+        ("stable", "stable_payout", gen.pool_size * gen.stable_ratio, gen.stable_cfg),
+        ("growth", "growth_payout", gen.pool_size * gen.growth_ratio, gen.growth_cfg),
+    ):
+        invested = np.array([pool_size * s for s in cfg.capital_shares])
+        parts = [s * r for s, r in zip(cfg.capital_shares, cfg.rates)]
+        weights = np.array([p / sum(parts) for p in parts])
+        for _, m in monthly.iterrows():
+            per_znx = weights * float(m[payout_column]) / invested * gen.znx_price
+            for tier, value in zip(cfg.names, per_znx):
+                rows.append({"year": int(m["year"]), "month": int(m["month"]), "pool": pool, "tier": tier,
+                             "per_znx_cash_usd": float(value), "per_znx_total_usd": float(value)})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module", params=["python", "numpy"])
+def generated(request):
+    gen = RevSharePoolGenerator(**POOL, seed=11, engine=request.param)
+    daily_df = gen.generate_daily_data()
+    return gen, daily_df, gen.get_monthly_summary(daily_df)
+
+
+def test_monthly_summary_matches_baseline(generated):
+    gen, daily_df, monthly_df = generated
+    expected = _baseline_monthly_summary(gen, daily_df)
+    pd.testing.assert_frame_equal(monthly_df[expected.columns], expected, check_dtype=False, rtol=1e-12)
+
+
+def test_monthly_summary_is_pure(generated):
+    gen, daily_df, monthly_df = generated
+    before = daily_df.copy()
+    pd.testing.assert_frame_equal(gen.get_monthly_summary(daily_df), monthly_df)
+    pd.testing.assert_frame_equal(daily_df, before)
+
+
+def test_daily_payouts_match_baseline(generated):
+    gen, daily_df, _ = generated
+    expected = _baseline_daily_payouts(gen, daily_df)
+    pd.testing.assert_frame_equal(daily_df[PAYOUT_COLUMNS].reset_index(drop=True), expected,
+                                  check_dtype=False, rtol=1e-12)
+
+
+def test_tier_payouts_per_znx_match_baseline(generated):
+    gen, _, monthly_df = generated
+    expected = _baseline_tier_payouts(gen, monthly_df)
+    actual = gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+    sort = ["year", "month", "pool", "tier"]
+    pd.testing.assert_frame_equal(actual.sort_values(sort).reset_index(drop=True),
+                                  expected.sort_values(sort).reset_index(drop=True), check_dtype=False, rtol=1e-12)
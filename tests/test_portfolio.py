@@ -0,0 +1,59 @@
+"""Several pools simulated in one vectorized pass."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import FLOWS, Portfolio
+
+POOLS = {
+    "early": dict(pool_size=20000, seed=1, start_date="2025-01-01", horizon_days=120),
+    "late": dict(pool_size=60000, seed=2, start_date="2025-02-15", horizon_days=90, cpa_range=(40.0, 80.0)),
+}
+
+
+@pytest.fixture(scope="module")
+def result():
+    return Portfolio(POOLS, seed=5).simulate()
+
+
+def test_portfolio_totals_are_sums_of_pools(result):
+    assert len(result.daily) == 45 + 90
+    for name, pool in result.pools.items():
+        assert len(pool) == POOLS[name]["horizon_days"]
+        # Each pool buys its own traffic: spend = pool_size
+        assert pool["traffic_spend"].sum() == pytest.approx(POOLS[name]["pool_size"])
+    totals = pd.concat(list(result.pools.values())).groupby("date")["daily_ggr"].sum()
+    np.testing.assert_allclose(result.daily.set_index("date")["daily_ggr"].loc[totals.index], totals)
+    for name in FLOWS:
+        if name != "active_players":  # monthly active players are an average, not a sum
+            assert result.monthly[name].sum() == pytest.approx(result.daily[name].sum())
+        assert result.pool_monthly[name].sum() == pytest.approx(result.monthly[name].sum())
+
+
+def test_later_pool_starts_on_its_own_date(result):
+    late = result.pools["late"]
+    assert late["date"].iloc[0] == pd.Timestamp("2025-02-15")
+    assert result.daily["active_pools"].iloc[0] == 1 and result.daily["active_pools"].max() == 2
+
+
+def test_shared_traffic_budget_is_spent_in_full():
+    result = Portfolio(POOLS, traffic_budget=50000, cpa_correlation=0.8, seed=5).simulate()
+    assert result.daily["traffic_spend"].sum() == pytest.approx(50000)
+    assert (result.pools["late"]["effective_traffic_budget"] > 0).all()
+
+
+def test_same_seed_reproduces(result):
+    again = Portfolio(POOLS, seed=5).simulate()
+    pd.testing.assert_frame_equal(again.daily, result.daily)
+    other = Portfolio(POOLS, seed=6).simulate()
+    assert not other.daily["daily_ggr"].equals(result.daily["daily_ggr"])
+
+
+def test_invalid_portfolios_are_rejected():
+    with pytest.raises(ValueError):
+        Portfolio({})
+    with pytest.raises(ValueError):
+        Portfolio(POOLS, cpa_correlation=1.5)
+    with pytest.raises(ValueError):
+        Portfolio({**POOLS, "legacy": dict(pool_size=10000, use_enhanced_retention=False)})
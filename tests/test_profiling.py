@@ -0,0 +1,44 @@
+"""Opt-in generation profiling."""
+
+import pandas as pd
+import pytest
+
+from profiling import GenerationProfiler
+from revshare_pool import RevSharePoolGenerator
+
+PARAMS = dict(pool_size=20000, seed=3)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_profiling_leaves_results_unchanged(engine):
+    plain = RevSharePoolGenerator(**PARAMS, engine=engine).generate_daily_data()
+    gen = RevSharePoolGenerator(**PARAMS, engine=engine)
+    with gen.profiling() as profiler:
+        profiled = gen.generate_daily_data()
+    pd.testing.assert_frame_equal(profiled, plain)
+    assert profiler.report().draws > 0
+    assert gen._profiler is None and not hasattr(gen._rng, "_profiler")
+
+
+def test_report_nests_phases_and_counts_calibration():
+    gen = RevSharePoolGenerator(**PARAMS, engine="numpy")
+    with gen.profiling(capture="cprofile") as profiler:
+        report = gen.calibrate_to_target_ggr(tolerance=0.05)
+        gen.get_monthly_summary(gen.generate_daily_data())
+    result = profiler.report()
+    assert result.counters["calibration_iterations"] == report.iterations
+    assert result.phases["calibration"].calls == 1
+    assert result.phases["calibration/generate"].calls == report.iterations
+    assert result.phases["generate/simulation"].draws > 0
+    assert result.draws == sum(stats.draws for stats in result.phases.values())
+    assert result.phases["calibration"].seconds <= result.total_seconds
+    assert "cumulative" in result.profile
+
+    frame = result.to_frame()
+    assert list(frame.columns) == ["phase", "calls", "seconds", "share", "draws"]
+    assert set(frame["phase"]) == set(result.phases)
+
+
+def test_unknown_capture_is_rejected():
+    with pytest.raises(ValueError):
+        GenerationProfiler(capture="perf")
@@ -0,0 +1,60 @@
+"""Persistent result cache keyed by generator parameters."""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from result_cache import ResultCache, cache_key
+from revshare_pool import RevSharePoolGenerator
+
+PARAMS = dict(pool_size=20000, seed=9, engine="numpy")
+CALIBRATION = {"tolerance": 0.05, "method": "crn"}
+
+
+@pytest.fixture(scope="module")
+def tables():
+    gen = RevSharePoolGenerator(**PARAMS)
+    daily_df = gen.generate_daily_data()
+    monthly_df = gen.get_monthly_summary(daily_df)
+    return daily_df, monthly_df, gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+
+
+def test_cache_key_normalizes_params():
+    assert cache_key(PARAMS) == cache_key({**PARAMS, "pool_size": 20000.0, "stable_ratio": 0.6})
+    assert cache_key(PARAMS) != cache_key({**PARAMS, "seed": 10})
+    assert cache_key(PARAMS) != cache_key(PARAMS, CALIBRATION)
+
+
+def test_cache_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    store, key, hit = cache.get_or_generate(PARAMS, calibration=CALIBRATION)
+    assert not hit and key == cache_key(PARAMS, CALIBRATION)
+    cached, cached_key, hit = cache.get_or_generate(PARAMS, calibration=CALIBRATION)
+    assert hit and cached_key == key
+    for expected, actual in zip(store.read_all(), cached.read_all()):
+        pd.testing.assert_frame_equal(actual, expected)
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 1
+
+    # A fresh cache regenerates the same tables: the key fully determines the result
+    fresh, _, hit = ResultCache(str(tmp_path / "other")).get_or_generate(PARAMS, calibration=CALIBRATION)
+    assert not hit
+    pd.testing.assert_frame_equal(fresh.read("daily"), store.read("daily"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path, tables):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1)
+    cache.put("old", *tables)
+    cache.put("new", *tables)
+    assert cache.get("old") is None and cache.get("new") is not None
+    assert cache.evictions == 1
+
+
+def test_lookup_counters_are_thread_safe(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    threads = [threading.Thread(target=lambda: [cache.get("missing") for _ in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["misses"] == 8 * 500 and cache.stats()["hits"] == 0
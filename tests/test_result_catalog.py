@@ -0,0 +1,51 @@
+"""SQLite catalog of saved results."""
+
+import pytest
+
+from result_catalog import ResultCatalog, kpis_from_tables
+from result_store import ResultStore
+from revshare_pool import RevSharePoolGenerator
+
+PARAMS = dict(pool_size=20000, seed=9, engine="numpy")
+
+
+@pytest.fixture(scope="module")
+def tables():
+    gen = RevSharePoolGenerator(**PARAMS)
+    daily_df = gen.generate_daily_data()
+    monthly_df = gen.get_monthly_summary(daily_df)
+    return daily_df, monthly_df, gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+
+
+def test_catalog_round_trip(tmp_path, tables):
+    directory = tmp_path / "saved"
+    ResultStore(str(directory / "run1")).write(*tables)
+    catalog = ResultCatalog(str(directory))
+    catalog.add_store("run1", {"pool_size": 20000, "cache_key": "k1"}, tags=["a", " b ", ""], created=1.0)
+    catalog.add("run2", {"pool_size": 50000}, created=2.0)
+
+    assert [row["name"] for row in catalog.list()] == ["run2", "run1"]
+    assert [row["name"] for row in catalog.list(order_by="pool_size", descending=False)] == ["run1", "run2"]
+    assert [row["name"] for row in catalog.list(tag="a")] == ["run1"]
+    row = catalog.find("k1")
+    assert row["tags"] == ["a", "b"] and row["kpis"] == kpis_from_tables(tables[0], tables[1])
+    with pytest.raises(ValueError):
+        catalog.list(order_by="name; DROP TABLE saved_results")
+
+    catalog.remove("run1")
+    assert catalog.find("k1") is None and catalog.tags() == []
+
+
+def test_catalog_sync(tmp_path, tables):
+    directory = tmp_path / "saved"
+    ResultStore(str(directory / "good")).write(*tables)
+    (directory / "good" / "generation_params.json").write_text('{"pool_size": 20000}', encoding="utf-8")
+    (directory / "bad").mkdir()
+    (directory / "bad" / "generation_params.json").write_text("{", encoding="utf-8")
+    catalog = ResultCatalog(str(directory))
+    catalog.add("gone", {})
+
+    problems = catalog.sync()
+    assert [name for name, _ in problems] == ["bad"]
+    assert [row["name"] for row in catalog.list()] == ["good"]
+    assert catalog.list()[0]["kpis"]["ggr_multiplier"] == pytest.approx(float(tables[0]["ggr_multiplier"].iloc[-1]))
@@ -0,0 +1,49 @@
+"""Binary result store."""
+
+import pandas as pd
+import pytest
+
+from result_store import ResultStore
+from revshare_pool import RevSharePoolGenerator
+
+PARAMS = dict(pool_size=20000, seed=9, engine="numpy")
+
+
+@pytest.fixture(scope="module")
+def tables():
+    gen = RevSharePoolGenerator(**PARAMS)
+    daily_df = gen.generate_daily_data()
+    monthly_df = gen.get_monthly_summary(daily_df)
+    return daily_df, monthly_df, gen.get_monthly_tier_payouts_per_znx(monthly_df=monthly_df)
+
+
+def test_store_round_trip(tmp_path, tables):
+    store = ResultStore(str(tmp_path / "store"))
+    assert not store.exists() and store.fingerprint() is None
+    store.write(*tables)
+    assert store.exists()
+    for expected, actual in zip(tables, store.read_all()):
+        pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True))
+    fingerprint = store.fingerprint()
+    store.write(*tables)
+    assert store.fingerprint() == fingerprint
+    store.write(tables[0].iloc[:-1], tables[1])
+    assert store.fingerprint() != fingerprint
+
+
+def test_store_csv_import(tmp_path, tables):
+    store = ResultStore(str(tmp_path / "store"))
+    store.write(*tables)
+    store.export_csv(str(tmp_path / "pool1"))
+    imported = ResultStore.from_csv(str(tmp_path / "imported"), str(tmp_path / "pool1"))
+    pd.testing.assert_frame_equal(imported.read("monthly"), tables[1], check_dtype=False)
+
+
+def test_stat_fingerprint_tracks_rewrites(tmp_path, tables):
+    store = ResultStore(str(tmp_path / "store"))
+    assert store.stat_fingerprint() is None
+    store.write(*tables)
+    marker = store.stat_fingerprint()
+    assert store.stat_fingerprint() == marker
+    store.write(*tables)
+    assert store.stat_fingerprint() != marker
@@ -0,0 +1,45 @@
+"""Age-indexed retention and deposit schedules."""
+
+import numpy as np
+import pytest
+
+from revshare_pool import AgeSchedule, RevSharePoolGenerator
+
+SCHEDULE = {(0, 6): 10.0, (7, 29): 20.0, (30, 89): 30.0, (90, 99999): 40.0}
+
+
+def test_scalar_and_vectorized_lookups_agree():
+    schedule = AgeSchedule({(0, 6): 10.0, (7, 29): 20.0, (30, 89): 30.0})
+    ages = np.arange(-3, 200)
+    np.testing.assert_array_equal(schedule.lookup(ages), [schedule[int(age)] for age in ages])
+    assert schedule[-1] == schedule[0] == 10.0
+
+
+def test_first_matching_range_wins_and_fallback_is_last_value():
+    schedule = AgeSchedule({(0, 10): 1.0, (5, 20): 2.0, (30, 40): 3.0})
+    assert schedule[7] == 1.0  # overlap: the earlier range wins
+    assert schedule[15] == 2.0
+    assert schedule[25] == 3.0  # gap between ranges
+    assert schedule[1000] == 3.0
+
+
+def test_pair_values_are_tuples():
+    schedule = AgeSchedule({(0, 6): (0.9, 0.02), (7, 29): (0.8, 0.03)})
+    assert schedule[3] == (0.9, 0.02) and schedule[100] == (0.8, 0.03)
+    assert schedule.lookup(np.array([3, 100])).shape == (2, 2)
+
+
+@pytest.mark.parametrize("mapping", [{}, {(10, 5): 1.0}])
+def test_invalid_schedules_are_rejected(mapping):
+    with pytest.raises(ValueError):
+        AgeSchedule(mapping)
+
+
+def test_generator_validates_schedule_shapes():
+    gen = RevSharePoolGenerator(pool_size=20000, seed=1)
+    with pytest.raises(ValueError):
+        gen.deposit_by_days = {(0, 10): (1.0, 2.0)}
+    with pytest.raises(ValueError):
+        gen.retention_schedule = {(0, 10): 0.5}
+    gen.deposit_by_days = SCHEDULE
+    assert gen.deposit_by_days == SCHEDULE and gen._deposit_table[95] == 40.0
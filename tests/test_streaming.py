@@ -0,0 +1,27 @@
+"""Streaming day-by-day simulation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from revshare_pool import RevSharePoolGenerator
+
+POOL = dict(pool_size=20000, stable_ratio=0.6, growth_ratio=0.4)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_stream_matches_generate(engine):
+    expected = RevSharePoolGenerator(**POOL, seed=6, engine=engine).generate_daily_data()
+    records = list(RevSharePoolGenerator(**POOL, seed=6, engine=engine).stream_daily_data())
+    assert len(records) == len(expected)
+    streamed = pd.DataFrame([record._asdict() for record in records])
+    for column in ("new_ftds", "daily_ggr", "cumulative_ggr", "stable_payout", "cumulative_referral_cost"):
+        np.testing.assert_allclose(streamed[column].astype(float), expected[column].astype(float), rtol=1e-9)
+
+
+def test_stream_without_payouts_yields_days_as_simulated():
+    stream = RevSharePoolGenerator(**POOL, seed=6, engine="python").stream_daily_data(with_payouts=False)
+    first = [next(stream) for _ in range(3)]
+    stream.close()
+    assert [record.date for record in first] == sorted(record.date for record in first)
+    assert all(record.stable_payout is None for record in first)
@@ -0,0 +1,37 @@
+"""Parameter sweeps: point construction and per-point evaluation."""
+
+import pytest
+
+import sweep
+
+POOL = dict(pool_size=20000, stable_ratio=0.6, growth_ratio=0.4)
+
+
+def test_sweep_keeps_failed_points_as_error_rows():
+    points = sweep.build_points({**POOL, "engine": "numpy"}, grid={"ggr_volatility": [0.15, -5.0]})
+    results = sweep.run_sweep(points, seed=1, max_workers=1)
+    assert list(results["point"]) == [0, 1]
+    assert results.loc[0, "error"] == "" and results.loc[0, "final_multiplier"] > 0
+    assert results.loc[1, "error"].startswith("ValueError")
+
+
+def test_sweep_stable_ratio_derives_growth_ratio():
+    points = sweep.build_points(POOL, grid={"stable_ratio": [0.7]})
+    assert sweep.to_generator_kwargs(points[0])["growth_ratio"] == pytest.approx(0.3)
+
+
+def test_grid_and_latin_hypercube_points():
+    points = sweep.build_points({"pool_size": 1}, grid={"a": [1, 2], "b": [3]}, lhs={"c": (0.0, 1.0)},
+                                n_samples=4, seed=0)
+    assert len(points) == 2 * 4
+    for name in ("a", "c"):
+        values = sorted({point[name] for point in points})
+        assert len(values) == (2 if name == "a" else 4)
+    # Latin hypercube: one sample in each quarter of the range
+    quarters = sorted(int(point["c"] * 4) for point in points if point["a"] == 1)
+    assert quarters == [0, 1, 2, 3]
+
+
+def test_cpa_bounds_map_onto_cpa_range():
+    kwargs = sweep.to_generator_kwargs({"cpa_min": 40, "cpa_range": (55, 75)})
+    assert kwargs["cpa_range"] == (40.0, 75.0) and "cpa_min" not in kwargs